@@ -1,4 +1,9 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import F, FloatField, QuerySet
+from django.db.models.functions import Cast, NullIf
+from django.utils.functional import cached_property
 
 from .models import (
     CinemaHall,
@@ -7,13 +12,142 @@ from .models import (
     Movie,
     MovieSession,
     Order,
+    PricingRule,
     Ticket,
 )
 
-admin.site.register(CinemaHall)
-admin.site.register(Genre)
-admin.site.register(Actor)
-admin.site.register(Movie)
-admin.site.register(MovieSession)
-admin.site.register(Order)
-admin.site.register(Ticket)
+ESTIMATED_COUNT_THRESHOLD = 100_000
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self) -> int:
+        # Unfiltered changelists of big tables use the planner's row
+        # estimate instead of scanning the table for COUNT(*).
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == "postgresql" and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples FROM pg_class WHERE relname = %s",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] >= ESTIMATED_COUNT_THRESHOLD:
+                return int(row[0])
+        return super().count
+
+
+class NumericSearchMixin:
+    numeric_search_fields = ("pk",)
+
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(
+            request, queryset, search_term
+        )
+        # Ids are matched exactly, next to the text search so a movie
+        # titled "1917" is still found by its title.
+        try:
+            value = int(search_term)
+        except ValueError:
+            return results, may_have_duplicates
+        for field in self.numeric_search_fields:
+            results |= queryset.filter(**{field: value})
+        return results, may_have_duplicates
+
+
+@admin.register(CinemaHall)
+class CinemaHallAdmin(admin.ModelAdmin):
+    list_display = ("name", "rows", "seats_in_row", "capacity")
+    search_fields = ("name",)
+
+
+@admin.register(Genre)
+class GenreAdmin(admin.ModelAdmin):
+    search_fields = ("name",)
+
+
+@admin.register(Actor)
+class ActorAdmin(admin.ModelAdmin):
+    list_display = ("first_name", "last_name")
+    search_fields = ("^last_name", "^first_name")
+
+
+@admin.register(Movie)
+class MovieAdmin(admin.ModelAdmin):
+    list_display = ("title", "duration")
+    search_fields = ("^title",)
+    autocomplete_fields = ("genres", "actors")
+
+
+@admin.register(MovieSession)
+class MovieSessionAdmin(NumericSearchMixin, admin.ModelAdmin):
+    list_display = (
+        "id",
+        "movie",
+        "cinema_hall",
+        "show_time",
+        "tickets_taken",
+        "occupancy",
+    )
+    list_select_related = ("movie", "cinema_hall")
+    list_filter = ("cinema_hall",)
+    date_hierarchy = "show_time"
+    search_fields = ("^movie__title",)
+    autocomplete_fields = ("movie", "cinema_hall")
+    readonly_fields = (
+        "seats_version",
+        "seats_released_version",
+        "seats_changed_at",
+        "tickets_taken",
+        "price_table",
+    )
+
+    def get_queryset(self, request) -> QuerySet:
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                occupancy=Cast(F("tickets_taken"), FloatField())
+                * 100
+                / NullIf(
+                    F("cinema_hall__rows") * F("cinema_hall__seats_in_row"), 0
+                )
+            )
+        )
+
+    @admin.display(ordering="occupancy")
+    def occupancy(self, obj: MovieSession) -> str | None:
+        # Halls without seats have no occupancy.
+        if obj.occupancy is None:
+            return None
+        return f"{obj.occupancy:.0f}%"
+
+
+@admin.register(PricingRule)
+class PricingRuleAdmin(admin.ModelAdmin):
+    list_display = ("name", "kind", "multiplier", "is_active")
+    list_filter = ("kind", "is_active")
+    autocomplete_fields = ("cinema_hall",)
+
+
+@admin.register(Order)
+class OrderAdmin(NumericSearchMixin, admin.ModelAdmin):
+    list_display = ("id", "user", "created_at", "cancelled_at")
+    list_select_related = ("user",)
+    search_fields = ("^user__username",)
+    raw_id_fields = ("user",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(Ticket)
+class TicketAdmin(NumericSearchMixin, admin.ModelAdmin):
+    list_display = ("id", "movie_session", "row", "seat", "order")
+    list_select_related = ("movie_session__movie", "order")
+    numeric_search_fields = ("pk", "order_id", "movie_session_id")
+    search_fields = ("^order__user__username",)
+    raw_id_fields = ("movie_session", "order")
+    readonly_fields = ("session_version",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
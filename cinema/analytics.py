@@ -0,0 +1,203 @@
+from datetime import datetime
+from itertools import islice
+
+import numpy as np
+from django.db.models import QuerySet
+
+from cinema.models import ArchivedTicket, CinemaHall, MovieSession, Ticket
+
+CHUNK_SIZE = 50_000
+SECONDS_PER_DAY = 86_400
+
+TICKET_COLUMNS = {
+    "movie_session__cinema_hall_id": np.int64,
+    "row": np.int32,
+    "seat": np.int32,
+    "price": np.float64,
+    "movie_session__show_time": "datetime64[s]",
+    "order__created_at": "datetime64[s]",
+}
+
+
+def to_array(values: tuple, dtype) -> np.ndarray:
+    if dtype == "datetime64[s]":
+        # Aware datetimes are stored as UTC epoch seconds.
+        return np.array(
+            [value.timestamp() for value in values], dtype=np.int64
+        ).astype(dtype)
+    return np.array(values, dtype=dtype)
+
+
+def load_columns(
+    queryset: QuerySet, columns: dict, chunk_size: int = CHUNK_SIZE
+) -> dict[str, np.ndarray]:
+    names = list(columns)
+    parts = {name: [] for name in names}
+    rows = queryset.values_list(*names).iterator(chunk_size=chunk_size)
+    while chunk := list(islice(rows, chunk_size)):
+        for name, values in zip(names, zip(*chunk)):
+            parts[name].append(to_array(values, columns[name]))
+
+    return {
+        name: np.concatenate(parts[name])
+        if parts[name]
+        else np.empty(0, dtype=columns[name])
+        for name in names
+    }
+
+
+def load_tickets(
+    since: datetime = None,
+    until: datetime = None,
+    include_archived: bool = True,
+    chunk_size: int = CHUNK_SIZE,
+) -> dict[str, np.ndarray]:
+    filters = {}
+    if since is not None:
+        filters["movie_session__show_time__gte"] = since
+    if until is not None:
+        filters["movie_session__show_time__lt"] = until
+
+    models = (Ticket, ArchivedTicket) if include_archived else (Ticket,)
+    loaded = [
+        load_columns(
+            model.objects.filter(**filters).order_by(),
+            TICKET_COLUMNS,
+            chunk_size,
+        )
+        for model in models
+    ]
+    return {
+        name: np.concatenate([columns[name] for columns in loaded])
+        for name in TICKET_COLUMNS
+    }
+
+
+def count_sessions(
+    hall_ids: np.ndarray, since: datetime = None, until: datetime = None
+) -> np.ndarray:
+    sessions = MovieSession.objects.order_by()
+    if since is not None:
+        sessions = sessions.filter(show_time__gte=since)
+    if until is not None:
+        sessions = sessions.filter(show_time__lt=until)
+    session_halls = load_columns(sessions, {"cinema_hall_id": np.int64})[
+        "cinema_hall_id"
+    ]
+    return np.bincount(
+        np.searchsorted(hall_ids, session_halls), minlength=len(hall_ids)
+    )
+
+
+def hall_heatmaps(
+    tickets: dict[str, np.ndarray],
+    halls: dict[str, np.ndarray],
+    session_counts: np.ndarray,
+) -> dict[int, np.ndarray]:
+    hall_column = tickets["movie_session__cinema_hall_id"]
+    order = np.argsort(hall_column, kind="stable")
+    sorted_halls = hall_column[order]
+
+    heatmaps = {}
+    for index, (hall_id, rows, seats_in_row) in enumerate(
+        zip(halls["pk"], halls["rows"], halls["seats_in_row"])
+    ):
+        start, stop = np.searchsorted(sorted_halls, [hall_id, hall_id + 1])
+        selected = order[start:stop]
+        ticket_rows = tickets["row"][selected] - 1
+        ticket_seats = tickets["seat"][selected] - 1
+        # Archived tickets may lie outside a hall that has since shrunk.
+        inside = (ticket_rows < rows) & (ticket_seats < seats_in_row)
+        counts = np.bincount(
+            ticket_rows[inside] * seats_in_row + ticket_seats[inside],
+            minlength=rows * seats_in_row,
+        ).reshape(rows, seats_in_row)
+        heatmaps[int(hall_id)] = counts / max(int(session_counts[index]), 1)
+    return heatmaps
+
+
+def lead_time_demand(
+    tickets: dict[str, np.ndarray], max_days: int = 60
+) -> dict[str, np.ndarray]:
+    lead = (
+        tickets["movie_session__show_time"] - tickets["order__created_at"]
+    ).astype(np.int64) // SECONDS_PER_DAY
+    days = np.clip(lead, 0, max_days)
+    sold = np.bincount(days, minlength=max_days + 1)
+    revenue = np.bincount(
+        days, weights=tickets["price"], minlength=max_days + 1
+    )
+    # Share of tickets sold at least N days before the show.
+    sold_before = np.cumsum(sold[::-1])[::-1] / max(int(sold.sum()), 1)
+    return {
+        "lead_days": np.arange(max_days + 1),
+        "tickets": sold,
+        "revenue": revenue,
+        "sold_before_share": sold_before,
+    }
+
+
+def hall_summary(
+    tickets: dict[str, np.ndarray],
+    hall_ids: np.ndarray,
+    capacities: np.ndarray,
+    session_counts: np.ndarray,
+) -> dict[str, np.ndarray]:
+    index = np.searchsorted(hall_ids, tickets["movie_session__cinema_hall_id"])
+    sold = np.bincount(index, minlength=len(hall_ids))
+    seats_offered = capacities * session_counts
+    return {
+        "ids": hall_ids,
+        "tickets": sold,
+        "revenue": np.bincount(
+            index, weights=tickets["price"], minlength=len(hall_ids)
+        ),
+        "occupancy": np.divide(
+            sold,
+            seats_offered,
+            out=np.zeros(len(hall_ids)),
+            where=seats_offered > 0,
+        ),
+    }
+
+
+def build_report(
+    since: datetime = None,
+    until: datetime = None,
+    include_archived: bool = True,
+    max_lead_days: int = 60,
+    chunk_size: int = CHUNK_SIZE,
+) -> dict[str, np.ndarray]:
+    tickets = load_tickets(since, until, include_archived, chunk_size)
+    halls = load_columns(
+        CinemaHall.objects.order_by("pk"),
+        {"pk": np.int64, "rows": np.int64, "seats_in_row": np.int64},
+    )
+    hall_ids = halls["pk"]
+    session_counts = count_sessions(hall_ids, since, until)
+
+    report = {
+        f"hall_{key}": value
+        for key, value in hall_summary(
+            tickets,
+            hall_ids,
+            halls["rows"] * halls["seats_in_row"],
+            session_counts,
+        ).items()
+    }
+    report["hall_sessions"] = session_counts
+    report.update(
+        {
+            f"demand_{key}": value
+            for key, value in lead_time_demand(tickets, max_lead_days).items()
+        }
+    )
+    report.update(
+        {
+            f"heatmap_{hall_id}": heatmap
+            for hall_id, heatmap in hall_heatmaps(
+                tickets, halls, session_counts
+            ).items()
+        }
+    )
+    return report
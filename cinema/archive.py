@@ -0,0 +1,64 @@
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
+
+from cinema.models import (
+    ArchivedTicket,
+    MovieSession,
+    Ticket,
+    release_counted,
+)
+
+TICKET_FIELDS = (
+    "id",
+    "movie_session_id",
+    "order_id",
+    "row",
+    "seat",
+    "price",
+)
+
+
+def archive_ticket_batch(cutoff: datetime, batch_size: int) -> int:
+    with transaction.atomic():
+        tickets = list(
+            Ticket.objects.filter(movie_session__show_time__lt=cutoff)
+            .order_by("pk")
+            .values(*TICKET_FIELDS, "session_version")[:batch_size]
+        )
+        if not tickets:
+            return 0
+
+        ArchivedTicket.objects.bulk_create(
+            ArchivedTicket(**ticket) for ticket in tickets
+        )
+        # Archived seats stay sold, so the per-ticket release signal stands
+        # down and only the hot seat map changes.
+        with release_counted():
+            Ticket.objects.filter(
+                pk__in=[ticket["id"] for ticket in tickets]
+            ).delete()
+        MovieSession.objects.filter(
+            pk__in={ticket["movie_session_id"] for ticket in tickets}
+        ).update(
+            seats_version=F("seats_version") + 1,
+            seats_released_version=F("seats_version") + 1,
+            seats_changed_at=timezone.now(),
+        )
+    return len(tickets)
+
+
+def all_tickets(**filters) -> QuerySet:
+    return (
+        Ticket.objects.filter(**filters)
+        .order_by()
+        .values(*TICKET_FIELDS)
+        .union(
+            ArchivedTicket.objects.filter(**filters)
+            .order_by()
+            .values(*TICKET_FIELDS),
+            all=True,
+        )
+    )
@@ -0,0 +1,34 @@
+import math
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db import transaction
+
+
+class Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def measure(func, repeat: int = 20) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    timings.sort()
+    return {
+        "mean_ms": statistics.mean(timings) * 1000,
+        "p95_ms": timings[math.ceil(len(timings) * 0.95) - 1] * 1000,
+    }
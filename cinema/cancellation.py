@@ -0,0 +1,113 @@
+from collections import defaultdict
+from decimal import Decimal
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, QuerySet, Sum
+from django.utils import timezone
+
+from cinema.events import publish_seats_released
+from cinema.models import MovieSession, Order, Ticket, release_counted
+from cinema.pricing import CENT
+
+
+def release_tickets(tickets: QuerySet) -> int:
+    with transaction.atomic():
+        session_ids = list(
+            tickets.order_by()
+            .values_list("movie_session_id", flat=True)
+            .distinct()
+        )
+        # Orders for these sessions wait on the row locks until the
+        # released seats are counted.
+        list(
+            MovieSession.objects.select_for_update()
+            .filter(pk__in=session_ids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+        places = defaultdict(list)
+        for session_id, row, seat in tickets.order_by().values_list(
+            "movie_session_id", "row", "seat"
+        ):
+            places[session_id].append({"row": row, "seat": seat})
+        if not places:
+            return 0
+
+        # The counters below are updated once per session instead of by
+        # the per-ticket release signal.
+        with release_counted():
+            tickets.delete()
+        for session_id, session_places in places.items():
+            MovieSession.objects.release_seats(
+                session_id, len(session_places)
+            )
+            transaction.on_commit(
+                partial(publish_seats_released, session_id, session_places)
+            )
+    return sum(len(session_places) for session_places in places.values())
+
+
+def cancel_order(
+    order: Order, ticket_ids: list[int] = None
+) -> tuple[int, Decimal]:
+    with transaction.atomic():
+        tickets = Ticket.objects.filter(order=order)
+        if ticket_ids is not None:
+            tickets = tickets.filter(pk__in=ticket_ids)
+        refund = tickets.aggregate(refund=Sum("price"))["refund"] or 0
+        released = release_tickets(tickets)
+
+        order.total_price = F("total_price") - refund
+        update_fields = ["total_price"]
+        if not Ticket.objects.filter(order=order).exists():
+            order.cancelled_at = timezone.now()
+            update_fields.append("cancelled_at")
+        order.save(update_fields=update_fields)
+        order.refresh_from_db(fields=["total_price"])
+    return released, Decimal(refund).quantize(CENT)
+
+
+def cancel_movie_session(movie_session: MovieSession) -> int:
+    with transaction.atomic():
+        # Orders for the session wait on this lock and are rejected once
+        # it is cancelled, so released seats cannot be sold again.
+        locked = MovieSession.objects.select_for_update().get(
+            pk=movie_session.pk
+        )
+        if locked.cancelled_at is None:
+            movie_session.cancelled_at = timezone.now()
+            movie_session.save(update_fields=["cancelled_at"])
+        else:
+            movie_session.cancelled_at = locked.cancelled_at
+
+        # Orders left without tickets elsewhere are cancelled as a whole.
+        Order.objects.filter(
+            cancelled_at__isnull=True,
+            tickets__movie_session=movie_session,
+        ).exclude(
+            Exists(
+                Ticket.objects.filter(order=OuterRef("pk")).exclude(
+                    movie_session=movie_session
+                )
+            )
+        ).update(cancelled_at=timezone.now())
+
+        tickets = Ticket.objects.filter(movie_session=movie_session)
+        # Orders owed the same refund are updated together, so a sold out
+        # session takes one query per distinct refund, not per order.
+        refunds = defaultdict(list)
+        for order_id, refund in (
+            tickets.order_by()
+            .values("order_id")
+            .annotate(refund=Sum("price"))
+            .values_list("order_id", "refund")
+        ):
+            refunds[refund].append(order_id)
+        released = release_tickets(tickets)
+        for refund, order_ids in refunds.items():
+            Order.objects.filter(pk__in=order_ids).update(
+                total_price=F("total_price") - refund
+            )
+        return released
@@ -0,0 +1,166 @@
+import threading
+import time
+from collections import defaultdict
+from functools import partial
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+
+from cinema.models import Actor, Genre, Movie
+
+CATALOG_VERSION_KEY = "cinema:catalog:version"
+
+CATALOG_TABLES = {
+    "genres": Genre,
+    "actors": Actor,
+}
+
+MOVIE_RELATIONS = {
+    "genres": (Movie.genres.through, "genre_id"),
+    "actors": (Movie.actors.through, "actor_id"),
+}
+
+
+class CatalogSnapshot:
+    def __init__(self, version: int | tuple) -> None:
+        self.version = version
+        self.tables = {
+            name: {obj.pk: obj for obj in model.objects.all()}
+            for name, model in CATALOG_TABLES.items()
+        }
+
+    def get(self, table: str, pk: int) -> models.Model:
+        obj = self.tables[table].get(pk)
+        if obj is None:
+            obj = CATALOG_TABLES[table].objects.get(pk=pk)
+        return obj
+
+    def get_many(self, table: str, pks: list[int]) -> list[models.Model]:
+        rows = self.tables[table]
+        missing = [pk for pk in pks if pk not in rows]
+        if missing:
+            rows = {
+                **rows,
+                **CATALOG_TABLES[table].objects.in_bulk(missing),
+            }
+        return [rows[pk] for pk in pks if pk in rows]
+
+
+class PendingWrites:
+    def __init__(self) -> None:
+        self.count = 0
+        self.snapshot = None
+        self.savepoint_ids = None
+
+
+_snapshot = None
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_pending_writes() -> dict:
+    if not hasattr(_local, "pending"):
+        _local.pending = {}
+    return _local.pending
+
+
+def mark_catalog_write(using: str = DEFAULT_DB_ALIAS) -> None:
+    # The shared version only moves once the write is committed, so no
+    # worker caches a snapshot of rows that may still be rolled back.
+    if not connections[using].in_atomic_block:
+        bump_catalog_version()
+        return
+
+    pending = get_pending_writes().setdefault(using, PendingWrites())
+    pending.count += 1
+    pending.snapshot = None
+    transaction.on_commit(partial(commit_catalog_writes, using), using=using)
+
+
+def commit_catalog_writes(using: str) -> None:
+    get_pending_writes().pop(using, None)
+    bump_catalog_version()
+
+
+def get_pending_snapshot(using: str) -> CatalogSnapshot | None:
+    pending = get_pending_writes().get(using)
+    if pending is None:
+        return None
+
+    connection = connections[using]
+    if not connection.in_atomic_block:
+        # The transaction was rolled back; its writes never happened.
+        get_pending_writes().pop(using)
+        return None
+
+    # Private to this transaction and rebuilt whenever a savepoint is
+    # entered or left, so rolled back rows are never served.
+    savepoint_ids = tuple(connection.savepoint_ids)
+    if pending.snapshot is None or pending.savepoint_ids != savepoint_ids:
+        pending.snapshot = CatalogSnapshot(
+            (get_catalog_version(), pending.count)
+        )
+        pending.savepoint_ids = savepoint_ids
+    return pending.snapshot
+
+
+def get_catalog_version() -> int:
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # Seeded from the clock so a re-created key never collides with a
+        # version a worker already holds.
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def get_catalog(using: str = DEFAULT_DB_ALIAS) -> CatalogSnapshot:
+    global _snapshot
+
+    snapshot = get_pending_snapshot(using)
+    if snapshot is not None:
+        return snapshot
+
+    version = get_catalog_version()
+    snapshot = _snapshot
+    if snapshot is None or snapshot.version != version:
+        with _lock:
+            if _snapshot is None or _snapshot.version != version:
+                _snapshot = CatalogSnapshot(version)
+            snapshot = _snapshot
+    return snapshot
+
+
+def bump_catalog_version() -> None:
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        get_catalog_version()
+
+
+def attach_movie_catalog_ids(
+    movies: list[Movie], relations: tuple = tuple(MOVIE_RELATIONS)
+) -> None:
+    for name in relations:
+        pending = [
+            movie
+            for movie in movies
+            if name not in movie.__dict__.setdefault("catalog_ids", {})
+        ]
+        if not pending:
+            continue
+
+        through, column = MOVIE_RELATIONS[name]
+        related = defaultdict(list)
+        links = (
+            through.objects.filter(
+                movie_id__in=[movie.pk for movie in pending]
+            )
+            .order_by("pk")
+            .values_list("movie_id", column)
+        )
+        for movie_id, related_id in links:
+            related[movie_id].append(related_id)
+
+        for movie in pending:
+            movie.catalog_ids[name] = related.get(movie.pk, [])
@@ -0,0 +1,71 @@
+from collections import defaultdict
+
+from django.utils import timezone
+
+from cinema.models import Movie, MovieDocument
+
+MOVIE_FIELDS = ("id", "title", "description", "duration")
+
+
+def load_related(through, column: str, movie_ids: list[int]) -> dict:
+    related = defaultdict(list)
+    links = (
+        through.objects.filter(movie_id__in=movie_ids)
+        .select_related(column)
+        .order_by("pk")
+    )
+    for link in links:
+        related[link.movie_id].append(getattr(link, column))
+    return related
+
+
+def build_movie_documents(movies: list[Movie]) -> list[MovieDocument]:
+    # Imported here so that app loading, which connects the document
+    # signals, does not pull in DRF serializers.
+    from cinema.serializers import ActorSerializer, GenreSerializer
+
+    movie_ids = [movie.pk for movie in movies]
+    genres = load_related(Movie.genres.through, "genre", movie_ids)
+    actors = load_related(Movie.actors.through, "actor", movie_ids)
+
+    documents = []
+    for movie in movies:
+        fields = {name: getattr(movie, name) for name in MOVIE_FIELDS}
+        movie_genres = genres.get(movie.pk, [])
+        movie_actors = actors.get(movie.pk, [])
+        documents.append(
+            MovieDocument(
+                movie=movie,
+                detail={
+                    **fields,
+                    "genres": GenreSerializer(movie_genres, many=True).data,
+                    "actors": ActorSerializer(movie_actors, many=True).data,
+                },
+                session_detail={
+                    **fields,
+                    "genres": [genre.name for genre in movie_genres],
+                    "actors": [actor.full_name for actor in movie_actors],
+                },
+                updated_at=timezone.now(),
+            )
+        )
+    return documents
+
+
+def refresh_movie_documents(movie_ids, batch_size: int = 500) -> int:
+    movie_ids = sorted(set(movie_ids))
+    refreshed = 0
+    for start in range(0, len(movie_ids), batch_size):
+        movies = list(
+            Movie.objects.filter(
+                pk__in=movie_ids[start:start + batch_size]
+            ).only(*MOVIE_FIELDS)
+        )
+        MovieDocument.objects.bulk_create(
+            build_movie_documents(movies),
+            update_conflicts=True,
+            unique_fields=["movie_id"],
+            update_fields=["detail", "session_detail", "updated_at"],
+        )
+        refreshed += len(movies)
+    return refreshed
@@ -0,0 +1,242 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class SubscriptionLimitExceeded(Exception):
+    pass
+
+
+class Subscription:
+    def __init__(
+        self,
+        session_id: int,
+        loop: asyncio.AbstractEventLoop,
+        max_queue_size: int,
+    ) -> None:
+        self.session_id = session_id
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_queue_size)
+        self.closed = False
+
+    def deliver(self, event: dict) -> None:
+        if self.closed:
+            return
+
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A slow consumer is cut off with a resync marker instead of
+            # silently losing seat changes; it refetches the seat map.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync"})
+            self.closed = True
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+
+class LocalSeatEventBroker:
+    def __init__(
+        self,
+        max_queue_size: int = 64,
+        max_subscribers: int = 10000,
+        max_subscribers_per_session: int = 2000,
+    ) -> None:
+        self.max_queue_size = max_queue_size
+        self.max_subscribers = max_subscribers
+        self.max_subscribers_per_session = max_subscribers_per_session
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+        self._count = 0
+
+    def subscribe(self, session_id: int) -> Subscription:
+        subscription = Subscription(
+            session_id, asyncio.get_running_loop(), self.max_queue_size
+        )
+        with self._lock:
+            watchers = self._subscribers[session_id]
+            if (
+                self._count >= self.max_subscribers
+                or len(watchers) >= self.max_subscribers_per_session
+            ):
+                raise SubscriptionLimitExceeded(
+                    "Too many watchers for this movie session."
+                )
+            watchers.add(subscription)
+            self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            watchers = self._subscribers.get(subscription.session_id)
+            if watchers is None or subscription not in watchers:
+                return
+            watchers.discard(subscription)
+            self._count -= 1
+            if not watchers:
+                del self._subscribers[subscription.session_id]
+
+    def subscriber_count(self, session_id: int = None) -> int:
+        if session_id is None:
+            return self._count
+        return len(self._subscribers.get(session_id, ()))
+
+    def publish(self, session_id: int, event: dict) -> None:
+        with self._lock:
+            watchers = tuple(self._subscribers.get(session_id, ()))
+
+        loops = defaultdict(list)
+        for subscription in watchers:
+            loops[subscription.loop].append(subscription)
+
+        # One callback per event loop fans the event out to every watcher
+        # living on that loop.
+        for loop, subscriptions in loops.items():
+            if loop.is_closed():
+                continue
+            loop.call_soon_threadsafe(
+                self._deliver, tuple(subscriptions), event
+            )
+
+    @staticmethod
+    def _deliver(subscriptions: tuple, event: dict) -> None:
+        for subscription in subscriptions:
+            subscription.deliver(event)
+
+
+class RedisSeatEventBroker(LocalSeatEventBroker):
+    """
+    Shares seat events between workers through one Redis pub/sub channel.
+    Every worker publishes to the channel; workers with watchers listen
+    on it and fan events out locally.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        channel: str = "cinema:seat_events",
+        reconnect_seconds: float = 1.0,
+        **options,
+    ) -> None:
+        super().__init__(**options)
+        self.url = url
+        self.channel = channel
+        self.reconnect_seconds = reconnect_seconds
+        self._client = None
+        self._listener = None
+        self._listener_lock = threading.Lock()
+
+    def get_client(self):
+        if self._client is None:
+            import redis
+
+            self._client = redis.Redis.from_url(self.url)
+        return self._client
+
+    def subscribe(self, session_id: int) -> Subscription:
+        subscription = super().subscribe(session_id)
+        with self._listener_lock:
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self.listen, name="seat-events", daemon=True
+                )
+                self._listener.start()
+        return subscription
+
+    def publish(self, session_id: int, event: dict) -> None:
+        # Publishing runs in on_commit hooks after the booking committed;
+        # a lost event only costs watchers a refetch, never the request.
+        try:
+            self.get_client().publish(
+                self.channel,
+                json.dumps({"session": session_id, "event": event}),
+            )
+        except Exception:
+            logger.exception("Could not publish seat event.")
+
+    def listen(self) -> None:
+        while True:
+            try:
+                pubsub = self.get_client().pubsub(
+                    ignore_subscribe_messages=True
+                )
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    data = json.loads(message["data"])
+                    super().publish(data["session"], data["event"])
+            except Exception:
+                logger.exception("Seat event channel lost, reconnecting.")
+            # Events published while disconnected are lost, so watchers
+            # refetch their seat maps.
+            self.resync_all()
+            time.sleep(self.reconnect_seconds)
+
+    def resync_all(self) -> None:
+        with self._lock:
+            session_ids = tuple(self._subscribers)
+        for session_id in session_ids:
+            super().publish(session_id, {"type": "resync"})
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker() -> LocalSeatEventBroker:
+    global _broker
+
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                config = getattr(settings, "CINEMA_SEAT_EVENTS", {})
+                backend = import_string(
+                    config.get(
+                        "BACKEND", "cinema.events.LocalSeatEventBroker"
+                    )
+                )
+                _broker = backend(**config.get("OPTIONS", {}))
+    return _broker
+
+
+def reset_broker() -> None:
+    global _broker
+
+    with _broker_lock:
+        _broker = None
+
+
+def publish_seats_taken(
+    session_id: int, version: int, places: list[dict]
+) -> None:
+    get_broker().publish(
+        session_id,
+        {
+            "type": "seats_taken",
+            "session": session_id,
+            "version": version,
+            "places": places,
+        },
+    )
+
+
+def publish_seats_released(
+    session_id: int, places: list[dict]
+) -> None:
+    get_broker().publish(
+        session_id,
+        {
+            "type": "seats_released",
+            "session": session_id,
+            "places": places,
+        },
+    )
@@ -0,0 +1,133 @@
+import json
+import math
+import random
+import statistics
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+
+def request(
+    base_url: str, token: str, method: str, path: str, body: dict = None
+) -> tuple[int, bytes]:
+    data = json.dumps(body).encode() if body is not None else None
+    http_request = urllib.request.Request(
+        base_url + path,
+        data=data,
+        method=method,
+        headers={
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        },
+    )
+    try:
+        with urllib.request.urlopen(http_request, timeout=30) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as error:
+        return error.code, error.read()
+    except (urllib.error.URLError, OSError):
+        return 0, b""
+
+
+def run_worker(
+    base_url: str,
+    token: str,
+    sessions: list[dict],
+    duration: float,
+    hot_seats: int,
+    seed: int,
+) -> dict:
+    generator = random.Random(seed)
+    samples = []
+    booked = []
+    deadline = time.monotonic() + duration
+
+    def timed(kind: str, method: str, path: str, body: dict = None):
+        started = time.perf_counter()
+        status, content = request(base_url, token, method, path, body)
+        samples.append((kind, status, time.perf_counter() - started))
+        return status, content
+
+    while time.monotonic() < deadline:
+        timed("list_sessions", "GET", "/api/cinema/movie_sessions/")
+
+        movie_session = generator.choice(sessions)
+        timed(
+            "seat_map",
+            "GET",
+            f"/api/cinema/movie_sessions/{movie_session['id']}/",
+        )
+
+        # Seats are drawn from the first rows only so workers collide.
+        places = {
+            (
+                generator.randint(1, movie_session["rows"]),
+                generator.randint(1, hot_seats),
+            )
+            for _ in range(generator.randint(1, 3))
+        }
+        tickets = [
+            {"movie_session": movie_session["id"], "row": row, "seat": seat}
+            for row, seat in places
+        ]
+        status, _ = timed(
+            "create_order", "POST", "/api/cinema/orders/", {"tickets": tickets}
+        )
+        if status == 201:
+            booked.extend(
+                (ticket["movie_session"], ticket["row"], ticket["seat"])
+                for ticket in tickets
+            )
+
+    return {"samples": samples, "booked": booked}
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(len(ordered) * fraction) - 1)]
+
+
+def summarize(results: list[dict], elapsed: float) -> dict:
+    by_kind = defaultdict(list)
+    for result in results:
+        for kind, status, latency in result["samples"]:
+            by_kind[kind].append((status, latency))
+
+    summary = {"elapsed": elapsed, "requests": 0, "kinds": {}}
+    for kind, samples in sorted(by_kind.items()):
+        latencies = [latency * 1000 for _, latency in samples]
+        statuses = defaultdict(int)
+        for status, _ in samples:
+            statuses[status] += 1
+        summary["requests"] += len(samples)
+        summary["kinds"][kind] = {
+            "count": len(samples),
+            "throughput": len(samples) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(latencies, 0.50),
+            "p95_ms": percentile(latencies, 0.95),
+            "p99_ms": percentile(latencies, 0.99),
+            "mean_ms": statistics.mean(latencies),
+            "statuses": dict(statuses),
+        }
+
+    orders = summary["kinds"].get("create_order", {"statuses": {}})
+    attempted = sum(orders["statuses"].values())
+    conflicts = orders["statuses"].get(400, 0)
+    summary["orders"] = {
+        "attempted": attempted,
+        "created": orders["statuses"].get(201, 0),
+        "conflicts": conflicts,
+        "conflict_rate": conflicts / attempted if attempted else 0.0,
+        "throttled": orders["statuses"].get(429, 0),
+        "errors": sum(
+            count
+            for status, count in orders["statuses"].items()
+            if status == 0 or status >= 500
+        ),
+    }
+    booked = [place for result in results for place in result["booked"]]
+    summary["booked_seats"] = len(booked)
+    summary["duplicate_bookings"] = len(booked) - len(set(booked))
+    return summary
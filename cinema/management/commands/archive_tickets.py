@@ -0,0 +1,68 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from cinema.archive import archive_ticket_batch
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Move tickets of past sessions to the archive table in batches."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--horizon-days",
+            type=int,
+            default=settings.TICKET_ARCHIVE_HORIZON.days,
+            help="Archive tickets of sessions older than this many days "
+            "(at least TICKET_ARCHIVE_HORIZON).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Tickets moved per transaction.",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Stop after this many batches (default: until done).",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="Seconds to sleep between batches.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        horizon = timedelta(days=options["horizon_days"])
+        # Bookings only check archived seats beyond the configured horizon.
+        if horizon < settings.TICKET_ARCHIVE_HORIZON:
+            raise CommandError(
+                "--horizon-days cannot be shorter than "
+                f"TICKET_ARCHIVE_HORIZON ({settings.TICKET_ARCHIVE_HORIZON})."
+            )
+        cutoff = timezone.now() - horizon
+        archived = batches = 0
+
+        while options["max_batches"] is None or (
+            batches < options["max_batches"]
+        ):
+            moved = archive_ticket_batch(cutoff, options["batch_size"])
+            if not moved:
+                break
+            archived += moved
+            batches += 1
+            if options["pause"]:
+                time.sleep(options["pause"])
+
+        self.stdout.write(
+            f"Archived {archived} tickets in {batches} batches "
+            f"(sessions before {cutoff:%Y-%m-%d %H:%M})."
+        )
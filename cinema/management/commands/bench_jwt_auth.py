@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from cinema.benchmarks import measure, rolled_back
+from cinema.models import CinemaHall, Movie, MovieSession, Order
+from cinema.views import MovieSessionViewSet, OrderViewSet
+from user.authentication import CachedJWTAuthentication, user_cache
+from user.models import User
+
+AUTHENTICATION_CLASSES = (JWTAuthentication, CachedJWTAuthentication)
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Compare queries and time per request of the JWT authenticators."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--repeat", type=int, default=200)
+
+    def handle(self, *args, **options) -> None:
+        with rolled_back():
+            token = self.seed()
+            factory = APIRequestFactory()
+            endpoints = {
+                "GET /api/cinema/orders/": (
+                    OrderViewSet,
+                    "/api/cinema/orders/",
+                ),
+                "GET /api/cinema/movie_sessions/": (
+                    MovieSessionViewSet,
+                    "/api/cinema/movie_sessions/",
+                ),
+            }
+            for name, (viewset, path) in endpoints.items():
+                self.stdout.write(f"{name}:")
+                for authentication_class in AUTHENTICATION_CLASSES:
+                    view = viewset.as_view(
+                        {"get": "list"},
+                        authentication_classes=(authentication_class,),
+                    )
+
+                    def call():
+                        request = factory.get(
+                            path, HTTP_AUTHORIZATION=f"Bearer {token}"
+                        )
+                        response = view(request)
+                        response.render()
+                        assert response.status_code == 200, response.data
+
+                    user_cache.clear()
+                    call()
+                    with CaptureQueriesContext(connection) as queries:
+                        call()
+                    timing = measure(call, options["repeat"])
+                    self.stdout.write(
+                        f"  {authentication_class.__name__:<26}"
+                        f"{len(queries):>4} queries"
+                        f"{timing['mean_ms']:>10.2f} ms mean"
+                        f"{timing['p95_ms']:>10.2f} ms p95"
+                    )
+
+    @staticmethod
+    def seed() -> str:
+        user = User.objects.create(username="jwt-benchmark")
+        hall = CinemaHall.objects.create(
+            name="Benchmark", rows=10, seats_in_row=10
+        )
+        movie = Movie.objects.create(
+            title="Benchmark", description="Benchmark", duration=120
+        )
+        MovieSession.objects.create(
+            movie=movie,
+            cinema_hall=hall,
+            show_time=timezone.now() + timedelta(days=1),
+        )
+        Order.objects.create(user=user)
+        return str(AccessToken.for_user(user))
@@ -0,0 +1,103 @@
+from django.core.management.base import BaseCommand
+from django.db.models import QuerySet
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from cinema.benchmarks import measure, rolled_back
+from cinema.models import Actor, Genre, Movie
+from cinema.views import MovieViewSet
+
+QUERIES = (
+    "genres={g0}",
+    "genres={g0},{g1},{g2}",
+    "genres={g0},{g1}&genres_match=all",
+    "actors={a0},{a1},{a2},{a3},{a4}",
+    "actors={a0},{a1}&genres={g2},{g3}",
+)
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Measure movie list filtering latency on a large catalogue."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--movies", type=int, default=100000)
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, **options) -> None:
+        with rolled_back():
+            ids = self.seed(options["movies"])
+            factory = APIRequestFactory()
+            for template in QUERIES:
+                query = template.format(**ids)
+                view = MovieViewSet(
+                    request=Request(
+                        factory.get(f"/api/cinema/movies/?{query}")
+                    ),
+                    action="list",
+                    format_kwarg=None,
+                    kwargs={},
+                )
+                queryset = view.get_queryset()
+                timing = measure(
+                    lambda: self.fetch_page(queryset), options["repeat"]
+                )
+                self.stdout.write(
+                    f"{query:<32}"
+                    f"{queryset.count():>8} movies"
+                    f"{timing['mean_ms']:>10.2f} ms mean"
+                    f"{timing['p95_ms']:>10.2f} ms p95"
+                )
+
+    @staticmethod
+    def fetch_page(queryset: QuerySet) -> None:
+        queryset.count()
+        list(queryset[:5])
+
+    @staticmethod
+    def seed(movies: int) -> dict:
+        genres = Genre.objects.bulk_create(
+            Genre(name=f"Benchmark genre {index}") for index in range(20)
+        )
+        actors = Actor.objects.bulk_create(
+            Actor(first_name="Benchmark", last_name=str(index))
+            for index in range(500)
+        )
+        created = Movie.objects.bulk_create(
+            (
+                Movie(
+                    title=f"Movie {index}",
+                    description="description",
+                    duration=100,
+                )
+                for index in range(movies)
+            ),
+            batch_size=5000,
+        )
+        Movie.genres.through.objects.bulk_create(
+            (
+                Movie.genres.through(
+                    movie_id=movie.id,
+                    genre_id=genres[(index + offset) % 20].id,
+                )
+                for index, movie in enumerate(created)
+                for offset in range(3)
+            ),
+            batch_size=5000,
+        )
+        Movie.actors.through.objects.bulk_create(
+            (
+                Movie.actors.through(
+                    movie_id=movie.id,
+                    actor_id=actors[(index * 7 + offset) % 500].id,
+                )
+                for index, movie in enumerate(created)
+                for offset in range(5)
+            ),
+            batch_size=5000,
+        )
+        return {
+            **{f"g{index}": genre.id for index, genre in enumerate(genres)},
+            **{f"a{index}": actor.id for index, actor in enumerate(actors)},
+        }
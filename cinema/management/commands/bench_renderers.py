@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from cinema.benchmarks import measure, rolled_back
+from cinema.models import (
+    Actor,
+    CinemaHall,
+    Genre,
+    Movie,
+    MovieSession,
+    Order,
+    Ticket,
+)
+from cinema.renderers import MessagePackRenderer, ORJSONRenderer
+from cinema.serializers import MovieListSerializer, OrderListSerializer
+from user.models import User
+
+RENDERERS = (JSONRenderer, ORJSONRenderer, MessagePackRenderer)
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Compare encode time and payload size of the API renderers."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--movies", type=int, default=200)
+        parser.add_argument("--orders", type=int, default=200)
+        parser.add_argument("--tickets-per-order", type=int, default=4)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options) -> None:
+        with rolled_back():
+            payloads = self.build_payloads(options)
+            for name, payload in payloads.items():
+                self.stdout.write(f"{name}:")
+                for renderer_class in RENDERERS:
+                    renderer = renderer_class()
+                    size = len(renderer.render(payload))
+                    timing = measure(
+                        lambda: renderer.render(payload), options["repeat"]
+                    )
+                    self.stdout.write(
+                        f"  {renderer_class.__name__:<22}"
+                        f"{size:>10} bytes"
+                        f"{timing['mean_ms']:>10.2f} ms mean"
+                        f"{timing['p95_ms']:>10.2f} ms p95"
+                    )
+
+    @staticmethod
+    def build_payloads(options: dict) -> dict:
+        genres = Genre.objects.bulk_create(
+            Genre(name=f"Genre {index}") for index in range(10)
+        )
+        actors = Actor.objects.bulk_create(
+            Actor(first_name="Actor", last_name=str(index))
+            for index in range(50)
+        )
+        movies = Movie.objects.bulk_create(
+            Movie(
+                title=f"Movie {index}",
+                description="Description " * 20,
+                duration=120,
+            )
+            for index in range(options["movies"])
+        )
+        for index, movie in enumerate(movies):
+            movie.genres.add(*genres[index % 10:index % 10 + 2])
+            movie.actors.add(*actors[index % 50:index % 50 + 4])
+
+        hall = CinemaHall.objects.create(
+            name="Benchmark", rows=100, seats_in_row=100
+        )
+        movie_session = MovieSession.objects.create(
+            movie=movies[0],
+            cinema_hall=hall,
+            show_time=timezone.now() + timedelta(days=1),
+        )
+        user = User.objects.create(username="renderer-benchmark")
+        orders = Order.objects.bulk_create(
+            Order(user=user) for _ in range(options["orders"])
+        )
+        per_order = options["tickets_per_order"]
+        Ticket.objects.bulk_create(
+            Ticket(
+                movie_session=movie_session,
+                order=order,
+                row=index // 100 + 1,
+                seat=index % 100 + 1,
+            )
+            for index, order in (
+                (number * per_order + offset, order)
+                for number, order in enumerate(orders)
+                for offset in range(per_order)
+            )
+        )
+
+        movie_queryset = Movie.objects.prefetch_related("genres", "actors")
+        order_queryset = Order.objects.filter(user=user).prefetch_related(
+            "tickets__movie_session__cinema_hall",
+            "tickets__movie_session__movie",
+        )
+        return {
+            "MovieListSerializer": MovieListSerializer(
+                movie_queryset, many=True
+            ).data,
+            "OrderListSerializer": OrderListSerializer(
+                order_queryset, many=True
+            ).data,
+        }
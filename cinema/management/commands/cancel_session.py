@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from cinema.cancellation import cancel_movie_session
+from cinema.models import MovieSession
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Release every ticket of a cancelled movie session at once."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("session_ids", nargs="+", type=int)
+
+    def handle(self, *args, **options) -> None:
+        for session_id in options["session_ids"]:
+            try:
+                movie_session = MovieSession.objects.get(pk=session_id)
+            except MovieSession.DoesNotExist:
+                raise CommandError(
+                    f"Movie session {session_id} does not exist."
+                )
+
+            released = cancel_movie_session(movie_session)
+            self.stdout.write(
+                f"Released {released} tickets of movie session "
+                f"{session_id}."
+            )
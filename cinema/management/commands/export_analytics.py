@@ -0,0 +1,67 @@
+from datetime import datetime, time
+from pathlib import Path
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from cinema.analytics import CHUNK_SIZE, build_report
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Export occupancy heatmaps, demand curves and revenue per hall "
+        "as a compressed .npz file."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("output", help="Path of the .npz file to write.")
+        parser.add_argument("--since", help="First show date (YYYY-MM-DD).")
+        parser.add_argument("--until", help="Show date to stop before.")
+        parser.add_argument(
+            "--max-lead-days",
+            type=int,
+            default=60,
+            help="Tickets sold earlier are counted in the last bucket.",
+        )
+        parser.add_argument(
+            "--no-archive",
+            action="store_true",
+            help="Skip archived tickets.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options) -> None:
+        report = build_report(
+            since=self.parse_day(options["since"]),
+            until=self.parse_day(options["until"]),
+            include_archived=not options["no_archive"],
+            max_lead_days=options["max_lead_days"],
+            chunk_size=options["chunk_size"],
+        )
+
+        output = Path(options["output"])
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open("wb") as file:
+            np.savez_compressed(file, **report)
+
+        self.stdout.write(
+            f"Wrote {len(report)} arrays to {output}: "
+            f"{int(report['hall_tickets'].sum())} tickets, "
+            f"{report['hall_revenue'].sum():.2f} revenue, "
+            f"{len(report['hall_ids'])} halls."
+        )
+
+    @staticmethod
+    def parse_day(value: str) -> datetime | None:
+        if value is None:
+            return None
+
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise CommandError(f"Invalid date: {value!r}.")
+        return timezone.make_aware(datetime.combine(day, time.min))
@@ -0,0 +1,175 @@
+import multiprocessing
+import threading
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.core.servers.basehttp import (
+    ThreadedWSGIServer,
+    WSGIRequestHandler,
+    get_internal_wsgi_application,
+)
+from django.db import connections
+from django.db.models import Count
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from cinema.loadtest import run_worker, summarize
+from cinema.models import CinemaHall, Movie, MovieSession, Ticket
+from user.models import User
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, *args) -> None:
+        pass
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Replay premiere-night booking traffic against a local server."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument(
+            "--duration", type=float, default=10.0, help="Seconds."
+        )
+        parser.add_argument("--sessions", type=int, default=2)
+        parser.add_argument("--rows", type=int, default=10)
+        parser.add_argument(
+            "--hot-seats",
+            type=int,
+            default=5,
+            help="Seats per row workers compete for.",
+        )
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=0)
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the generated data."
+        )
+
+    def handle(self, *args, **options) -> None:
+        movie, sessions, users = self.seed(options)
+        server = ThreadedWSGIServer(
+            (options["host"], options["port"]), QuietRequestHandler
+        )
+        server.set_app(get_internal_wsgi_application())
+        server_thread = threading.Thread(
+            target=server.serve_forever, daemon=True
+        )
+        server_thread.start()
+        base_url = f"http://{options['host']}:{server.server_port}"
+
+        try:
+            tokens = [
+                str(RefreshToken.for_user(user).access_token) for user in users
+            ]
+            session_specs = [
+                {"id": movie_session.id, "rows": options["rows"]}
+                for movie_session in sessions
+            ]
+            connections.close_all()
+
+            started = time.perf_counter()
+            with multiprocessing.Pool(options["workers"]) as pool:
+                results = pool.starmap(
+                    run_worker,
+                    [
+                        (
+                            base_url,
+                            tokens[index],
+                            session_specs,
+                            options["duration"],
+                            options["hot_seats"],
+                            index,
+                        )
+                        for index in range(options["workers"])
+                    ],
+                )
+            summary = summarize(results, time.perf_counter() - started)
+            summary["duplicate_tickets"] = (
+                Ticket.objects.filter(movie_session__in=sessions)
+                .values("movie_session", "row", "seat")
+                .annotate(copies=Count("id"))
+                .filter(copies__gt=1)
+                .count()
+            )
+            summary["stored_tickets"] = Ticket.objects.filter(
+                movie_session__in=sessions
+            ).count()
+            self.report(summary)
+        finally:
+            server.shutdown()
+            server.server_close()
+            if not options["keep"]:
+                movie.delete()
+                sessions[0].cinema_hall.delete()
+                User.objects.filter(
+                    pk__in=[user.pk for user in users]
+                ).delete()
+
+    @staticmethod
+    def seed(options: dict) -> tuple:
+        stamp = timezone.now().strftime("%Y%m%d%H%M%S")
+        cinema_hall = CinemaHall.objects.create(
+            name=f"Load test {stamp}",
+            rows=options["rows"],
+            seats_in_row=max(options["hot_seats"], 10),
+        )
+        movie = Movie.objects.create(
+            title=f"Load test {stamp}",
+            description="Generated by manage.py loadtest.",
+            duration=120,
+        )
+        sessions = [
+            MovieSession.objects.create(
+                movie=movie,
+                cinema_hall=cinema_hall,
+                show_time=timezone.now() + timedelta(days=1, hours=index),
+            )
+            for index in range(options["sessions"])
+        ]
+        users = [
+            User.objects.create(username=f"loadtest-{stamp}-{index}")
+            for index in range(options["workers"])
+        ]
+        return movie, sessions, users
+
+    def report(self, summary: dict) -> None:
+        elapsed = summary["elapsed"]
+        self.stdout.write(
+            f"{summary['requests']} requests in {elapsed:.1f}s "
+            f"({summary['requests'] / elapsed:.1f} req/s)"
+        )
+        for kind, stats in summary["kinds"].items():
+            self.stdout.write(
+                f"  {kind:<14}{stats['count']:>7} "
+                f"{stats['throughput']:>8.1f}/s  "
+                f"p50 {stats['p50_ms']:>7.1f} ms  "
+                f"p95 {stats['p95_ms']:>7.1f} ms  "
+                f"p99 {stats['p99_ms']:>7.1f} ms  "
+                f"statuses {stats['statuses']}"
+            )
+
+        orders = summary["orders"]
+        self.stdout.write(
+            f"Orders: {orders['created']} created, "
+            f"{orders['conflicts']} conflicts "
+            f"({orders['conflict_rate']:.1%}), "
+            f"{orders['throttled']} throttled, {orders['errors']} errors"
+        )
+        self.stdout.write(
+            f"Seats: {summary['booked_seats']} booked by clients, "
+            f"{summary['stored_tickets']} stored"
+        )
+
+        if summary["duplicate_bookings"] or summary["duplicate_tickets"]:
+            self.stderr.write(
+                self.style.ERROR(
+                    f"Double bookings detected: "
+                    f"{summary['duplicate_bookings']} acknowledged, "
+                    f"{summary['duplicate_tickets']} stored"
+                )
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS("No double bookings."))
@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from cinema.startup import profile_startup
+
+ROLES = ("all", "api")
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Profile cold start per role: import time per package, app "
+        "loading and the first request in a fresh interpreter."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--role", nargs="+", choices=ROLES, default=list(ROLES)
+        )
+        parser.add_argument(
+            "--path",
+            default="/api/cinema/",
+            help="Path of the first request.",
+        )
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument(
+            "--top", type=int, default=10, help="Packages to list per role."
+        )
+        parser.add_argument(
+            "--target-ms",
+            type=float,
+            default=settings.STARTUP_TARGET_MS,
+            help="Fail if the api role's median time to first request "
+            "is slower.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        medians = {}
+        for role in options["role"]:
+            try:
+                profiles = [
+                    profile_startup(role, options["path"])
+                    for _ in range(options["repeat"])
+                ]
+            except RuntimeError as error:
+                raise CommandError(f"Role {role!r} failed to start: {error}")
+
+            profiles.sort(key=lambda run: run["time_to_first_request_ms"])
+            profile = profiles[len(profiles) // 2]
+            medians[role] = profile["time_to_first_request_ms"]
+            self.write_profile(role, profile, options["top"])
+
+        if "api" in medians and medians["api"] > options["target_ms"]:
+            raise CommandError(
+                f"api role took {medians['api']:.0f} ms to the first "
+                f"request, target is {options['target_ms']:.0f} ms."
+            )
+
+    def write_profile(self, role: str, profile: dict, top: int) -> None:
+        self.stdout.write(
+            f"{role}: {profile['time_to_first_request_ms']:.0f} ms to first "
+            f"request (HTTP {profile['status']}), "
+            f"{profile['modules']} modules"
+        )
+        for name in (
+            "settings_ms",
+            "setup_ms",
+            "first_request_ms",
+            "import_ms",
+        ):
+            self.stdout.write(f"  {name[:-3]:<16}{profile[name]:>10.1f} ms")
+
+        self.stdout.write("  slowest packages (self import time):")
+        for package, self_us in list(profile["packages"].items())[:top]:
+            self.stdout.write(f"    {package:<28}{self_us / 1000:>8.1f} ms")
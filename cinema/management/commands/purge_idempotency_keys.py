@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from cinema.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Delete idempotency keys older than IDEMPOTENCY_KEY_TTL."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of rows deleted per statement.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        cutoff = timezone.now() - settings.IDEMPOTENCY_KEY_TTL
+        expired = IdempotencyKey.objects.filter(created_at__lt=cutoff)
+        deleted = 0
+
+        while True:
+            batch = list(
+                expired.values_list("pk", flat=True)[: options["batch_size"]]
+            )
+            if not batch:
+                break
+            IdempotencyKey.objects.filter(pk__in=batch).delete()
+            deleted += len(batch)
+
+        self.stdout.write(f"Deleted {deleted} expired idempotency keys.")
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from cinema.documents import refresh_movie_documents
+from cinema.models import Movie
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Regenerate the pre-rendered movie documents."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "movie_ids",
+            nargs="*",
+            type=int,
+            help="Movies to refresh (default: all).",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options) -> None:
+        movie_ids = options["movie_ids"] or Movie.objects.values_list(
+            "pk", flat=True
+        )
+        refreshed = refresh_movie_documents(
+            movie_ids, batch_size=options["batch_size"]
+        )
+        self.stdout.write(f"Refreshed {refreshed} movie documents.")
@@ -0,0 +1,78 @@
+import multiprocessing
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from cinema.tasks import requeue_stale_tasks, run_pending_tasks
+
+
+def work(batch_size: int, poll_interval: float, once: bool) -> None:
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *args: stopping.append(True))
+
+    requeued_at = None
+    while not stopping:
+        # Tasks of a worker that died are picked up again without waiting
+        # for the pool to restart, at most once per poll interval.
+        now = time.monotonic()
+        if requeued_at is None or now - requeued_at >= poll_interval:
+            requeue_stale_tasks()
+            requeued_at = now
+        if run_pending_tasks(batch_size):
+            continue
+        if once:
+            break
+        time.sleep(poll_interval)
+
+
+class Command(BaseCommand):
+    help = (  # noqa: VNE003
+        "Run background task workers in a pool of processes."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=multiprocessing.cpu_count(),
+            help="Worker processes; 0 runs tasks in this process.",
+        )
+        parser.add_argument("--batch-size", type=int, default=10)
+        parser.add_argument("--poll-interval", type=float, default=1.0)
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no task is due instead of polling.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        worker_args = (
+            options["batch_size"],
+            options["poll_interval"],
+            options["once"],
+        )
+
+        if not options["processes"]:
+            work(*worker_args)
+            return
+
+        # Children must open their own database connections.
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(target=work, args=worker_args)
+            for _ in range(options["processes"])
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"Started {len(workers)} workers.")
+
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            for worker in workers:
+                worker.terminate()
+            for worker in workers:
+                worker.join()
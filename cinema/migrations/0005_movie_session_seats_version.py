@@ -0,0 +1,34 @@
+# Generated by Django 4.1 on 2026-10-19 08:40
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0004_alter_genre_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moviesession',
+            name='seats_changed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='moviesession',
+            name='seats_released_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='moviesession',
+            name='seats_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='session_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
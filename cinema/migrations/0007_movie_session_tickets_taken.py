@@ -0,0 +1,47 @@
+# Generated by Django 4.1 on 2026-10-19 08:49
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+
+
+def count_taken_tickets(apps, schema_editor):
+    MovieSession = apps.get_model('cinema', 'MovieSession')
+    Ticket = apps.get_model('cinema', 'Ticket')
+    taken = (
+        Ticket.objects.filter(movie_session=OuterRef('pk'))
+        .order_by()
+        .values('movie_session')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    MovieSession.objects.filter(tickets__isnull=False).update(
+        tickets_taken=Subquery(taken)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0006_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moviesession',
+            name='tickets_taken',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_taken_tickets, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='moviesession',
+            index=models.Index(fields=['show_time'], name='cinema_movi_show_ti_234542_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='moviesession',
+            index=models.Index(fields=['movie', 'show_time'], name='cinema_movi_movie_i_2a226a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='moviesession',
+            index=models.Index(fields=['cinema_hall', 'show_time'], name='cinema_movi_cinema__fedb89_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.1 on 2026-10-19 08:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0007_movie_session_tickets_taken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTicket',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('row', models.IntegerField()),
+                ('seat', models.IntegerField()),
+                ('session_version', models.PositiveIntegerField(default=0)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('movie_session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tickets', to='cinema.moviesession')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tickets', to='cinema.order')),
+            ],
+        ),
+    ]
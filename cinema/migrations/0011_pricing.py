@@ -0,0 +1,55 @@
+# Generated by Django 4.1 on 2026-10-19 09:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0010_order_cancelled_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedticket',
+            name='price',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=8),
+        ),
+        migrations.AddField(
+            model_name='moviesession',
+            name='base_price',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=8),
+        ),
+        migrations.AddField(
+            model_name='moviesession',
+            name='price_table',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='total_price',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='price',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=8),
+        ),
+        migrations.CreateModel(
+            name='PricingRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('kind', models.CharField(choices=[('row_tier', 'Row Tier'), ('time_of_day', 'Time Of Day'), ('bulk', 'Bulk')], max_length=16)),
+                ('multiplier', models.DecimalField(decimal_places=3, max_digits=5)),
+                ('is_active', models.BooleanField(default=True)),
+                ('row_from', models.PositiveIntegerField(blank=True, null=True)),
+                ('row_to', models.PositiveIntegerField(blank=True, null=True)),
+                ('starts_at', models.TimeField(blank=True, null=True)),
+                ('ends_at', models.TimeField(blank=True, null=True)),
+                ('min_tickets', models.PositiveIntegerField(blank=True, null=True)),
+                ('cinema_hall', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='pricing_rules', to='cinema.cinemahall')),
+            ],
+        ),
+    ]
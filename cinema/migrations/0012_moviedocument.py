@@ -0,0 +1,23 @@
+# Generated by Django 4.1 on 2026-10-19 09:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0011_pricing'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MovieDocument',
+            fields=[
+                ('movie', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='document', serialize=False, to='cinema.movie')),
+                ('detail', models.JSONField()),
+                ('session_detail', models.JSONField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.1 on 2026-10-19 09:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinema', '0012_moviedocument'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moviesession',
+            name='cancelled_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
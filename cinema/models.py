@@ -1,12 +1,20 @@
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.db.models import F
 from django.conf import settings
+from django.utils import timezone
 
 
 class CinemaHall(models.Model):
     name = models.CharField(max_length=255)
     rows = models.IntegerField()
     seats_in_row = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
 
     @property
     def capacity(self) -> int:
@@ -41,6 +49,7 @@ class Movie(models.Model):
     duration = models.IntegerField()
     genres = models.ManyToManyField(Genre)
     actors = models.ManyToManyField(Actor)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["title"]
@@ -49,13 +58,93 @@ class Movie(models.Model):
         return self.title
 
 
+class MovieDocument(models.Model):
+    movie = models.OneToOneField(
+        Movie,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="document",
+    )
+    # Pre-rendered payloads of the movie detail and movie session detail
+    # endpoints.
+    detail = models.JSONField()
+    session_detail = models.JSONField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return str(self.movie_id)
+
+
+_release_counted = ContextVar("release_counted", default=False)
+
+
+@contextmanager
+def release_counted():
+    # Ticket deletes inside this block update the session counters and
+    # publish seat events themselves, so the per-ticket signal stands down.
+    token = _release_counted.set(True)
+    try:
+        yield
+    finally:
+        _release_counted.reset(token)
+
+
+def is_release_counted() -> bool:
+    return _release_counted.get()
+
+
+class MovieSessionManager(models.Manager):
+    def take_seats(self, session_id: int, count: int = 1) -> int:
+        # The update takes the session row lock, so a cancellation that
+        # committed first is always seen here.
+        taken = self.filter(pk=session_id, cancelled_at__isnull=True).update(
+            seats_version=F("seats_version") + 1,
+            seats_changed_at=timezone.now(),
+            tickets_taken=F("tickets_taken") + count,
+        )
+        if not taken:
+            raise ValidationError(
+                {"movie_session": "Movie session is cancelled."}
+            )
+        return (
+            self.filter(pk=session_id)
+            .values_list("seats_version", flat=True)
+            .get()
+        )
+
+    def release_seats(self, session_id: int, count: int = 1) -> None:
+        self.filter(pk=session_id).update(
+            seats_version=F("seats_version") + 1,
+            seats_released_version=F("seats_version") + 1,
+            seats_changed_at=timezone.now(),
+            tickets_taken=F("tickets_taken") - count,
+        )
+
+
 class MovieSession(models.Model):
     show_time = models.DateTimeField()
     movie = models.ForeignKey(Movie, on_delete=models.CASCADE)
     cinema_hall = models.ForeignKey(CinemaHall, on_delete=models.CASCADE)
+    seats_version = models.PositiveIntegerField(default=0)
+    seats_released_version = models.PositiveIntegerField(default=0)
+    seats_changed_at = models.DateTimeField(default=timezone.now)
+    tickets_taken = models.PositiveIntegerField(default=0)
+    cancelled_at = models.DateTimeField(null=True, blank=True)
+    base_price = models.DecimalField(
+        max_digits=8, decimal_places=2, default=0
+    )
+    # Price per row (index 0 is row 1), compiled from PricingRule.
+    price_table = models.JSONField(default=list, blank=True)
+
+    objects = MovieSessionManager()
 
     class Meta:
         ordering = ["-show_time"]
+        indexes = [
+            models.Index(fields=["show_time"]),
+            models.Index(fields=["movie", "show_time"]),
+            models.Index(fields=["cinema_hall", "show_time"]),
+        ]
 
     def __str__(self):
         return self.movie.title + " " + str(self.show_time)
@@ -63,6 +152,10 @@ class MovieSession(models.Model):
 
 class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
+    cancelled_at = models.DateTimeField(null=True, blank=True)
+    total_price = models.DecimalField(
+        max_digits=10, decimal_places=2, default=0
+    )
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE
     )
@@ -74,6 +167,51 @@ class Order(models.Model):
         ordering = ["-created_at"]
 
 
+class IdempotencyKey(models.Model):
+    key = models.CharField(max_length=255)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE
+    )
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField()
+    response = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        unique_together = ("user", "key")
+
+    def __str__(self):
+        return self.key
+
+    @property
+    def is_expired(self) -> bool:
+        return self.created_at < timezone.now() - settings.IDEMPOTENCY_KEY_TTL
+
+
+class TicketManager(models.Manager):
+    def create_validated(self, tickets: list["Ticket"]) -> list["Ticket"]:
+        from cinema.validation import validate_seat
+
+        places = set()
+        for ticket in tickets:
+            validate_seat(ticket.movie_session_id, ticket.row, ticket.seat)
+            place = (ticket.movie_session_id, ticket.row, ticket.seat)
+            if place in places:
+                raise ValidationError(
+                    {"seat": "The same seat is booked twice in one order."}
+                )
+            places.add(place)
+
+        sessions = Counter(ticket.movie_session_id for ticket in tickets)
+        for session_id, count in sessions.items():
+            version = MovieSession.objects.take_seats(session_id, count)
+            for ticket in tickets:
+                if ticket.movie_session_id == session_id:
+                    ticket.session_version = version
+
+        return self.bulk_create(tickets)
+
+
 class Ticket(models.Model):
     movie_session = models.ForeignKey(
         MovieSession, on_delete=models.CASCADE, related_name="tickets"
@@ -83,24 +221,15 @@ class Ticket(models.Model):
     )
     row = models.IntegerField()
     seat = models.IntegerField()
+    session_version = models.PositiveIntegerField(default=0)
+    price = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+
+    objects = TicketManager()
 
     def clean(self):
-        for ticket_attr_value, ticket_attr_name, cinema_hall_attr_name in [
-            (self.row, "row", "rows"),
-            (self.seat, "seat", "seats_in_row"),
-        ]:
-            count_attrs = getattr(
-                self.movie_session.cinema_hall, cinema_hall_attr_name
-            )
-            if not (1 <= ticket_attr_value <= count_attrs):
-                raise ValidationError(
-                    {
-                        ticket_attr_name: f"{ticket_attr_name} "
-                        f"number must be in available range: "
-                        f"(1, {cinema_hall_attr_name}): "
-                        f"(1, {count_attrs})"
-                    }
-                )
+        from cinema.validation import validate_seat
+
+        validate_seat(self.movie_session_id, self.row, self.seat)
 
     def save(
         self,
@@ -121,3 +250,81 @@ class Ticket(models.Model):
 
     class Meta:
         unique_together = ("movie_session", "row", "seat")
+
+
+class ArchivedTicket(models.Model):
+    id = models.BigIntegerField(primary_key=True)  # noqa: VNE003
+    movie_session = models.ForeignKey(
+        MovieSession,
+        on_delete=models.CASCADE,
+        related_name="archived_tickets",
+    )
+    order = models.ForeignKey(
+        Order, on_delete=models.CASCADE, related_name="archived_tickets"
+    )
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    session_version = models.PositiveIntegerField(default=0)
+    price = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return (
+            f"{str(self.movie_session)} (row: {self.row}, seat: {self.seat})"
+        )
+
+
+class PricingRule(models.Model):
+    class Kind(models.TextChoices):
+        ROW_TIER = "row_tier"
+        TIME_OF_DAY = "time_of_day"
+        BULK = "bulk"
+
+    name = models.CharField(max_length=255)
+    kind = models.CharField(max_length=16, choices=Kind.choices)
+    multiplier = models.DecimalField(max_digits=5, decimal_places=3)
+    is_active = models.BooleanField(default=True)
+    # Row tiers; an empty hall applies the tier to every hall.
+    cinema_hall = models.ForeignKey(
+        CinemaHall,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="pricing_rules",
+    )
+    row_from = models.PositiveIntegerField(null=True, blank=True)
+    row_to = models.PositiveIntegerField(null=True, blank=True)
+    # Time of day, in local time; starts_at > ends_at wraps past midnight.
+    starts_at = models.TimeField(null=True, blank=True)
+    ends_at = models.TimeField(null=True, blank=True)
+    # Bulk discounts, applied per order.
+    min_tickets = models.PositiveIntegerField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} (x{self.multiplier})"
+
+
+class Task(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        DONE = "done"
+        FAILED = "failed"
+
+    name = models.CharField(max_length=255)
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    status = models.CharField(
+        max_length=16, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "run_after"])]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
@@ -0,0 +1,114 @@
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from cinema.models import MovieSession, PricingRule
+
+CENT = Decimal("0.01")
+
+
+def get_schedule_rules() -> list[PricingRule]:
+    return list(
+        PricingRule.objects.filter(
+            is_active=True,
+            kind__in=(PricingRule.Kind.ROW_TIER, PricingRule.Kind.TIME_OF_DAY),
+        )
+    )
+
+
+def matches_time_of_day(rule: PricingRule, show_time: datetime) -> bool:
+    if rule.starts_at is None or rule.ends_at is None:
+        return False
+
+    if timezone.is_aware(show_time):
+        show_time = timezone.localtime(show_time)
+    moment = show_time.time()
+    if rule.starts_at <= rule.ends_at:
+        return rule.starts_at <= moment < rule.ends_at
+    return moment >= rule.starts_at or moment < rule.ends_at
+
+
+def matches_row(rule: PricingRule, hall_id: int, row: int) -> bool:
+    return (
+        rule.cinema_hall_id in (None, hall_id)
+        and (rule.row_from is None or rule.row_from <= row)
+        and (rule.row_to is None or row <= rule.row_to)
+    )
+
+
+def compile_price_table(
+    movie_session: MovieSession, rules: list[PricingRule]
+) -> list[str]:
+    price = Decimal(movie_session.base_price)
+    for rule in rules:
+        if rule.kind == PricingRule.Kind.TIME_OF_DAY and matches_time_of_day(
+            rule, movie_session.show_time
+        ):
+            price *= rule.multiplier
+
+    hall = movie_session.cinema_hall
+    row_rules = [
+        rule for rule in rules if rule.kind == PricingRule.Kind.ROW_TIER
+    ]
+    table = []
+    for row in range(1, hall.rows + 1):
+        row_price = price
+        for rule in row_rules:
+            if matches_row(rule, hall.id, row):
+                row_price *= rule.multiplier
+        table.append(str(row_price.quantize(CENT, ROUND_HALF_UP)))
+    return table
+
+
+def compile_price_tables(sessions: QuerySet, batch_size: int = 500) -> int:
+    rules = get_schedule_rules()
+    compiled, batch = 0, []
+    for movie_session in (
+        sessions.select_related("cinema_hall")
+        .only("show_time", "base_price", "cinema_hall__rows")
+        .iterator(chunk_size=batch_size)
+    ):
+        movie_session.price_table = compile_price_table(movie_session, rules)
+        batch.append(movie_session)
+        if len(batch) >= batch_size:
+            MovieSession.objects.bulk_update(batch, ["price_table"])
+            compiled += len(batch)
+            batch = []
+
+    if batch:
+        MovieSession.objects.bulk_update(batch, ["price_table"])
+        compiled += len(batch)
+    return compiled
+
+
+def recompile_upcoming_price_tables(*filters: Q) -> int:
+    return compile_price_tables(
+        MovieSession.objects.filter(*filters, show_time__gte=timezone.now())
+    )
+
+
+def get_bulk_multiplier(ticket_count: int) -> Decimal:
+    multiplier = (
+        PricingRule.objects.filter(
+            kind=PricingRule.Kind.BULK,
+            is_active=True,
+            min_tickets__lte=ticket_count,
+        )
+        .order_by("multiplier")
+        .values_list("multiplier", flat=True)
+        .first()
+    )
+    return multiplier if multiplier is not None else Decimal(1)
+
+
+def price_ticket(
+    movie_session: MovieSession, row: int, multiplier: Decimal = 1
+) -> Decimal:
+    table = movie_session.price_table
+    if 1 <= row <= len(table):
+        price = Decimal(table[row - 1])
+    else:
+        price = Decimal(movie_session.base_price)
+    return (price * multiplier).quantize(CENT, ROUND_HALF_UP)
@@ -0,0 +1,119 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+class FieldProjection:
+    def __init__(
+        self,
+        only: tuple = (),
+        select_related: tuple = (),
+        prefetch_related: tuple = (),
+        annotate: dict = None,
+    ) -> None:
+        self.only = only
+        self.select_related = select_related
+        self.prefetch_related = prefetch_related
+        self.annotate = annotate or {}
+
+
+class ProjectedFieldsMixin:
+    def get_fields(self) -> dict:
+        fields = super().get_fields()
+        root = self.root
+        if isinstance(root, serializers.ListSerializer):
+            root = root.child
+
+        requested = self.context.get("fields")
+        if root is self and requested is not None:
+            fields = {
+                name: field
+                for name, field in fields.items()
+                if name in requested
+            }
+        return fields
+
+
+class FieldProjectionMixin:
+    field_projections = {}
+
+    def get_serializer_field_names(self) -> tuple:
+        return tuple(self.get_serializer_class().Meta.fields)
+
+    def get_requested_fields(self) -> set | None:
+        if hasattr(self, "_requested_fields"):
+            return self._requested_fields
+
+        requested = None
+        if self.request.method in ("GET", "HEAD"):
+            available = self.get_serializer_field_names()
+            only = self.parse_field_names("fields", available)
+            omit = self.parse_field_names("omit", available)
+
+            if only is not None or omit is not None:
+                requested = set(only if only is not None else available)
+                requested -= omit or set()
+                requested.add("id")
+
+        self._requested_fields = requested
+        return requested
+
+    def parse_field_names(self, param: str, available: tuple) -> set | None:
+        value = self.request.query_params.get(param)
+        if value is None:
+            return None
+
+        names = {name.strip() for name in value.split(",") if name.strip()}
+        unknown = names.difference(available)
+        if unknown:
+            raise ValidationError(
+                {param: f"Unknown fields: {', '.join(sorted(unknown))}."}
+            )
+        return names
+
+    def get_field_projection(self, name: str) -> FieldProjection:
+        if name in self.field_projections:
+            return self.field_projections[name]
+
+        model = self.get_serializer_class().Meta.model
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return FieldProjection()
+
+        if field.concrete and not field.many_to_many:
+            return FieldProjection(only=(name,))
+        return FieldProjection()
+
+    def project_queryset(self, queryset: QuerySet) -> QuerySet:
+        requested = self.get_requested_fields()
+        names = self.get_serializer_field_names()
+        if requested is not None:
+            names = [name for name in names if name in requested]
+
+        only, select_related, prefetch_related, annotate = [], [], [], {}
+        for name in names:
+            projection = self.get_field_projection(name)
+            only.extend(projection.only)
+            select_related.extend(projection.select_related)
+            prefetch_related.extend(projection.prefetch_related)
+            annotate.update(projection.annotate)
+
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        if annotate:
+            queryset = queryset.annotate(**annotate)
+        if requested is not None:
+            queryset = queryset.only("id", *only)
+        return queryset
+
+    def get_queryset(self) -> QuerySet:
+        return self.project_queryset(super().get_queryset())
+
+    def get_serializer_context(self) -> dict:
+        context = super().get_serializer_context()
+        context["fields"] = self.get_requested_fields()
+        return context
@@ -0,0 +1,64 @@
+from typing import Iterable, Iterator
+
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_encoder = JSONEncoder()
+
+
+def dumps(data) -> bytes:
+    # Dates go through DRF's encoder too, which writes UTC as "Z" like
+    # the stock JSONRenderer.
+    return orjson.dumps(
+        data,
+        default=_encoder.default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+    )
+
+
+def stream_json_list(rows: Iterable, batch_size: int) -> Iterator[bytes]:
+    # Yields a JSON array a batch of rows at a time, so only one batch of
+    # encoded rows is held in memory.
+    yield b"["
+    batch = []
+    separator = b""
+    for row in rows:
+        batch.append(dumps(row))
+        if len(batch) >= batch_size:
+            yield separator + b",".join(batch)
+            batch = []
+            separator = b","
+    if batch:
+        yield separator + b",".join(batch)
+    yield b"]"
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = "application/json"
+    format = "json"  # noqa: VNE003
+    charset = None
+
+    def render(
+        self, data, accepted_media_type=None, renderer_context=None
+    ) -> bytes:
+        if data is None:
+            return b""
+        return dumps(data)
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"  # noqa: VNE003
+    charset = None
+    render_style = "binary"
+
+    def render(
+        self, data, accepted_media_type=None, renderer_context=None
+    ) -> bytes:
+        if data is None:
+            return b""
+        return msgpack.packb(
+            data, default=_encoder.default, use_bin_type=True
+        )
@@ -0,0 +1,98 @@
+import base64
+from collections import defaultdict
+
+from django.core.cache import cache
+
+from cinema.models import MovieSession, Ticket
+
+SEAT_MAP_KEY = "cinema:seat_map:{id}:{version}:{rows}x{seats_in_row}"
+SEAT_MAP_TIMEOUT = 300
+
+
+def encode_bitmap(
+    places: list[tuple[int, int]], rows: int, seats_in_row: int
+) -> str:
+    # Row-major, one bit per seat, most significant bit first. Tickets
+    # outside the hall, e.g. after it was shrunk, have no bit to set.
+    bitmap = bytearray((rows * seats_in_row + 7) // 8)
+    for row, seat in places:
+        if not (1 <= row <= rows and 1 <= seat <= seats_in_row):
+            continue
+        index = (row - 1) * seats_in_row + seat - 1
+        bitmap[index // 8] |= 0x80 >> index % 8
+    return base64.b64encode(bitmap).decode()
+
+
+def decode_bitmap(
+    encoded: str, rows: int, seats_in_row: int
+) -> list[tuple[int, int]]:
+    bitmap = base64.b64decode(encoded)
+    return [
+        (index // seats_in_row + 1, index % seats_in_row + 1)
+        for index in range(rows * seats_in_row)
+        if bitmap[index // 8] & 0x80 >> index % 8
+    ]
+
+
+def get_seat_maps(session_ids: list[int]) -> list[dict]:
+    sessions = list(
+        MovieSession.objects.filter(pk__in=session_ids)
+        .order_by("pk")
+        .values(
+            "id",
+            "seats_version",
+            "cinema_hall__rows",
+            "cinema_hall__seats_in_row",
+        )
+    )
+    keys = {
+        movie_session["id"]: SEAT_MAP_KEY.format(
+            id=movie_session["id"],
+            version=movie_session["seats_version"],
+            rows=movie_session["cinema_hall__rows"],
+            seats_in_row=movie_session["cinema_hall__seats_in_row"],
+        )
+        for movie_session in sessions
+    }
+    # Keys carry the seats version and hall geometry, so a taken or
+    # released seat or a resized hall simply makes the old bitmap
+    # unreachable.
+    cached = cache.get_many(keys.values())
+
+    missing = [
+        movie_session["id"]
+        for movie_session in sessions
+        if keys[movie_session["id"]] not in cached
+    ]
+    places = defaultdict(list)
+    if missing:
+        for session_id, row, seat in Ticket.objects.filter(
+            movie_session_id__in=missing
+        ).values_list("movie_session_id", "row", "seat"):
+            places[session_id].append((row, seat))
+
+    seat_maps, fresh = [], {}
+    for movie_session in sessions:
+        key = keys[movie_session["id"]]
+        rows = movie_session["cinema_hall__rows"]
+        seats_in_row = movie_session["cinema_hall__seats_in_row"]
+        if key in cached:
+            taken = cached[key]
+        else:
+            taken = encode_bitmap(
+                places[movie_session["id"]], rows, seats_in_row
+            )
+            fresh[key] = taken
+        seat_maps.append(
+            {
+                "id": movie_session["id"],
+                "seats_version": movie_session["seats_version"],
+                "rows": rows,
+                "seats_in_row": seats_in_row,
+                "taken": taken,
+            }
+        )
+
+    if fresh:
+        cache.set_many(fresh, timeout=SEAT_MAP_TIMEOUT)
+    return seat_maps
@@ -1,7 +1,20 @@
-from django.db import transaction
+from collections import defaultdict
+from functools import partial
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from cinema.catalog import attach_movie_catalog_ids, get_catalog
+from cinema.events import publish_seats_taken
+from cinema.pricing import get_bulk_multiplier, price_ticket
+from cinema.projection import ProjectedFieldsMixin
+from cinema.tasks import enqueue
+from cinema.validation import hall_geometry
+
 from cinema.models import (
     Genre,
     Actor,
@@ -13,57 +26,107 @@ from cinema.models import (
 )
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(ProjectedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Genre
         fields = ("id", "name")
 
 
-class ActorSerializer(serializers.ModelSerializer):
+class ActorSerializer(ProjectedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Actor
         fields = ("id", "first_name", "last_name", "full_name")
 
 
-class CinemaHallSerializer(serializers.ModelSerializer):
+class CinemaHallSerializer(ProjectedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = CinemaHall
         fields = ("id", "name", "rows", "seats_in_row", "capacity")
 
 
-class MovieSerializer(serializers.ModelSerializer):
+class MovieSerializer(ProjectedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Movie
         fields = ("id", "title", "description", "duration", "genres", "actors")
 
 
+class MovieCatalogListSerializer(serializers.ListSerializer):
+    def to_representation(self, data) -> list:
+        movies = list(data.all() if isinstance(data, models.Manager) else data)
+        # Resolved once for the whole list instead of per movie and field.
+        self.catalog = get_catalog()
+        attach_movie_catalog_ids(
+            movies,
+            tuple(
+                name
+                for name, field in self.child.fields.items()
+                if isinstance(field, MovieCatalogField)
+            ),
+        )
+        return super().to_representation(movies)
+
+
+class MovieCatalogField(serializers.Field):
+    def __init__(
+        self, serializer_class: type = None, slug_field: str = None, **kwargs
+    ) -> None:
+        self.serializer_class = serializer_class
+        self.slug_field = slug_field
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, movie: Movie) -> list:
+        attach_movie_catalog_ids([movie], (self.field_name,))
+        catalog = getattr(self.parent.parent, "catalog", None)
+        related = (catalog or get_catalog()).get_many(
+            self.field_name, movie.catalog_ids[self.field_name]
+        )
+        if self.slug_field:
+            return [getattr(obj, self.slug_field) for obj in related]
+        return self.serializer_class(related, many=True).data
+
+
 class MovieListSerializer(MovieSerializer):
-    genres = GenreSerializer(many=True, read_only=True)
-    actors = ActorSerializer(many=True, read_only=True)
+    genres = MovieCatalogField(serializer_class=GenreSerializer)
+    actors = MovieCatalogField(serializer_class=ActorSerializer)
+
+    class Meta(MovieSerializer.Meta):
+        list_serializer_class = MovieCatalogListSerializer
 
 
 class MovieDetailSerializer(MovieSerializer):
-    genres = GenreSerializer(many=True, read_only=True)
-    actors = ActorSerializer(many=True, read_only=True)
+    genres = MovieCatalogField(serializer_class=GenreSerializer)
+    actors = MovieCatalogField(serializer_class=ActorSerializer)
 
 
 class MovieForSessionDetailSerializer(serializers.ModelSerializer):
-    genres = serializers.SlugRelatedField(
-        slug_field="name", many=True, read_only=True
-    )
-    actors = serializers.SlugRelatedField(
-        slug_field="full_name", many=True, read_only=True
-    )
+    genres = MovieCatalogField(slug_field="name")
+    actors = MovieCatalogField(slug_field="full_name")
 
     class Meta:
         model = Movie
         fields = ("id", "title", "description", "duration", "genres", "actors")
 
 
-class MovieSessionSerializer(serializers.ModelSerializer):
+class MovieDocumentField(serializers.Field):
+    def __init__(self, **kwargs) -> None:
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, movie: Movie) -> dict:
+        document = getattr(movie, "document", None)
+        if document is not None:
+            return document.session_detail
+        return MovieForSessionDetailSerializer(movie).data
+
+
+class MovieSessionSerializer(
+    ProjectedFieldsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = MovieSession
-        fields = ("id", "show_time", "movie", "cinema_hall")
+        fields = ("id", "show_time", "movie", "cinema_hall", "base_price")
 
 
 class MovieSessionListSerializer(MovieSessionSerializer):
@@ -85,6 +148,24 @@ class MovieSessionListSerializer(MovieSessionSerializer):
             "cinema_hall_name",
             "cinema_hall_capacity",
             "tickets_available",
+            "base_price",
+        )
+
+
+class UpcomingSessionSerializer(serializers.ModelSerializer):
+    cinema_hall_name = serializers.CharField(read_only=True)
+    cinema_hall_capacity = serializers.IntegerField(read_only=True)
+    tickets_available = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = MovieSession
+        fields = (
+            "id",
+            "show_time",
+            "cinema_hall_name",
+            "cinema_hall_capacity",
+            "tickets_available",
+            "base_price",
         )
 
 
@@ -98,9 +179,10 @@ class TicketSerializer(serializers.ModelSerializer):
     def validate(self, attrs: dict) -> dict:
         data = super(TicketSerializer, self).validate(attrs)
         movie_session = attrs["movie_session"]
+        rows, seats_in_row = hall_geometry.get(movie_session.id)
 
         if (
-            attrs["row"] > movie_session.cinema_hall.rows
+            attrs["row"] > rows
             or attrs["row"] < 1
         ):
             raise ValidationError(
@@ -108,16 +190,24 @@ class TicketSerializer(serializers.ModelSerializer):
             )
 
         if (
-            attrs["seat"] > movie_session.cinema_hall.seats_in_row
+            attrs["seat"] > seats_in_row
             or attrs["seat"] < 1
         ):
             raise ValidationError(
                 {"seat": "Invalid seat number"}
             )
 
+        # Only sessions past the archive horizon can have archived tickets,
+        # which the unique constraint on Ticket no longer covers.
         if movie_session.tickets.filter(
             row=attrs["row"], seat=attrs["seat"]
-        ).exists():
+        ).exists() or (
+            movie_session.show_time
+            < timezone.now() - settings.TICKET_ARCHIVE_HORIZON
+            and movie_session.archived_tickets.filter(
+                row=attrs["row"], seat=attrs["seat"]
+            ).exists()
+        ):
             raise ValidationError(
                 {
                     "ticket": "This seat and row are already taken for this movie "
@@ -129,11 +219,12 @@ class TicketSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Ticket
-        fields = ("id", "seat", "row", "movie_session")
+        fields = ("id", "seat", "row", "movie_session", "price")
+        read_only_fields = ("price",)
 
 
 class MovieSessionDetailSerializer(MovieSessionSerializer):
-    movie = MovieForSessionDetailSerializer(many=False, read_only=True)
+    movie = MovieDocumentField()
     cinema_hall = CinemaHallSerializer(many=False, read_only=True)
     taken_places = TakenPlaceSerializer(
         source="tickets", many=True, read_only=True
@@ -141,30 +232,137 @@ class MovieSessionDetailSerializer(MovieSessionSerializer):
 
     class Meta:
         model = MovieSession
-        fields = ("id", "show_time", "movie", "cinema_hall", "taken_places")
+        fields = (
+            "id",
+            "show_time",
+            "movie",
+            "cinema_hall",
+            "taken_places",
+            "seats_version",
+            "base_price",
+            "price_table",
+            "cancelled_at",
+        )
+
+
+class MovieSessionSeatsDeltaSerializer(serializers.ModelSerializer):
+    taken_places = TakenPlaceSerializer(many=True, read_only=True)
+    delta = serializers.BooleanField(default=True, read_only=True)
+
+    class Meta:
+        model = MovieSession
+        fields = ("id", "seats_version", "delta", "taken_places")
 
 
 class TicketOrderListSerializer(TicketSerializer):
     movie_session = MovieSessionListSerializer(read_only=True)
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderTicketsField(serializers.Field):
+    def __init__(self, **kwargs) -> None:
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, order: Order) -> list:
+        # Archived tickets keep their ids, so the order history reads the
+        # same before and after archiving.
+        tickets = sorted(
+            [*order.tickets.all(), *order.archived_tickets.all()],
+            key=lambda ticket: ticket.pk,
+        )
+        return TicketOrderListSerializer(
+            tickets, many=True, context=self.context
+        ).data
+
+
+class OrderSerializer(ProjectedFieldsMixin, serializers.ModelSerializer):
     tickets = TicketSerializer(many=True, read_only=False)
 
     class Meta:
         model = Order
-        fields = ("id", "tickets", "created_at")
+        fields = (
+            "id",
+            "tickets",
+            "created_at",
+            "cancelled_at",
+            "total_price",
+        )
+        read_only_fields = ("cancelled_at", "total_price")
+
+    def validate_tickets(self, tickets: list[dict]) -> list[dict]:
+        places = [
+            (ticket["movie_session"].id, ticket["row"], ticket["seat"])
+            for ticket in tickets
+        ]
+        if len(set(places)) != len(places):
+            raise ValidationError(
+                "The same seat is booked twice in one order."
+            )
+        return tickets
 
     @transaction.atomic
     def create(self, validated_data: dict, **kwargs) -> Order:
         tickets_data = validated_data.pop("tickets")
         user = kwargs.get("user") or self.context["request"].user
 
-        order = Order.objects.create(user=user)
+        # Sessions come from the ticket fields with their price tables.
+        multiplier = get_bulk_multiplier(len(tickets_data))
         for ticket_data in tickets_data:
-            Ticket.objects.create(order=order, **ticket_data)
+            ticket_data["price"] = price_ticket(
+                ticket_data["movie_session"], ticket_data["row"], multiplier
+            )
+
+        order = Order.objects.create(
+            user=user,
+            total_price=sum(
+                ticket_data["price"] for ticket_data in tickets_data
+            ),
+        )
+        try:
+            with transaction.atomic():
+                tickets = Ticket.objects.create_validated(
+                    [
+                        Ticket(order=order, **ticket_data)
+                        for ticket_data in tickets_data
+                    ]
+                )
+        except IntegrityError:
+            # A concurrent order took the seat after validation passed.
+            raise ValidationError(
+                {
+                    "ticket": "This seat and row were just taken by another "
+                    "order."
+                }
+            )
+        except DjangoValidationError as error:
+            # E.g. the session was cancelled after validation passed.
+            raise ValidationError(serializers.as_serializer_error(error))
+        taken = defaultdict(list)
+        for ticket in tickets:
+            taken[ticket.movie_session_id].append(ticket)
+
+        for session_id, session_tickets in taken.items():
+            transaction.on_commit(
+                partial(
+                    publish_seats_taken,
+                    session_id,
+                    session_tickets[0].session_version,
+                    [
+                        {"row": ticket.row, "seat": ticket.seat}
+                        for ticket in session_tickets
+                    ],
+                )
+            )
+        enqueue("cinema.send_order_confirmation", {"order_id": order.id})
         return order
 
 
+class OrderCancelSerializer(serializers.Serializer):
+    tickets = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=False
+    )
+
+
 class OrderListSerializer(OrderSerializer):
-    tickets = TicketOrderListSerializer(many=True, read_only=True)
+    tickets = OrderTicketsField()
@@ -0,0 +1,228 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from cinema.catalog import mark_catalog_write
+from cinema.events import publish_seats_released, publish_seats_taken
+from cinema.documents import refresh_movie_documents
+from cinema.models import (
+    Actor,
+    CinemaHall,
+    Genre,
+    Movie,
+    MovieSession,
+    PricingRule,
+    Ticket,
+    is_release_counted,
+)
+from cinema.pricing import (
+    compile_price_table,
+    get_schedule_rules,
+    recompile_upcoming_price_tables,
+)
+from cinema.validation import bump_geometry_version
+
+
+@receiver(pre_save, sender=Ticket)
+def stamp_taken_seat(sender, instance: Ticket, raw: bool, **kwargs) -> None:
+    if raw or not instance._state.adding:
+        return
+
+    instance.session_version = MovieSession.objects.take_seats(
+        instance.movie_session_id
+    )
+
+
+SEAT_FIELDS = ("movie_session_id", "row", "seat")
+SEAT_UPDATE_FIELDS = {"movie_session", *SEAT_FIELDS}
+
+
+@receiver(pre_save, sender=Ticket)
+def move_taken_seat(
+    sender, instance: Ticket, raw: bool, update_fields=None, **kwargs
+) -> None:
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not SEAT_UPDATE_FIELDS & set(
+        update_fields
+    ):
+        return
+
+    previous = (
+        Ticket.objects.filter(pk=instance.pk).values(*SEAT_FIELDS).first()
+    )
+    if previous is None or tuple(previous.values()) == tuple(
+        getattr(instance, field) for field in SEAT_FIELDS
+    ):
+        return
+
+    # Released first so the ticket carries the newest seats version; a
+    # move into a cancelled session rolls the release back.
+    with transaction.atomic():
+        MovieSession.objects.release_seats(previous["movie_session_id"])
+        instance.session_version = MovieSession.objects.take_seats(
+            instance.movie_session_id
+        )
+    transaction.on_commit(
+        partial(
+            publish_seats_released,
+            previous["movie_session_id"],
+            [{"row": previous["row"], "seat": previous["seat"]}],
+        )
+    )
+    transaction.on_commit(
+        partial(
+            publish_seats_taken,
+            instance.movie_session_id,
+            instance.session_version,
+            [{"row": instance.row, "seat": instance.seat}],
+        )
+    )
+
+
+@receiver(post_save, sender=Ticket)
+def count_loaded_seat(
+    sender, instance: Ticket, raw: bool, created: bool, **kwargs
+) -> None:
+    if raw and created:
+        MovieSession.objects.take_seats(instance.movie_session_id)
+
+
+SESSION_OWNERS = (MovieSession, Movie, CinemaHall)
+
+
+@receiver(post_delete, sender=Ticket)
+def stamp_released_seat(
+    sender, instance: Ticket, origin=None, **kwargs
+) -> None:
+    # Cascades that delete the session itself leave nothing to count.
+    origin_model = (
+        origin.model if isinstance(origin, QuerySet) else type(origin)
+    )
+    if issubclass(origin_model, SESSION_OWNERS) or is_release_counted():
+        return
+
+    MovieSession.objects.release_seats(instance.movie_session_id)
+    transaction.on_commit(
+        partial(
+            publish_seats_released,
+            instance.movie_session_id,
+            [{"row": instance.row, "seat": instance.seat}],
+        )
+    )
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Actor)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Actor)
+def invalidate_catalog(sender, using: str, **kwargs) -> None:
+    mark_catalog_write(using)
+
+
+@receiver(post_save, sender=CinemaHall)
+@receiver(post_save, sender=MovieSession)
+@receiver(post_delete, sender=CinemaHall)
+@receiver(post_delete, sender=MovieSession)
+def invalidate_hall_geometry(sender, **kwargs) -> None:
+    bump_geometry_version()
+    transaction.on_commit(bump_geometry_version)
+
+
+@receiver(pre_save, sender=MovieSession)
+def compile_session_prices(
+    sender, instance: MovieSession, raw: bool, update_fields=None, **kwargs
+) -> None:
+    if raw or (
+        update_fields is not None and "price_table" not in update_fields
+    ):
+        return
+
+    instance.price_table = compile_price_table(instance, get_schedule_rules())
+
+
+@receiver(post_save, sender=PricingRule)
+@receiver(post_delete, sender=PricingRule)
+def recompile_prices(sender, instance: PricingRule, **kwargs) -> None:
+    # Bulk discounts are applied per order and need no recompilation.
+    if instance.kind != PricingRule.Kind.BULK:
+        recompile_upcoming_price_tables()
+
+
+@receiver(post_save, sender=CinemaHall)
+def recompile_hall_prices(
+    sender, instance: CinemaHall, created: bool, raw: bool, **kwargs
+) -> None:
+    if not (created or raw):
+        recompile_upcoming_price_tables(Q(cinema_hall=instance))
+
+
+MOVIE_LINKS = {Movie.genres.through: "genre", Movie.actors.through: "actor"}
+
+
+def linked_movie_ids(instance: Genre | Actor) -> list[int]:
+    through = (
+        Movie.genres.through
+        if isinstance(instance, Genre)
+        else Movie.actors.through
+    )
+    return list(
+        through.objects.filter(
+            **{MOVIE_LINKS[through]: instance}
+        ).values_list("movie_id", flat=True)
+    )
+
+
+@receiver(post_save, sender=Movie)
+def refresh_movie_document(sender, instance: Movie, **kwargs) -> None:
+    refresh_movie_documents([instance.pk])
+
+
+@receiver(m2m_changed, sender=Movie.genres.through)
+@receiver(m2m_changed, sender=Movie.actors.through)
+def refresh_linked_movie_documents(
+    sender, instance, action: str, reverse: bool, pk_set: set, **kwargs
+) -> None:
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            refresh_movie_documents([instance.pk])
+    elif action == "pre_clear":
+        instance._document_movie_ids = linked_movie_ids(instance)
+    elif action == "post_clear":
+        refresh_movie_documents(instance.__dict__.pop("_document_movie_ids"))
+    elif action in ("post_add", "post_remove"):
+        refresh_movie_documents(pk_set)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Actor)
+def refresh_catalog_movie_documents(
+    sender, instance: Genre | Actor, created: bool, **kwargs
+) -> None:
+    if not created:
+        refresh_movie_documents(linked_movie_ids(instance))
+
+
+@receiver(pre_delete, sender=Genre)
+@receiver(pre_delete, sender=Actor)
+def remember_catalog_movies(sender, instance: Genre | Actor, **kwargs) -> None:
+    # The links are gone by post_delete and deleting them sends no
+    # m2m_changed.
+    instance._document_movie_ids = linked_movie_ids(instance)
+
+
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Actor)
+def refresh_deleted_catalog_movies(
+    sender, instance: Genre | Actor, **kwargs
+) -> None:
+    refresh_movie_documents(instance.__dict__.pop("_document_movie_ids", []))
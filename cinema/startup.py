@@ -0,0 +1,85 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+
+# Runs in a fresh interpreter under -X importtime. Timings are taken from
+# interpreter start, so they include importing Django and the settings.
+STARTUP_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import django
+from django.conf import settings
+settings.INSTALLED_APPS
+configured = time.perf_counter()
+django.setup()
+ready = time.perf_counter()
+from django.test import Client
+client = Client(SERVER_NAME="localhost", raise_request_exception=False)
+status = client.get(sys.argv[1]).status_code
+first_request = time.perf_counter()
+print(json.dumps({
+    "status": status,
+    "settings_ms": (configured - started) * 1000,
+    "setup_ms": (ready - configured) * 1000,
+    "first_request_ms": (first_request - ready) * 1000,
+    "time_to_first_request_ms": (first_request - started) * 1000,
+}))
+"""
+
+
+def parse_import_times(output: str) -> list[tuple[str, int, int]]:
+    # Lines look like "import time:  self [us] | cumulative | package",
+    # with nested imports indented below the importing module.
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        imports.append((name.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+def group_by_package(imports: list[tuple[str, int, int]]) -> dict:
+    packages = defaultdict(int)
+    for name, self_us, _ in imports:
+        packages[name.split(".")[0]] += self_us
+    return dict(
+        sorted(packages.items(), key=lambda item: item[1], reverse=True)
+    )
+
+
+def profile_startup(role: str, path: str) -> dict:
+    env = {
+        **os.environ,
+        "CINEMA_ROLE": role,
+        "DJANGO_SETTINGS_MODULE": os.environ.get(
+            "DJANGO_SETTINGS_MODULE", "cinema_service.settings"
+        ),
+    }
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT, path],
+        cwd=settings.BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if process.returncode != 0:
+        errors = process.stderr.strip().splitlines()
+        raise RuntimeError(
+            errors[-1] if errors else f"exit status {process.returncode}"
+        )
+
+    imports = parse_import_times(process.stderr)
+    profile = json.loads(process.stdout.strip().splitlines()[-1])
+    profile["imports"] = imports
+    profile["modules"] = len(imports)
+    profile["import_ms"] = sum(self_us for _, self_us, _ in imports) / 1000
+    profile["packages"] = group_by_package(imports)
+    return profile
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import re
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from cinema.events import get_broker, SubscriptionLimitExceeded
+from cinema.models import MovieSession
+
+SEAT_EVENTS_PATH = re.compile(
+    r"^/api/cinema/movie_sessions/(?P<pk>\d+)/events/$"
+)
+
+
+def format_event(event: dict) -> bytes:
+    lines = [f"event: {event['type']}"]
+    if "version" in event:
+        lines.append(f"id: {event['version']}")
+    lines.append(f"data: {json.dumps(event, separators=(',', ':'))}")
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+class SeatEventsApplication:
+    def __init__(self, application) -> None:
+        self.application = application
+
+    async def __call__(self, scope: dict, receive, send) -> None:
+        if scope["type"] == "http":
+            match = SEAT_EVENTS_PATH.match(scope["path"])
+            if match and scope["method"] == "GET":
+                await self.stream(int(match["pk"]), receive, send)
+                return
+
+        await self.application(scope, receive, send)
+
+    @staticmethod
+    async def reject(send, status: int, message: str, headers=()) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", b"text/plain"), *headers],
+            }
+        )
+        await send({"type": "http.response.body", "body": message.encode()})
+
+    async def stream(self, session_id: int, receive, send) -> None:
+        exists = await sync_to_async(
+            MovieSession.objects.filter(pk=session_id).exists
+        )()
+        if not exists:
+            await self.reject(send, 404, "Not found.")
+            return
+
+        broker = get_broker()
+        try:
+            subscription = broker.subscribe(session_id)
+        except SubscriptionLimitExceeded as error:
+            await self.reject(send, 503, str(error), [(b"retry-after", b"5")])
+            return
+
+        config = getattr(settings, "CINEMA_SEAT_EVENTS", {})
+        heartbeat = config.get("HEARTBEAT_SECONDS", 15)
+        disconnected = asyncio.ensure_future(self.wait_disconnect(receive))
+        try:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [
+                        (b"content-type", b"text/event-stream"),
+                        (b"cache-control", b"no-cache"),
+                        (b"x-accel-buffering", b"no"),
+                    ],
+                }
+            )
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": b"retry: 3000\n\n",
+                    "more_body": True,
+                }
+            )
+
+            while not disconnected.done():
+                next_event = asyncio.ensure_future(subscription.get())
+                done, _ = await asyncio.wait(
+                    {next_event, disconnected},
+                    timeout=heartbeat,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if next_event not in done:
+                    next_event.cancel()
+                    if not disconnected.done():
+                        await send(
+                            {
+                                "type": "http.response.body",
+                                "body": b": keepalive\n\n",
+                                "more_body": True,
+                            }
+                        )
+                    continue
+
+                event = next_event.result()
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": format_event(event),
+                        "more_body": True,
+                    }
+                )
+                if event["type"] == "resync":
+                    break
+
+            if not disconnected.done():
+                await send({"type": "http.response.body", "body": b""})
+        finally:
+            disconnected.cancel()
+            broker.unsubscribe(subscription)
+
+    @staticmethod
+    async def wait_disconnect(receive) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
@@ -0,0 +1,127 @@
+import logging
+import random
+import traceback
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from cinema.models import Order, Task
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+def task(name: str):
+    def register(func):
+        _registry[name] = func
+        return func
+
+    return register
+
+
+def enqueue(
+    name: str, payload: dict = None, max_attempts: int = None
+) -> None:
+    if name not in _registry:
+        raise KeyError(f"Unknown task: {name}")
+
+    transaction.on_commit(
+        partial(
+            Task.objects.create,
+            name=name,
+            payload=payload or {},
+            max_attempts=max_attempts or settings.TASK_QUEUE["MAX_ATTEMPTS"],
+        )
+    )
+
+
+def retry_delay(attempts: int) -> timedelta:
+    base = settings.TASK_QUEUE["RETRY_BASE_SECONDS"]
+    delay = base * 2 ** (attempts - 1)
+    return timedelta(seconds=delay + random.uniform(0, base))
+
+
+def claim_tasks(limit: int) -> list[Task]:
+    now = timezone.now()
+    due = Task.objects.filter(
+        status=Task.Status.PENDING, run_after__lte=now
+    ).order_by("run_after")
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            tasks = list(due.select_for_update(skip_locked=True)[:limit])
+            Task.objects.filter(pk__in=[item.pk for item in tasks]).update(
+                status=Task.Status.RUNNING, locked_at=now
+            )
+        return tasks
+
+    # Without SKIP LOCKED each candidate is claimed with a conditional
+    # update; a task another worker took first simply updates no rows.
+    tasks = []
+    for candidate in due[:limit]:
+        claimed = Task.objects.filter(
+            pk=candidate.pk, status=Task.Status.PENDING
+        ).update(status=Task.Status.RUNNING, locked_at=now)
+        if claimed:
+            tasks.append(candidate)
+    return tasks
+
+
+def run_task(item: Task) -> None:
+    item.attempts += 1
+    try:
+        _registry[item.name](**item.payload)
+    except Exception:
+        item.last_error = traceback.format_exc()
+        if item.attempts >= item.max_attempts:
+            item.status = Task.Status.FAILED
+            logger.error("Task %s #%s failed", item.name, item.pk)
+        else:
+            item.status = Task.Status.PENDING
+            item.run_after = timezone.now() + retry_delay(item.attempts)
+    else:
+        item.status = Task.Status.DONE
+        item.last_error = ""
+
+    item.locked_at = None
+    item.save(
+        update_fields=[
+            "attempts",
+            "status",
+            "run_after",
+            "locked_at",
+            "last_error",
+        ]
+    )
+
+
+def requeue_stale_tasks() -> int:
+    timeout = timedelta(seconds=settings.TASK_QUEUE["STALE_AFTER_SECONDS"])
+    return Task.objects.filter(
+        status=Task.Status.RUNNING, locked_at__lt=timezone.now() - timeout
+    ).update(status=Task.Status.PENDING, locked_at=None)
+
+
+def run_pending_tasks(limit: int) -> int:
+    tasks = claim_tasks(limit)
+    for item in tasks:
+        run_task(item)
+    return len(tasks)
+
+
+@task("cinema.send_order_confirmation")
+def send_order_confirmation(order_id: int) -> None:
+    order = (
+        Order.objects.select_related("user")
+        .prefetch_related("tickets__movie_session__movie")
+        .get(pk=order_id)
+    )
+    lines = [
+        f"Order #{order.id} for {order.user.username}:",
+        *(f"  {ticket}" for ticket in order.tickets.all()),
+    ]
+    logger.info("\n".join(lines))
@@ -0,0 +1,6 @@
+# Settings for the startup profiling tests: the fresh interpreters they
+# start must not touch the developer's database.
+from cinema_service.settings import *  # noqa: F401, F403
+from cinema_service.settings import DATABASES
+
+DATABASES["default"]["NAME"] = ":memory:"
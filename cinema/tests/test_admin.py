@@ -0,0 +1,122 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from cinema.models import CinemaHall, Movie, MovieSession, Order, Ticket
+from user.models import User
+
+
+class AdminChangelistTests(TestCase):
+    def setUp(self) -> None:
+        self.admin = User.objects.create_superuser(
+            username="admin", password="admin"
+        )
+        self.client.force_login(self.admin)
+        self.hall = CinemaHall.objects.create(
+            name="Green", rows=10, seats_in_row=10
+        )
+        self.movie = Movie.objects.create(
+            title="Premiere", description="Premiere", duration=120
+        )
+
+    def create_tickets(self, count: int) -> list[Ticket]:
+        tickets = []
+        for index in range(count):
+            movie_session = MovieSession.objects.create(
+                movie=self.movie,
+                cinema_hall=self.hall,
+                show_time=timezone.now() + timedelta(days=index),
+            )
+            order = Order.objects.create(user=self.admin)
+            tickets.append(
+                Ticket.objects.create(
+                    movie_session=movie_session, order=order, row=1, seat=1
+                )
+            )
+        return tickets
+
+    def count_queries(self, url: str) -> int:
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def test_changelist_queries_do_not_grow_with_rows(self) -> None:
+        self.create_tickets(2)
+        urls = (
+            "/admin/cinema/ticket/",
+            "/admin/cinema/moviesession/",
+            "/admin/cinema/order/",
+        )
+        few = {url: self.count_queries(url) for url in urls}
+
+        self.create_tickets(8)
+
+        for url in urls:
+            self.assertEqual(self.count_queries(url), few[url], url)
+
+    def test_movie_session_occupancy_column(self) -> None:
+        movie_session = self.create_tickets(1)[0].movie_session
+        Ticket.objects.create(
+            movie_session=movie_session,
+            order=Order.objects.create(user=self.admin),
+            row=1,
+            seat=2,
+        )
+
+        response = self.client.get(
+            "/admin/cinema/moviesession/", {"o": "6"}
+        )
+
+        self.assertContains(response, "2%")
+
+    def test_ticket_search_by_order_id(self) -> None:
+        tickets = self.create_tickets(3)
+
+        response = self.client.get(
+            "/admin/cinema/ticket/", {"q": str(tickets[1].order_id)}
+        )
+
+        self.assertEqual(
+            [ticket.pk for ticket in response.context["cl"].result_list],
+            [tickets[1].pk],
+        )
+
+    def test_movie_session_search_by_numeric_title(self) -> None:
+        movie_session = self.create_tickets(1)[0].movie_session
+        movie = Movie.objects.create(
+            title="1917", description="1917", duration=119
+        )
+        titled = MovieSession.objects.create(
+            movie=movie, cinema_hall=self.hall, show_time=timezone.now()
+        )
+
+        response = self.client.get(
+            "/admin/cinema/moviesession/", {"q": "1917"}
+        )
+        self.assertEqual(
+            [item.pk for item in response.context["cl"].result_list],
+            [titled.pk],
+        )
+
+        response = self.client.get(
+            "/admin/cinema/moviesession/", {"q": str(movie_session.pk)}
+        )
+        self.assertIn(movie_session, response.context["cl"].result_list)
+
+    def test_movie_session_occupancy_without_seats(self) -> None:
+        hall = CinemaHall.objects.create(name="Empty", rows=0, seats_in_row=0)
+        movie_session = MovieSession.objects.create(
+            movie=self.movie, cinema_hall=hall, show_time=timezone.now()
+        )
+
+        response = self.client.get(
+            "/admin/cinema/moviesession/", {"o": "6"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        result = response.context["cl"].result_list.get(pk=movie_session.pk)
+        self.assertIsNone(result.occupancy)
@@ -0,0 +1,119 @@
+import tempfile
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+
+import numpy as np
+from django.core.management import call_command
+from django.test import TestCase
+
+from cinema.analytics import build_report
+from cinema.archive import archive_ticket_batch
+from cinema.models import CinemaHall, Movie, MovieSession, Order, Ticket
+from user.models import User
+
+SHOW_TIME = datetime(2030, 1, 10, 18, tzinfo=timezone.utc)
+
+
+class AnalyticsTests(TestCase):
+    def setUp(self) -> None:
+        self.small = CinemaHall.objects.create(
+            name="Small", rows=2, seats_in_row=3
+        )
+        self.large = CinemaHall.objects.create(
+            name="Large", rows=4, seats_in_row=4
+        )
+        movie = Movie.objects.create(
+            title="Premiere", description="Premiere", duration=120
+        )
+        self.user = User.objects.create(username="viewer")
+        self.sessions = [
+            MovieSession.objects.create(
+                movie=movie,
+                cinema_hall=self.small,
+                show_time=SHOW_TIME + timedelta(days=day),
+                base_price=Decimal("10.00"),
+            )
+            for day in (0, 1)
+        ]
+        MovieSession.objects.create(
+            movie=movie,
+            cinema_hall=self.large,
+            show_time=SHOW_TIME,
+            base_price=Decimal("12.00"),
+        )
+
+        # Sold 0, 3 and 3 days ahead of the show.
+        for movie_session, places, lead_days in (
+            (self.sessions[0], [(1, 1), (1, 2)], 0),
+            (self.sessions[1], [(1, 1)], 3),
+            (self.sessions[1], [(2, 3)], 3),
+        ):
+            order = Order.objects.create(user=self.user)
+            Order.objects.filter(pk=order.pk).update(
+                created_at=movie_session.show_time - timedelta(days=lead_days)
+            )
+            for row, seat in places:
+                Ticket.objects.create(
+                    movie_session=movie_session,
+                    order=order,
+                    row=row,
+                    seat=seat,
+                    price=Decimal("10.00"),
+                )
+
+    def test_heatmap_is_share_of_sessions(self) -> None:
+        report = build_report(chunk_size=2)
+
+        np.testing.assert_allclose(
+            report[f"heatmap_{self.small.id}"],
+            [[1.0, 0.5, 0.0], [0.0, 0.0, 0.5]],
+        )
+        self.assertEqual(report[f"heatmap_{self.large.id}"].shape, (4, 4))
+        self.assertEqual(report[f"heatmap_{self.large.id}"].sum(), 0)
+
+    def test_hall_summary(self) -> None:
+        report = build_report()
+
+        self.assertEqual(
+            list(report["hall_ids"]), [self.small.id, self.large.id]
+        )
+        self.assertEqual(list(report["hall_sessions"]), [2, 1])
+        self.assertEqual(list(report["hall_tickets"]), [4, 0])
+        self.assertEqual(list(report["hall_revenue"]), [40.0, 0.0])
+        np.testing.assert_allclose(report["hall_occupancy"], [4 / 12, 0])
+
+    def test_lead_time_demand(self) -> None:
+        report = build_report(max_lead_days=2)
+
+        self.assertEqual(list(report["demand_tickets"]), [2, 0, 2])
+        np.testing.assert_allclose(
+            report["demand_sold_before_share"], [1.0, 0.5, 0.5]
+        )
+
+    def test_archived_tickets_are_included(self) -> None:
+        archive_ticket_batch(SHOW_TIME + timedelta(hours=1), batch_size=10)
+
+        self.assertEqual(list(build_report()["hall_tickets"]), [4, 0])
+        self.assertEqual(
+            list(build_report(include_archived=False)["hall_tickets"]), [2, 0]
+        )
+
+    def test_show_time_range(self) -> None:
+        report = build_report(since=SHOW_TIME + timedelta(hours=1))
+
+        self.assertEqual(list(report["hall_sessions"]), [1, 0])
+        self.assertEqual(list(report["hall_tickets"]), [2, 0])
+
+    def test_export_command(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / "analytics.npz"
+            out = StringIO()
+
+            call_command("export_analytics", str(output), stdout=out)
+
+            with np.load(output) as exported:
+                self.assertEqual(list(exported["hall_tickets"]), [4, 0])
+                self.assertIn(f"heatmap_{self.small.id}", exported.files)
+        self.assertIn("4 tickets", out.getvalue())
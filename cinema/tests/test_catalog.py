@@ -0,0 +1,54 @@
+from django.db import transaction
+from django.test import TestCase
+
+from cinema.catalog import get_catalog, get_catalog_version
+from cinema.models import Genre
+
+
+class CatalogSnapshotTests(TestCase):
+    def setUp(self) -> None:
+        self.drama = Genre.objects.create(name="Drama")
+
+    def test_snapshot_resolves_without_queries(self) -> None:
+        get_catalog()
+        with self.assertNumQueries(0):
+            catalog = get_catalog()
+            self.assertEqual(
+                catalog.get("genres", self.drama.id).name, "Drama"
+            )
+
+    def test_snapshot_refreshed_on_save_and_delete(self) -> None:
+        version = get_catalog().version
+
+        self.drama.name = "Melodrama"
+        self.drama.save()
+        self.assertNotEqual(get_catalog().version, version)
+        self.assertEqual(
+            get_catalog().get("genres", self.drama.id).name, "Melodrama"
+        )
+
+        genre_id = self.drama.id
+        self.drama.delete()
+        self.assertNotIn(genre_id, get_catalog().tables["genres"])
+
+    def test_version_bumped_only_on_commit(self) -> None:
+        version = get_catalog_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Genre.objects.create(name="Noir")
+            self.assertEqual(get_catalog_version(), version)
+            genres = get_catalog().tables["genres"].values()
+            self.assertIn("Noir", {genre.name for genre in genres})
+
+        self.assertNotEqual(get_catalog_version(), version)
+
+    def test_rolled_back_writes_are_not_served(self) -> None:
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                noir = Genre.objects.create(name="Noir")
+                self.assertIn(noir.id, get_catalog().tables["genres"])
+                raise RuntimeError
+
+        self.assertNotIn(noir.id, get_catalog().tables["genres"])
+        with self.assertRaises(Genre.DoesNotExist):
+            get_catalog().get("genres", noir.id)
@@ -0,0 +1,90 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cinema.models import CinemaHall, Movie, MovieSession
+from cinema_service.db_router import (
+    ReplicaRouter,
+    is_pinned_to_primary,
+    replica_reads,
+)
+from user.models import User
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1", "replica_2"])
+class ReplicaRouterTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.router = ReplicaRouter()
+        self.client = APIClient()
+        self.user = User.objects.create(username="admin")
+        self.client.force_authenticate(user=self.user)
+
+    def test_reads_use_primary_by_default(self) -> None:
+        self.assertEqual(self.router.db_for_read(Movie), "default")
+
+    def test_reads_use_replica_inside_replica_context(self) -> None:
+        with replica_reads():
+            self.assertIn(
+                self.router.db_for_read(Movie), ["replica_1", "replica_2"]
+            )
+            self.assertEqual(self.router.db_for_write(Movie), "default")
+        self.assertEqual(self.router.db_for_read(Movie), "default")
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_reads_use_primary_without_replicas(self) -> None:
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Movie), "default")
+
+    def get_read_aliases(self, url: str) -> list[str]:
+        seen = []
+        db_for_read = ReplicaRouter.db_for_read
+
+        def spy(router, model, **hints) -> str:
+            seen.append(db_for_read(router, model, **hints))
+            return "default"
+
+        with mock.patch.object(ReplicaRouter, "db_for_read", spy):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return seen
+
+    def test_list_actions_read_from_replica(self) -> None:
+        seen = self.get_read_aliases("/api/cinema/movies/")
+        self.assertTrue(seen)
+        self.assertTrue(
+            all(alias.startswith("replica_") for alias in seen), seen
+        )
+
+    def test_user_pinned_to_primary_after_order(self) -> None:
+        movie = Movie.objects.create(
+            title="Titanic", description="description", duration=123
+        )
+        movie_session = MovieSession.objects.create(
+            movie=movie,
+            cinema_hall=CinemaHall.objects.create(
+                name="White", rows=10, seats_in_row=14
+            ),
+            show_time=datetime(2022, 9, 2, 9, tzinfo=timezone.utc),
+        )
+        response = self.client.post(
+            "/api/cinema/orders/",
+            {
+                "tickets": [
+                    {"movie_session": movie_session.id, "row": 1, "seat": 1}
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(is_pinned_to_primary(self.user.id))
+
+        seen = self.get_read_aliases(
+            f"/api/cinema/movie_sessions/{movie_session.id}/"
+        )
+        self.assertTrue(seen)
+        self.assertEqual(set(seen), {"default"})
@@ -0,0 +1,179 @@
+import gzip
+import json
+from datetime import datetime, timezone
+
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cinema.models import (
+    Actor,
+    CinemaHall,
+    Genre,
+    Movie,
+    MovieSession,
+    Order,
+    Ticket,
+)
+from cinema.renderers import stream_json_list
+from user.models import User
+
+
+def read_stream(response) -> list:
+    return json.loads(b"".join(response.streaming_content))
+
+
+class StreamJsonListTests(TestCase):
+    def test_batches_form_one_array(self) -> None:
+        for count in (0, 1, 3, 4, 7):
+            rows = [{"id": index} for index in range(count)]
+
+            chunks = list(stream_json_list(iter(rows), batch_size=3))
+
+            self.assertEqual(json.loads(b"".join(chunks)), rows)
+            self.assertEqual(len(chunks), 2 + (count + 2) // 3)
+
+
+@override_settings(EXPORT_CHUNK_SIZE=2)
+class ExportApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = User.objects.create(username="viewer")
+        self.client.force_authenticate(self.user)
+        drama = Genre.objects.create(name="Drama")
+        actor = Actor.objects.create(first_name="Kate", last_name="Winslet")
+        hall = CinemaHall.objects.create(name="Blue", rows=5, seats_in_row=5)
+        for index in range(5):
+            movie = Movie.objects.create(
+                title=f"Movie {index}", description="Plot", duration=90
+            )
+            movie.genres.add(drama)
+            movie.actors.add(actor)
+        movie_session = MovieSession.objects.create(
+            movie=movie,
+            cinema_hall=hall,
+            show_time=datetime(2030, 1, 1, 12, tzinfo=timezone.utc),
+        )
+        for seat in range(1, 6):
+            Ticket.objects.create(
+                movie_session=movie_session,
+                order=Order.objects.create(user=self.user),
+                row=1,
+                seat=seat,
+            )
+        Order.objects.create(user=User.objects.create(username="other"))
+
+    def test_orders_export_streams_every_order(self) -> None:
+        response = self.client.get("/api/cinema/orders/export/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/json")
+        orders = read_stream(response)
+        self.assertEqual(len(orders), 5)
+        self.assertEqual(
+            orders[0]["tickets"][0]["movie_session"]["movie_title"],
+            "Movie 4",
+        )
+
+    def test_orders_export_prefetches_per_chunk(self) -> None:
+        response = self.client.get("/api/cinema/orders/export/")
+
+        # One cursor over the orders and, for each of the three chunks,
+        # prefetches of tickets, their sessions, halls and movies, and of
+        # archived tickets.
+        with self.assertNumQueries(1 + 3 * 5):
+            orders = read_stream(response)
+        self.assertEqual(len(orders), 5)
+
+    def test_movies_export_applies_filters(self) -> None:
+        response = self.client.get(
+            "/api/cinema/movies/export/?title=movie 1"
+        )
+
+        movies = read_stream(response)
+        self.assertEqual([movie["title"] for movie in movies], ["Movie 1"])
+        self.assertEqual(movies[0]["genres"][0]["name"], "Drama")
+
+    def test_export_refuses_other_formats(self) -> None:
+        for kwargs in (
+            {"HTTP_ACCEPT": "application/msgpack"},
+            {"data": {"format": "msgpack"}},
+        ):
+            response = self.client.get("/api/cinema/orders/export/", **kwargs)
+
+            self.assertEqual(
+                response.status_code, status.HTTP_406_NOT_ACCEPTABLE
+            )
+
+    def test_orders_export_requires_authentication(self) -> None:
+        self.client.force_authenticate(None)
+
+        response = self.client.get("/api/cinema/orders/export/")
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(
+    API_COMPRESSION={"ENABLED": True, "PATH_PREFIX": "/api/", "MIN_SIZE": 200}
+)
+class ApiCompressionTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        for index in range(5):
+            Genre.objects.create(name=f"Genre with a long name {index}")
+
+    def test_large_api_responses_are_gzipped(self) -> None:
+        response = self.client.get(
+            "/api/cinema/genres/", HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(
+            len(json.loads(gzip.decompress(response.content))["results"]), 5
+        )
+
+    def test_small_responses_are_not_gzipped(self) -> None:
+        response = self.client.get(
+            "/api/cinema/cinema_halls/", HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_clients_without_gzip_get_plain_responses(self) -> None:
+        response = self.client.get("/api/cinema/genres/")
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_streamed_exports_are_gzipped(self) -> None:
+        response = self.client.get(
+            "/api/cinema/movies/export/", HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(
+            json.loads(gzip.decompress(b"".join(response.streaming_content))),
+            [],
+        )
+
+    def test_compression_can_be_disabled(self) -> None:
+        with override_settings(
+            API_COMPRESSION={
+                "ENABLED": False,
+                "PATH_PREFIX": "/api/",
+                "MIN_SIZE": 200,
+            }
+        ):
+            response = self.client.get(
+                "/api/cinema/movies/export/", HTTP_ACCEPT_ENCODING="gzip"
+            )
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_non_api_responses_are_not_gzipped(self) -> None:
+        response = self.client.get(
+            "/admin/login/", HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        self.assertFalse(response.has_header("Content-Encoding"))
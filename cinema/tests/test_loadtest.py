@@ -0,0 +1,49 @@
+from django.test import SimpleTestCase
+
+from cinema.loadtest import percentile, summarize
+
+
+class LoadTestSummaryTests(SimpleTestCase):
+    def test_percentile(self) -> None:
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 0.50), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([7], 0.95), 7)
+
+    def test_summarize_counts_conflicts_and_double_bookings(self) -> None:
+        results = [
+            {
+                "samples": [
+                    ("seat_map", 200, 0.010),
+                    ("create_order", 201, 0.020),
+                    ("create_order", 400, 0.030),
+                ],
+                "booked": [(1, 1, 1)],
+            },
+            {
+                "samples": [
+                    ("create_order", 201, 0.040),
+                    ("create_order", 500, 0.050),
+                ],
+                "booked": [(1, 1, 1)],
+            },
+        ]
+
+        summary = summarize(results, elapsed=2.0)
+
+        self.assertEqual(summary["requests"], 5)
+        self.assertEqual(summary["kinds"]["create_order"]["count"], 4)
+        self.assertEqual(summary["kinds"]["create_order"]["throughput"], 2.0)
+        self.assertEqual(
+            summary["orders"],
+            {
+                "attempted": 4,
+                "created": 2,
+                "conflicts": 1,
+                "conflict_rate": 0.25,
+                "throttled": 0,
+                "errors": 1,
+            },
+        )
+        self.assertEqual(summary["duplicate_bookings"], 1)
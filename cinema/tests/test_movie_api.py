@@ -1,9 +1,23 @@
+from datetime import timedelta
+from unittest import mock
+
 from django.test import TestCase
+from django.utils import timezone
 
 from rest_framework.test import APIClient
 from rest_framework import status
 
-from cinema.models import Movie, Genre, Actor
+from cinema import serializers
+from cinema.catalog import get_catalog
+from cinema.models import (
+    Movie,
+    Genre,
+    Actor,
+    CinemaHall,
+    MovieSession,
+    Order,
+    Ticket,
+)
 from user.models import User
 
 
@@ -107,8 +121,11 @@ class MovieApiTests(TestCase):
         self.assertEqual(sorted([a['full_name'] for a in response.data["actors"]]), sorted(["Kate Winslet"]))
 
     def test_get_invalid_movie(self) -> None:
-        response = self.client.get("/api/cinema/movies/1000/")
-        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        for pk in ("1000", "abc", "%C2%B2"):
+            response = self.client.get(f"/api/cinema/movies/{pk}/")
+            self.assertEqual(
+                response.status_code, status.HTTP_404_NOT_FOUND, pk
+            )
 
     def test_put_movie(self) -> None:
         payload = {
@@ -139,3 +156,146 @@ class MovieApiTests(TestCase):
     def test_delete_invalid_movie(self) -> None:
         response = self.client.delete("/api/cinema/movies/1000/")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_movies_with_fields_projection(self) -> None:
+        get_catalog()
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/cinema/movies/?fields=title")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["results"][0],
+            {"id": self.titanic_movie.id, "title": "Titanic"},
+        )
+
+    def test_movie_export_resolves_catalog_once(self) -> None:
+        Movie.objects.create(
+            title="Avatar", description="Avatar", duration=162
+        )
+
+        with mock.patch.object(
+            serializers, "get_catalog", wraps=get_catalog
+        ) as resolve:
+            response = self.client.get("/api/cinema/movies/export/")
+            movies = b"".join(response.streaming_content)
+
+        self.assertIn(b"Avatar", movies)
+        self.assertEqual(resolve.call_count, 1)
+
+    def test_get_movies_with_omitted_fields(self) -> None:
+        get_catalog()
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                "/api/cinema/movies/?omit=actors,description"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(response.data["results"][0]),
+            {"id", "title", "duration", "genres"},
+        )
+
+    def test_get_movies_with_unknown_fields(self) -> None:
+        response = self.client.get("/api/cinema/movies/?fields=rating")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_movies_filtered_by_several_genres_without_duplicates(
+        self,
+    ) -> None:
+        response = self.client.get(
+            "/api/cinema/movies/"
+            f"?genres={self.drama_genre.id},{self.comedy_genre.id}"
+        )
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_get_movies_filtered_by_all_genres(self) -> None:
+        thriller = Genre.objects.create(name="Thriller")
+        drama_movie = Movie.objects.create(
+            title="Drama only", description="description", duration=90
+        )
+        drama_movie.genres.add(self.drama_genre)
+
+        response = self.client.get(
+            "/api/cinema/movies/"
+            f"?genres={self.drama_genre.id},{self.comedy_genre.id}"
+            "&genres_match=all"
+        )
+        self.assertEqual(
+            [movie["title"] for movie in response.data["results"]],
+            ["Titanic"],
+        )
+
+        response = self.client.get(
+            "/api/cinema/movies/"
+            f"?genres={self.drama_genre.id},{thriller.id}&genres_match=all"
+        )
+        self.assertEqual(response.data["count"], 0)
+
+    def test_get_movies_with_invalid_filters(self) -> None:
+        for query in ["genres=1,drama", "actors=x", "genres=1&genres_match=x"]:
+            response = self.client.get(f"/api/cinema/movies/?{query}")
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+
+    def test_get_movies_with_upcoming_sessions(self) -> None:
+        hall = CinemaHall.objects.create(name="Blue", rows=2, seats_in_row=5)
+        avatar = Movie.objects.create(
+            title="Avatar", description="Avatar description", duration=162
+        )
+        now = timezone.now()
+        MovieSession.objects.create(
+            movie=self.titanic_movie,
+            cinema_hall=hall,
+            show_time=now - timedelta(days=1),
+        )
+        sessions = [
+            MovieSession.objects.create(
+                movie=self.titanic_movie,
+                cinema_hall=hall,
+                show_time=now + timedelta(days=days),
+            )
+            for days in (3, 1, 2)
+        ]
+        MovieSession.objects.create(
+            movie=avatar, cinema_hall=hall, show_time=now + timedelta(days=1)
+        )
+        Ticket.objects.create(
+            movie_session=sessions[1],
+            order=Order.objects.create(user=self.user),
+            row=1,
+            seat=1,
+        )
+        get_catalog()
+
+        with self.assertNumQueries(5):
+            response = self.client.get(
+                "/api/cinema/movies/?with_sessions=upcoming&limit=2"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        movies = {
+            movie["title"]: movie for movie in response.data["results"]
+        }
+        upcoming = movies["Titanic"]["upcoming_sessions"]
+        self.assertEqual(
+            [movie_session["id"] for movie_session in upcoming],
+            [sessions[1].id, sessions[2].id],
+        )
+        self.assertEqual(upcoming[0]["cinema_hall_name"], "Blue")
+        self.assertEqual(upcoming[0]["cinema_hall_capacity"], 10)
+        self.assertEqual(upcoming[0]["tickets_available"], 9)
+        self.assertEqual(upcoming[1]["tickets_available"], 10)
+        self.assertEqual(len(movies["Avatar"]["upcoming_sessions"]), 1)
+
+    def test_get_movies_with_invalid_upcoming_sessions(self) -> None:
+        for query in (
+            "with_sessions=past",
+            "with_sessions=upcoming&limit=0",
+            "with_sessions=upcoming&limit=1000",
+        ):
+            response = self.client.get(f"/api/cinema/movies/?{query}")
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST, query
+            )
@@ -0,0 +1,139 @@
+from datetime import datetime, timezone
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from cinema.catalog import get_catalog
+from cinema.models import (
+    Actor,
+    CinemaHall,
+    Genre,
+    Movie,
+    MovieDocument,
+    MovieSession,
+)
+from cinema.serializers import (
+    MovieDetailSerializer,
+    MovieForSessionDetailSerializer,
+)
+
+
+class MovieDocumentTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.drama = Genre.objects.create(name="Drama")
+        self.comedy = Genre.objects.create(name="Comedy")
+        self.actress = Actor.objects.create(
+            first_name="Kate", last_name="Winslet"
+        )
+        self.movie = Movie.objects.create(
+            title="Titanic", description="Titanic description", duration=123
+        )
+        self.movie.genres.add(self.drama)
+        self.movie.actors.add(self.actress)
+
+    def document(self) -> MovieDocument:
+        return MovieDocument.objects.get(movie=self.movie)
+
+    def assert_document_is_current(self) -> None:
+        movie = Movie.objects.get(pk=self.movie.pk)
+        document = self.document()
+        self.assertEqual(document.detail, MovieDetailSerializer(movie).data)
+        self.assertEqual(
+            document.session_detail,
+            MovieForSessionDetailSerializer(movie).data,
+        )
+
+    def test_document_follows_movie_changes(self) -> None:
+        self.assert_document_is_current()
+
+        self.movie.title = "Titanic 2"
+        self.movie.save()
+        self.movie.genres.add(self.comedy)
+        self.assert_document_is_current()
+
+        self.movie.genres.remove(self.drama)
+        self.assert_document_is_current()
+
+        self.movie.actors.clear()
+        self.assert_document_is_current()
+
+    def test_document_follows_reverse_links(self) -> None:
+        self.comedy.movie_set.add(self.movie)
+        self.assert_document_is_current()
+
+        self.drama.movie_set.clear()
+        self.assertEqual(
+            [genre["name"] for genre in self.document().detail["genres"]],
+            ["Comedy"],
+        )
+
+    def test_document_follows_catalog_changes(self) -> None:
+        self.actress.last_name = "Winslet-Smith"
+        self.actress.save()
+        self.assertEqual(
+            self.document().session_detail["actors"], ["Kate Winslet-Smith"]
+        )
+
+        self.drama.delete()
+        self.assertEqual(self.document().detail["genres"], [])
+
+    def test_movie_detail_is_served_from_document(self) -> None:
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/cinema/movies/{self.movie.id}/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data, MovieDetailSerializer(self.movie).data
+        )
+
+    def test_movie_detail_without_document(self) -> None:
+        MovieDocument.objects.all().delete()
+
+        response = self.client.get(f"/api/cinema/movies/{self.movie.id}/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["title"], "Titanic")
+        self.assertEqual(
+            self.client.get("/api/cinema/movies/999/").status_code, 404
+        )
+
+    def test_movie_session_detail_splices_document(self) -> None:
+        hall = CinemaHall.objects.create(
+            name="Blue", rows=10, seats_in_row=10
+        )
+        movie_session = MovieSession.objects.create(
+            movie=self.movie,
+            cinema_hall=hall,
+            show_time=datetime(2030, 1, 1, 12, tzinfo=timezone.utc),
+        )
+        get_catalog()
+
+        # Seats stamp, session with movie document and hall, taken seats.
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                f"/api/cinema/movie_sessions/{movie_session.id}/"
+            )
+
+        self.assertEqual(
+            response.data["movie"], self.document().session_detail
+        )
+        self.assertEqual(response.data["movie"]["genres"], ["Drama"])
+
+        response = self.client.get(
+            f"/api/cinema/movie_sessions/{movie_session.id}/?fields=id,movie"
+        )
+        self.assertEqual(
+            response.data["movie"], self.document().session_detail
+        )
+
+    def test_rebuild_command(self) -> None:
+        MovieDocument.objects.all().delete()
+        out = StringIO()
+
+        call_command("rebuild_movie_documents", stdout=out)
+
+        self.assertIn("Refreshed 1 movie documents.", out.getvalue())
+        self.assert_document_is_current()
@@ -1,11 +1,21 @@
 import datetime
 
+from django.db import connection
 from django.test import TestCase
+from django.utils.http import http_date
 
 from rest_framework.test import APIClient
 from rest_framework import status
 
-from cinema.models import Movie, Genre, Actor, MovieSession, CinemaHall
+from cinema.models import (
+    Movie,
+    Genre,
+    Actor,
+    MovieSession,
+    CinemaHall,
+    Order,
+    Ticket,
+)
 from user.models import User
 
 
@@ -141,3 +151,249 @@ class MovieSessionApiTests(TestCase):
     def test_delete_invalid_movie_session(self) -> None:
         response = self.client.delete("/api/cinema/movie_sessions/1000/")
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_invalid_movie_session(self) -> None:
+        for pk in ("1000", "abc", "%C2%B2"):
+            response = self.client.get(f"/api/cinema/movie_sessions/{pk}/")
+            self.assertEqual(
+                response.status_code, status.HTTP_404_NOT_FOUND, pk
+            )
+
+    def test_get_movie_session_not_modified(self) -> None:
+        url = f"/api/cinema/movie_sessions/{self.movie_session.id}/"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_get_movie_session_etag_changes_on_booking(self) -> None:
+        url = f"/api/cinema/movie_sessions/{self.movie_session.id}/"
+        etag = self.client.get(url)["ETag"]
+
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(
+            movie_session=self.movie_session, order=order, row=1, seat=1
+        )
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.data["taken_places"]), 1)
+
+    def test_get_movie_session_etag_changes_on_movie_and_hall_update(
+        self,
+    ) -> None:
+        url = f"/api/cinema/movie_sessions/{self.movie_session.id}/"
+        response = self.client.get(url)
+        etag = response["ETag"]
+
+        movie = self.movie_session.movie
+        movie.title = "Renamed"
+        movie.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["movie"]["title"], "Renamed")
+        self.assertNotEqual(response["ETag"], etag)
+        etag = response["ETag"]
+
+        cinema_hall = self.movie_session.cinema_hall
+        cinema_hall.rows += 1
+        cinema_hall.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["cinema_hall"]["rows"], cinema_hall.rows
+        )
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_get_movie_session_last_modified_follows_movie(self) -> None:
+        url = f"/api/cinema/movie_sessions/{self.movie_session.id}/"
+        updated_at = datetime.datetime(
+            2031, 1, 1, tzinfo=datetime.timezone.utc
+        )
+        Movie.objects.filter(pk=self.movie_session.movie_id).update(
+            updated_at=updated_at
+        )
+
+        response = self.client.get(url)
+
+        self.assertEqual(
+            response["Last-Modified"], http_date(updated_at.timestamp())
+        )
+
+    def test_get_movie_session_seats_delta(self) -> None:
+        url = f"/api/cinema/movie_sessions/{self.movie_session.id}/"
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(
+            movie_session=self.movie_session, order=order, row=1, seat=1
+        )
+        since_version = self.client.get(url).data["seats_version"]
+        Ticket.objects.create(
+            movie_session=self.movie_session, order=order, row=1, seat=2
+        )
+
+        response = self.client.get(url, {"since_version": since_version})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["delta"])
+        self.assertEqual(
+            response.data["taken_places"], [{"row": 1, "seat": 2}]
+        )
+
+        response = self.client.get(url, {"since_version": "²"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["taken_places"]), 2)
+
+    def test_get_movie_session_seats_delta_after_release(self) -> None:
+        url = f"/api/cinema/movie_sessions/{self.movie_session.id}/"
+        order = Order.objects.create(user=self.user)
+        ticket = Ticket.objects.create(
+            movie_session=self.movie_session, order=order, row=1, seat=1
+        )
+        since_version = self.client.get(url).data["seats_version"]
+        ticket.delete()
+
+        response = self.client.get(url, {"since_version": since_version})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("delta", response.data)
+        self.assertEqual(response.data["taken_places"], [])
+
+    def test_get_movie_sessions_with_fields_projection(self) -> None:
+        response = self.client.get(
+            "/api/cinema/movie_sessions/?fields=show_time,movie_title"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(response.data["results"][0]), {"id", "show_time", "movie_title"}
+        )
+        queryset = response.renderer_context["view"].get_queryset()
+        self.assertNotIn("COUNT(", str(queryset.query))
+        self.assertNotIn("description", str(queryset.query))
+
+    def create_evening_sessions(self) -> list[MovieSession]:
+        other_hall = CinemaHall.objects.create(
+            name="Blue", rows=1, seats_in_row=2
+        )
+        return [
+            MovieSession.objects.create(
+                movie=self.movie,
+                cinema_hall=cinema_hall,
+                show_time=datetime.datetime(
+                    2022, 9, day, hour, tzinfo=datetime.timezone.utc
+                ),
+            )
+            for day, hour, cinema_hall in [
+                (3, 19, self.cinema_hall),
+                (4, 12, self.cinema_hall),
+                (5, 21, other_hall),
+                (12, 20, self.cinema_hall),
+            ]
+        ]
+
+    def get_session_ids(self, query: str) -> list[int]:
+        response = self.client.get(f"/api/cinema/movie_sessions/?{query}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [session["id"] for session in response.data["results"]]
+
+    def test_get_movie_sessions_filtered_by_show_time_range(self) -> None:
+        sessions = self.create_evening_sessions()
+
+        self.assertEqual(
+            self.get_session_ids(
+                "show_time_after=2022-09-03&show_time_before=2022-09-10"
+            ),
+            [sessions[0].id, sessions[1].id, sessions[2].id],
+        )
+        self.assertEqual(
+            self.get_session_ids(
+                "show_time_after=2022-09-03&show_time_before=2022-09-10"
+                "&time_after=18:00&time_before=23:00"
+            ),
+            [sessions[0].id, sessions[2].id],
+        )
+        self.assertEqual(
+            self.get_session_ids("time_after=18:00&time_before=23:00"),
+            [sessions[0].id, sessions[2].id, sessions[3].id],
+        )
+
+    def test_get_movie_sessions_filtered_by_several_halls_and_movies(
+        self,
+    ) -> None:
+        sessions = self.create_evening_sessions()
+        other_movie = Movie.objects.create(
+            title="Avatar", description="Avatar description", duration=180
+        )
+
+        self.assertEqual(
+            self.get_session_ids(
+                f"cinema_hall={sessions[2].cinema_hall_id}"
+                f"&movie={self.movie.id},{other_movie.id}"
+            ),
+            [sessions[2].id],
+        )
+
+    def test_get_movie_sessions_filtered_by_min_available(self) -> None:
+        sessions = self.create_evening_sessions()
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(
+            movie_session=sessions[2], order=order, row=1, seat=1
+        )
+
+        self.assertNotIn(
+            sessions[2].id, self.get_session_ids("min_available=2")
+        )
+        self.assertIn(
+            sessions[2].id, self.get_session_ids("min_available=1")
+        )
+
+    def test_moved_ticket_updates_both_sessions(self) -> None:
+        sessions = self.create_evening_sessions()
+        order = Order.objects.create(user=self.user)
+        ticket = Ticket.objects.create(
+            movie_session=sessions[0], order=order, row=1, seat=1
+        )
+
+        ticket.movie_session = sessions[1]
+        ticket.save()
+        ticket.seat = 2
+        ticket.save()
+
+        for movie_session in sessions:
+            movie_session.refresh_from_db()
+        self.assertEqual(sessions[0].tickets_taken, 0)
+        self.assertEqual(
+            sessions[0].seats_released_version, sessions[0].seats_version
+        )
+        self.assertEqual(sessions[1].tickets_taken, 1)
+        self.assertEqual(ticket.session_version, sessions[1].seats_version)
+
+    def test_get_movie_sessions_with_invalid_filters(self) -> None:
+        for query in [
+            "movie=titanic",
+            "date=2022-13-01",
+            "show_time_after=tomorrow",
+            "time_after=25:00",
+            "min_available=-1",
+            "min_available=%C2%B2",
+        ]:
+            response = self.client.get(f"/api/cinema/movie_sessions/?{query}")
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST, query
+            )
+
+    def test_movie_sessions_range_filters_use_index(self) -> None:
+        response = self.client.get(
+            "/api/cinema/movie_sessions/?date=2022-09-02&min_available=1"
+        )
+        queryset = response.renderer_context["view"].get_queryset()
+        sql = str(queryset.query)
+
+        self.assertNotIn("django_datetime_cast", sql)
+        self.assertNotIn("GROUP BY", sql)
+        if connection.vendor == "sqlite":
+            self.assertIn("USING INDEX", queryset.explain())
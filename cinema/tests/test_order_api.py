@@ -1,7 +1,10 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from io import StringIO
 
+from django.core.management import call_command
 from django.test import TestCase
 
+from rest_framework.exceptions import ValidationError
 from rest_framework.test import APIClient
 from rest_framework import status
 
@@ -13,7 +16,9 @@ from cinema.models import (
     MovieSession,
     Ticket,
     Order,
+    IdempotencyKey,
 )
+from cinema.serializers import OrderSerializer
 from user.models import User
 
 
@@ -115,3 +120,158 @@ class OrderApiTests(TestCase):
 
         new_order = Order.objects.get(id=response.data["id"])
         self.assertEqual(new_order.tickets.count(), 2)
+
+    def test_create_order_with_concurrently_taken_seat(self) -> None:
+        serializer = OrderSerializer(context={})
+        taken_before = MovieSession.objects.get(
+            id=self.movie_session.id
+        ).tickets_taken
+
+        with self.assertRaises(ValidationError):
+            serializer.create(
+                {
+                    "tickets": [
+                        {
+                            "movie_session": self.movie_session,
+                            "row": 2,
+                            "seat": 12,
+                        }
+                    ]
+                },
+                user=self.user,
+            )
+
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(
+            MovieSession.objects.get(id=self.movie_session.id).tickets_taken,
+            taken_before,
+        )
+
+    def test_post_order_with_duplicate_seat(self) -> None:
+        ticket = {"movie_session": self.movie_session.id, "row": 5, "seat": 5}
+
+        response = self.client.post(
+            "/api/cinema/orders/", {"tickets": [ticket, ticket]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("tickets", response.data)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_create_order_for_session_cancelled_meanwhile(self) -> None:
+        serializer = OrderSerializer(context={})
+        MovieSession.objects.filter(id=self.movie_session.id).update(
+            cancelled_at=datetime.now(timezone.utc)
+        )
+
+        with self.assertRaises(ValidationError):
+            serializer.create(
+                {
+                    "tickets": [
+                        {
+                            "movie_session": self.movie_session,
+                            "row": 5,
+                            "seat": 5,
+                        }
+                    ]
+                },
+                user=self.user,
+            )
+
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_post_order_idempotency_key_replays_response(self) -> None:
+        payload = {
+            "tickets": [
+                {"movie_session": self.movie_session.id, "row": 5, "seat": 5},
+            ]
+        }
+        headers = {"HTTP_IDEMPOTENCY_KEY": "order-1"}
+
+        response = self.client.post(
+            "/api/cinema/orders/", payload, format="json", **headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        order_count = Order.objects.count()
+
+        with self.assertNumQueries(1):
+            replay = self.client.post(
+                "/api/cinema/orders/", payload, format="json", **headers
+            )
+
+        self.assertEqual(replay.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(replay["Idempotent-Replayed"], "true")
+        self.assertEqual(replay.data["id"], response.data["id"])
+        self.assertEqual(Order.objects.count(), order_count)
+
+    def test_post_order_idempotency_key_with_other_payload(self) -> None:
+        headers = {"HTTP_IDEMPOTENCY_KEY": "order-1"}
+        for seat, expected_status in [
+            (5, status.HTTP_201_CREATED),
+            (6, status.HTTP_422_UNPROCESSABLE_ENTITY),
+        ]:
+            payload = {
+                "tickets": [
+                    {
+                        "movie_session": self.movie_session.id,
+                        "row": 5,
+                        "seat": seat,
+                    },
+                ]
+            }
+            response = self.client.post(
+                "/api/cinema/orders/", payload, format="json", **headers
+            )
+            self.assertEqual(response.status_code, expected_status)
+
+    def test_post_order_expired_idempotency_key(self) -> None:
+        payload = {
+            "tickets": [
+                {"movie_session": self.movie_session.id, "row": 5, "seat": 5},
+            ]
+        }
+        IdempotencyKey.objects.create(
+            key="order-1",
+            user=self.user,
+            request_hash="stale",
+            status_code=201,
+            response={},
+        )
+        IdempotencyKey.objects.update(
+            created_at=datetime(2020, 1, 1, tzinfo=timezone.utc)
+        )
+
+        response = self.client.post(
+            "/api/cinema/orders/",
+            payload,
+            format="json",
+            HTTP_IDEMPOTENCY_KEY="order-1",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(IdempotencyKey.objects.count(), 1)
+
+    def test_purge_idempotency_keys(self) -> None:
+        IdempotencyKey.objects.create(
+            key="fresh",
+            user=self.user,
+            request_hash="hash",
+            status_code=201,
+            response={},
+        )
+        IdempotencyKey.objects.create(
+            key="stale",
+            user=self.user,
+            request_hash="hash",
+            status_code=201,
+            response={},
+        )
+        IdempotencyKey.objects.filter(key="stale").update(
+            created_at=datetime.now(timezone.utc) - timedelta(days=2)
+        )
+
+        call_command("purge_idempotency_keys", stdout=StringIO())
+
+        self.assertEqual(
+            list(IdempotencyKey.objects.values_list("key", flat=True)),
+            ["fresh"],
+        )
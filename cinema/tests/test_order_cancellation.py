@@ -0,0 +1,257 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cinema.cancellation import cancel_movie_session, cancel_order
+from cinema.events import publish_seats_released
+from cinema.models import CinemaHall, Movie, MovieSession, Order, Ticket
+from user.models import User
+
+
+class OrderCancellationTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = User.objects.create(username="viewer")
+        self.client.force_authenticate(user=self.user)
+
+        self.hall = CinemaHall.objects.create(
+            name="Blue", rows=10, seats_in_row=10
+        )
+        self.movie = Movie.objects.create(
+            title="Premiere", description="Premiere", duration=120
+        )
+        self.movie_session = self.create_session(days=1)
+        self.order = Order.objects.create(user=self.user)
+        self.tickets = [
+            Ticket.objects.create(
+                movie_session=self.movie_session,
+                order=self.order,
+                row=1,
+                seat=seat,
+            )
+            for seat in (1, 2, 3)
+        ]
+
+    def create_session(self, days: int) -> MovieSession:
+        return MovieSession.objects.create(
+            movie=self.movie,
+            cinema_hall=self.hall,
+            show_time=timezone.now() + timedelta(days=days),
+        )
+
+    def cancel(self, order: Order, payload: dict = None):
+        return self.client.post(
+            f"/api/cinema/orders/{order.id}/cancel/",
+            payload or {},
+            format="json",
+        )
+
+    def test_cancel_whole_order(self) -> None:
+        version = MovieSession.objects.get(
+            pk=self.movie_session.pk
+        ).seats_version
+
+        response = self.cancel(self.order)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["released"], 3)
+        self.assertIsNotNone(response.data["cancelled_at"])
+        self.assertFalse(Ticket.objects.filter(order=self.order).exists())
+        movie_session = MovieSession.objects.get(pk=self.movie_session.pk)
+        self.assertEqual(movie_session.tickets_taken, 0)
+        self.assertEqual(movie_session.seats_version, version + 1)
+        self.assertEqual(movie_session.seats_released_version, version + 1)
+
+        response = self.cancel(self.order)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cancel_selected_tickets(self) -> None:
+        response = self.cancel(
+            self.order, {"tickets": [self.tickets[0].id, self.tickets[2].id]}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["released"], 2)
+        self.assertIsNone(response.data["cancelled_at"])
+        self.assertEqual(
+            list(
+                Ticket.objects.filter(order=self.order).values_list(
+                    "seat", flat=True
+                )
+            ),
+            [2],
+        )
+        self.assertEqual(
+            MovieSession.objects.get(pk=self.movie_session.pk).tickets_taken,
+            1,
+        )
+
+    def test_cancel_foreign_ticket(self) -> None:
+        other_order = Order.objects.create(user=self.user)
+        other_ticket = Ticket.objects.create(
+            movie_session=self.movie_session, order=other_order, row=2, seat=1
+        )
+
+        response = self.cancel(self.order, {"tickets": [other_ticket.id]})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Ticket.objects.count(), 4)
+
+    def test_cancel_order_of_other_user(self) -> None:
+        self.client.force_authenticate(
+            user=User.objects.create(username="other")
+        )
+
+        response = self.cancel(self.order)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cancel_started_session(self) -> None:
+        MovieSession.objects.filter(pk=self.movie_session.pk).update(
+            show_time=timezone.now() - timedelta(minutes=5)
+        )
+
+        response = self.cancel(self.order)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Ticket.objects.count(), 3)
+
+    def test_cancel_session_command(self) -> None:
+        other_session = self.create_session(days=2)
+        mixed_order = Order.objects.create(user=self.user)
+        Ticket.objects.create(
+            movie_session=self.movie_session, order=mixed_order, row=5, seat=5
+        )
+        Ticket.objects.create(
+            movie_session=other_session, order=mixed_order, row=5, seat=5
+        )
+        out = StringIO()
+
+        call_command("cancel_session", self.movie_session.pk, stdout=out)
+
+        self.assertIn("Released 4 tickets", out.getvalue())
+        self.assertFalse(
+            Ticket.objects.filter(movie_session=self.movie_session).exists()
+        )
+        self.assertEqual(
+            MovieSession.objects.get(pk=self.movie_session.pk).tickets_taken,
+            0,
+        )
+        self.order.refresh_from_db()
+        mixed_order.refresh_from_db()
+        self.assertIsNotNone(self.order.cancelled_at)
+        self.assertIsNone(mixed_order.cancelled_at)
+        self.assertEqual(mixed_order.tickets.count(), 1)
+
+    def test_cancelled_session_cannot_be_booked_or_listed(self) -> None:
+        other_session = self.create_session(days=2)
+
+        released = cancel_movie_session(self.movie_session)
+
+        self.assertEqual(released, 3)
+        self.assertIsNotNone(
+            MovieSession.objects.get(pk=self.movie_session.pk).cancelled_at
+        )
+        response = self.client.post(
+            "/api/cinema/orders/",
+            {
+                "tickets": [
+                    {
+                        "movie_session": self.movie_session.pk,
+                        "row": 1,
+                        "seat": 1,
+                    }
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(
+            Ticket.objects.filter(movie_session=self.movie_session).exists()
+        )
+        with self.assertRaises(ValidationError):
+            MovieSession.objects.take_seats(self.movie_session.pk)
+
+        response = self.client.get("/api/cinema/movie_sessions/")
+        self.assertEqual(
+            [session["id"] for session in response.data["results"]],
+            [other_session.pk],
+        )
+        response = self.client.get(
+            f"/api/cinema/movie_sessions/{self.movie_session.pk}/"
+        )
+        self.assertIsNotNone(response.data["cancelled_at"])
+
+    def test_released_tickets_are_counted_once(self) -> None:
+        cancel_order(self.order, [self.tickets[0].pk])
+
+        movie_session = MovieSession.objects.get(pk=self.movie_session.pk)
+        self.assertEqual(movie_session.tickets_taken, 2)
+        self.assertEqual(Ticket.objects.filter(order=self.order).count(), 2)
+
+    def test_cancelled_session_refunds_orders(self) -> None:
+        other_session = self.create_session(days=2)
+        mixed_order = Order.objects.create(user=self.user, total_price=20)
+        single_order = Order.objects.create(user=self.user, total_price=10)
+        for movie_session, order, row in (
+            (self.movie_session, mixed_order, 5),
+            (other_session, mixed_order, 5),
+            (self.movie_session, single_order, 6),
+        ):
+            Ticket.objects.create(
+                movie_session=movie_session,
+                order=order,
+                row=row,
+                seat=1,
+                price=10,
+            )
+
+        cancel_movie_session(self.movie_session)
+
+        mixed_order.refresh_from_db()
+        single_order.refresh_from_db()
+        self.assertEqual(mixed_order.total_price, 10)
+        self.assertIsNone(mixed_order.cancelled_at)
+        self.assertEqual(single_order.total_price, 0)
+        self.assertIsNotNone(single_order.cancelled_at)
+
+    def test_cascade_deletes_skip_seat_release(self) -> None:
+        other_hall = CinemaHall.objects.create(
+            name="Red", rows=5, seats_in_row=5
+        )
+        other_session = MovieSession.objects.create(
+            movie=Movie.objects.create(
+                title="Encore", description="Encore", duration=90
+            ),
+            cinema_hall=other_hall,
+            show_time=timezone.now() + timedelta(days=1),
+        )
+        Ticket.objects.create(
+            movie_session=other_session, order=self.order, row=1, seat=1
+        )
+
+        for owner in (self.movie, other_hall):
+            with CaptureQueriesContext(connection) as context:
+                with self.captureOnCommitCallbacks() as callbacks:
+                    owner.delete()
+
+            self.assertFalse(
+                [
+                    query
+                    for query in context.captured_queries
+                    if query["sql"].startswith('UPDATE "cinema_moviesession"')
+                ]
+            )
+            self.assertNotIn(
+                publish_seats_released,
+                [getattr(callback, "func", None) for callback in callbacks],
+            )
+        self.assertFalse(Ticket.objects.exists())
@@ -0,0 +1,188 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cinema.models import (
+    CinemaHall,
+    Movie,
+    MovieSession,
+    Order,
+    PricingRule,
+)
+from cinema.pricing import price_ticket
+from user.models import User
+
+
+class PricingTests(TestCase):
+    def setUp(self) -> None:
+        self.hall = CinemaHall.objects.create(
+            name="Gold", rows=4, seats_in_row=10
+        )
+        self.movie = Movie.objects.create(
+            title="Premiere", description="Premiere", duration=120
+        )
+        PricingRule.objects.create(
+            name="Front rows",
+            kind=PricingRule.Kind.ROW_TIER,
+            multiplier=Decimal("0.8"),
+            row_to=1,
+        )
+        PricingRule.objects.create(
+            name="Gold recliners",
+            kind=PricingRule.Kind.ROW_TIER,
+            multiplier=Decimal("1.5"),
+            cinema_hall=self.hall,
+            row_from=4,
+        )
+        PricingRule.objects.create(
+            name="Evening",
+            kind=PricingRule.Kind.TIME_OF_DAY,
+            multiplier=Decimal("1.2"),
+            starts_at=time(18),
+            ends_at=time(2),
+        )
+
+    def create_session(self, hour: int, days: int = 1) -> MovieSession:
+        show_time = timezone.localtime() + timedelta(days=days)
+        return MovieSession.objects.create(
+            movie=self.movie,
+            cinema_hall=self.hall,
+            show_time=show_time.replace(hour=hour, minute=0),
+            base_price=Decimal("10.00"),
+        )
+
+    def test_price_table_is_compiled_on_save(self) -> None:
+        matinee = self.create_session(hour=12)
+        evening = self.create_session(hour=23)
+
+        self.assertEqual(
+            matinee.price_table, ["8.00", "10.00", "10.00", "15.00"]
+        )
+        self.assertEqual(
+            evening.price_table, ["9.60", "12.00", "12.00", "18.00"]
+        )
+
+    def test_rule_changes_recompile_upcoming_sessions(self) -> None:
+        upcoming = self.create_session(hour=12)
+        past = self.create_session(hour=12, days=-2)
+
+        PricingRule.objects.create(
+            name="Middle rows",
+            kind=PricingRule.Kind.ROW_TIER,
+            multiplier=Decimal("1.1"),
+            row_from=2,
+            row_to=3,
+        )
+
+        upcoming.refresh_from_db()
+        past.refresh_from_db()
+        self.assertEqual(
+            upcoming.price_table, ["8.00", "11.00", "11.00", "15.00"]
+        )
+        self.assertEqual(
+            past.price_table, ["8.00", "10.00", "10.00", "15.00"]
+        )
+
+    def test_pricing_needs_no_queries(self) -> None:
+        movie_session = MovieSession.objects.get(
+            pk=self.create_session(hour=12).pk
+        )
+
+        with self.assertNumQueries(0):
+            prices = [
+                price_ticket(movie_session, row, Decimal("0.9"))
+                for row in (1, 2, 4)
+            ]
+
+        self.assertEqual(
+            prices, [Decimal("7.20"), Decimal("9.00"), Decimal("13.50")]
+        )
+
+    def test_session_without_table_uses_base_price(self) -> None:
+        movie_session = MovieSession(
+            base_price=Decimal("7.50"), price_table=[]
+        )
+
+        self.assertEqual(price_ticket(movie_session, 3), Decimal("7.50"))
+
+
+class OrderPricingTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = User.objects.create(username="viewer")
+        self.client.force_authenticate(user=self.user)
+        hall = CinemaHall.objects.create(name="Gold", rows=4, seats_in_row=10)
+        movie = Movie.objects.create(
+            title="Premiere", description="Premiere", duration=120
+        )
+        PricingRule.objects.create(
+            name="Back row",
+            kind=PricingRule.Kind.ROW_TIER,
+            multiplier=Decimal("1.5"),
+            row_from=4,
+        )
+        PricingRule.objects.create(
+            name="Groups",
+            kind=PricingRule.Kind.BULK,
+            multiplier=Decimal("0.9"),
+            min_tickets=3,
+        )
+        self.movie_session = MovieSession.objects.create(
+            movie=movie,
+            cinema_hall=hall,
+            show_time=datetime(2030, 1, 1, 12, tzinfo=timezone.utc),
+            base_price=Decimal("10.00"),
+        )
+
+    def order(self, places: list[tuple[int, int]]):
+        return self.client.post(
+            "/api/cinema/orders/",
+            {
+                "tickets": [
+                    {
+                        "movie_session": self.movie_session.id,
+                        "row": row,
+                        "seat": seat,
+                    }
+                    for row, seat in places
+                ]
+            },
+            format="json",
+        )
+
+    def test_order_total_is_stored(self) -> None:
+        response = self.order([(1, 1), (4, 1)])
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [ticket["price"] for ticket in response.data["tickets"]],
+            ["10.00", "15.00"],
+        )
+        self.assertEqual(response.data["total_price"], "25.00")
+        self.assertEqual(
+            Order.objects.get(pk=response.data["id"]).total_price,
+            Decimal("25.00"),
+        )
+
+    def test_bulk_discount(self) -> None:
+        response = self.order([(1, 1), (1, 2), (4, 1)])
+
+        self.assertEqual(response.data["total_price"], "31.50")
+
+    def test_cancel_refunds_ticket_prices(self) -> None:
+        response = self.order([(1, 1), (4, 1)])
+        tickets = response.data["tickets"]
+
+        response = self.client.post(
+            f"/api/cinema/orders/{response.data['id']}/cancel/",
+            {"tickets": [tickets[1]["id"]]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["refund"], "15.00")
+        self.assertEqual(response.data["total_price"], "10.00")
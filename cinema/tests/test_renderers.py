@@ -0,0 +1,57 @@
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import msgpack
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from cinema.models import Genre
+from cinema.renderers import ORJSONRenderer
+from user.models import User
+
+
+class RendererTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(username="user"))
+        Genre.objects.create(name="Drama")
+
+    def test_json_is_default(self) -> None:
+        response = self.client.get("/api/cinema/genres/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(
+            json.loads(response.content)["results"][0]["name"], "Drama"
+        )
+
+    def test_msgpack_negotiated_by_accept(self) -> None:
+        response = self.client.get(
+            "/api/cinema/genres/", HTTP_ACCEPT="application/msgpack"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(
+            msgpack.unpackb(response.content)["results"][0]["name"], "Drama"
+        )
+
+    def test_orjson_renderer_matches_json_renderer(self) -> None:
+        payload = {
+            "price": Decimal("9.50"),
+            "seats": [1, 2],
+            "cancelled_at": datetime(
+                2022, 9, 2, 9, 30, 15, 123456, tzinfo=timezone.utc
+            ),
+            "day": date(2022, 9, 2),
+        }
+        self.assertEqual(
+            json.loads(ORJSONRenderer().render(payload)),
+            json.loads(JSONRenderer().render(payload)),
+        )
+        self.assertIn(
+            b'"2022-09-02T09:30:15.123456Z"', ORJSONRenderer().render(payload)
+        )
@@ -0,0 +1,224 @@
+import asyncio
+import json
+from datetime import datetime
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cinema.events import (
+    LocalSeatEventBroker,
+    RedisSeatEventBroker,
+    SubscriptionLimitExceeded,
+    get_broker,
+    reset_broker,
+)
+from cinema.models import CinemaHall, Movie, MovieSession
+from cinema.streaming import SeatEventsApplication
+from user.models import User
+
+
+class LocalSeatEventBrokerTests(TestCase):
+    def test_publish_fans_out_to_session_watchers(self) -> None:
+        broker = LocalSeatEventBroker()
+
+        async def run() -> tuple:
+            first = broker.subscribe(1)
+            second = broker.subscribe(1)
+            other = broker.subscribe(2)
+            broker.publish(1, {"type": "seats_taken"})
+            await asyncio.sleep(0)
+            return (
+                first.queue.qsize(),
+                second.queue.qsize(),
+                other.queue.qsize(),
+            )
+
+        self.assertEqual(asyncio.run(run()), (1, 1, 0))
+
+    def test_subscriber_limits(self) -> None:
+        broker = LocalSeatEventBroker(
+            max_subscribers=3, max_subscribers_per_session=2
+        )
+
+        async def run() -> None:
+            broker.subscribe(1)
+            subscription = broker.subscribe(1)
+            with self.assertRaises(SubscriptionLimitExceeded):
+                broker.subscribe(1)
+
+            broker.subscribe(2)
+            with self.assertRaises(SubscriptionLimitExceeded):
+                broker.subscribe(3)
+
+            broker.unsubscribe(subscription)
+            broker.subscribe(1)
+
+        asyncio.run(run())
+        self.assertEqual(broker.subscriber_count(), 3)
+
+    def test_slow_consumer_gets_resync(self) -> None:
+        broker = LocalSeatEventBroker(max_queue_size=2)
+
+        async def run() -> list:
+            subscription = broker.subscribe(1)
+            for version in range(5):
+                broker.publish(1, {"type": "seats_taken", "version": version})
+            await asyncio.sleep(0)
+            return [
+                subscription.queue.get_nowait()
+                for _ in range(subscription.queue.qsize())
+            ]
+
+        self.assertEqual(asyncio.run(run()), [{"type": "resync"}])
+
+
+class RedisSeatEventBrokerTests(TestCase):
+    def test_publish_goes_through_the_shared_channel(self) -> None:
+        broker = RedisSeatEventBroker(url="redis://cache:6379/0")
+        broker._client = mock.Mock()
+
+        broker.publish(1, {"type": "seats_taken"})
+
+        channel, payload = broker._client.publish.call_args.args
+        self.assertEqual(channel, "cinema:seat_events")
+        self.assertEqual(
+            json.loads(payload),
+            {"session": 1, "event": {"type": "seats_taken"}},
+        )
+
+    def test_publish_failures_are_logged(self) -> None:
+        broker = RedisSeatEventBroker(url="redis://cache:6379/0")
+        broker._client = mock.Mock()
+        broker._client.publish.side_effect = ConnectionError("down")
+
+        with self.assertLogs("cinema.events", "ERROR"):
+            broker.publish(1, {"type": "seats_taken"})
+
+    def test_channel_messages_reach_local_watchers(self) -> None:
+        broker = RedisSeatEventBroker(url="redis://cache:6379/0")
+        broker._client = mock.Mock()
+        broker._client.pubsub.return_value.listen.return_value = [
+            {
+                "data": json.dumps(
+                    {"session": 1, "event": {"type": "seats_taken"}}
+                )
+            }
+        ]
+        # Listen in the test itself instead of a background thread.
+        broker._listener = mock.Mock()
+
+        async def run() -> tuple:
+            watcher = broker.subscribe(1)
+            other = broker.subscribe(2)
+            with mock.patch("cinema.events.time.sleep") as sleep:
+                sleep.side_effect = InterruptedError
+                with self.assertRaises(InterruptedError):
+                    broker.listen()
+            await asyncio.sleep(0)
+            return (
+                [watcher.queue.get_nowait() for _ in range(2)],
+                [other.queue.get_nowait()],
+            )
+
+        watcher_events, other_events = asyncio.run(run())
+
+        # A closed channel may have dropped events, so watchers resync.
+        self.assertEqual(
+            watcher_events, [{"type": "seats_taken"}, {"type": "resync"}]
+        )
+        self.assertEqual(other_events, [{"type": "resync"}])
+
+
+class SeatEventsStreamTests(TestCase):
+    def setUp(self) -> None:
+        reset_broker()
+        self.movie = Movie.objects.create(
+            title="Titanic", description="Titanic description", duration=123
+        )
+        self.cinema_hall = CinemaHall.objects.create(
+            name="White", rows=10, seats_in_row=14
+        )
+        self.movie_session = MovieSession.objects.create(
+            movie=self.movie,
+            cinema_hall=self.cinema_hall,
+            show_time=datetime(2022, 9, 2, 9),
+        )
+
+    def tearDown(self) -> None:
+        reset_broker()
+
+    def stream(self, path: str, publish: dict = None) -> list:
+        application = SeatEventsApplication(None)
+        scope = {"type": "http", "method": "GET", "path": path}
+
+        async def run() -> list:
+            messages = []
+            disconnect = asyncio.Event()
+
+            async def receive() -> dict:
+                await disconnect.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message: dict) -> None:
+                messages.append(message)
+                if b"event:" in message.get("body", b""):
+                    disconnect.set()
+
+            task = asyncio.ensure_future(application(scope, receive, send))
+            broker = get_broker()
+            while not task.done() and not broker.subscriber_count():
+                await asyncio.sleep(0)
+            if publish is not None:
+                broker.publish(self.movie_session.id, publish)
+            await task
+            return messages
+
+        return async_to_sync(run)()
+
+    def test_stream_pushes_seat_events(self) -> None:
+        messages = self.stream(
+            f"/api/cinema/movie_sessions/{self.movie_session.id}/events/",
+            {"type": "seats_taken", "version": 3, "places": []},
+        )
+
+        self.assertEqual(messages[0]["status"], 200)
+        self.assertIn(
+            (b"content-type", b"text/event-stream"), messages[0]["headers"]
+        )
+        body = b"".join(message.get("body", b"") for message in messages)
+        self.assertIn(b"event: seats_taken\nid: 3\n", body)
+        self.assertEqual(get_broker().subscriber_count(), 0)
+
+    def test_stream_unknown_session(self) -> None:
+        messages = self.stream("/api/cinema/movie_sessions/1000/events/")
+        self.assertEqual(messages[0]["status"], 404)
+
+    def test_order_creation_publishes_taken_seats(self) -> None:
+        client = APIClient()
+        client.force_authenticate(User.objects.create(username="admin"))
+        payload = {
+            "tickets": [
+                {"movie_session": self.movie_session.id, "row": 5, "seat": 5},
+                {"movie_session": self.movie_session.id, "row": 5, "seat": 6},
+            ]
+        }
+
+        with mock.patch(
+            "cinema.events.LocalSeatEventBroker.publish"
+        ) as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = client.post(
+                    "/api/cinema/orders/", payload, format="json"
+                )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        publish.assert_called_once()
+        session_id, event = publish.call_args.args
+        self.assertEqual(session_id, self.movie_session.id)
+        self.assertEqual(event["type"], "seats_taken")
+        self.assertEqual(
+            event["places"], [{"row": 5, "seat": 5}, {"row": 5, "seat": 6}]
+        )
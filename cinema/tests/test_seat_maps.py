@@ -0,0 +1,121 @@
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cinema.models import CinemaHall, Movie, MovieSession, Order, Ticket
+from cinema.seat_maps import decode_bitmap, encode_bitmap
+from cinema.views import MAX_SEAT_MAP_IDS
+from user.models import User
+
+
+class SeatMapsTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create(username="viewer")
+        small = CinemaHall.objects.create(name="Small", rows=2, seats_in_row=5)
+        large = CinemaHall.objects.create(name="Large", rows=3, seats_in_row=7)
+        movie = Movie.objects.create(
+            title="Premiere", description="Premiere", duration=120
+        )
+        self.sessions = [
+            MovieSession.objects.create(
+                movie=movie,
+                cinema_hall=hall,
+                show_time=datetime(2030, 1, 1, 12, tzinfo=timezone.utc),
+            )
+            for hall in (small, large, large)
+        ]
+        order = Order.objects.create(user=self.user)
+        for movie_session, row, seat in (
+            (self.sessions[0], 1, 1),
+            (self.sessions[0], 2, 5),
+            (self.sessions[1], 3, 7),
+        ):
+            Ticket.objects.create(
+                movie_session=movie_session, order=order, row=row, seat=seat
+            )
+
+    def get_seat_maps(self, query: str):
+        return self.client.get(f"/api/cinema/movie_sessions/seat_maps/?{query}")
+
+    def test_bitmap_round_trip(self) -> None:
+        places = [(1, 1), (2, 3), (3, 7)]
+
+        encoded = encode_bitmap(places, rows=3, seats_in_row=7)
+
+        self.assertEqual(decode_bitmap(encoded, 3, 7), places)
+        self.assertEqual(len(encoded), 4)
+
+    def test_seat_maps_from_one_ticket_query(self) -> None:
+        ids = ",".join(str(movie_session.id) for movie_session in self.sessions)
+
+        with self.assertNumQueries(2):
+            response = self.get_seat_maps(f"ids={ids},999")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["missing"], [999])
+        seat_maps = {
+            seat_map["id"]: seat_map for seat_map in response.data["results"]
+        }
+        first = seat_maps[self.sessions[0].id]
+        self.assertEqual((first["rows"], first["seats_in_row"]), (2, 5))
+        self.assertEqual(
+            decode_bitmap(first["taken"], 2, 5), [(1, 1), (2, 5)]
+        )
+        self.assertEqual(
+            decode_bitmap(seat_maps[self.sessions[2].id]["taken"], 3, 7), []
+        )
+
+    def test_cached_bitmaps_follow_seats_version(self) -> None:
+        query = f"ids={self.sessions[0].id}&encoding=places"
+        self.get_seat_maps(query)
+
+        with self.assertNumQueries(1):
+            response = self.get_seat_maps(query)
+        self.assertEqual(response.data["results"][0]["taken"], [(1, 1), (2, 5)])
+
+        Ticket.objects.create(
+            movie_session=self.sessions[0],
+            order=Order.objects.create(user=self.user),
+            row=1,
+            seat=2,
+        )
+        response = self.get_seat_maps(query)
+        self.assertEqual(
+            response.data["results"][0]["taken"], [(1, 1), (1, 2), (2, 5)]
+        )
+
+    def test_invalid_requests(self) -> None:
+        too_many = ",".join(str(pk) for pk in range(MAX_SEAT_MAP_IDS + 1))
+        for query in ("", "ids=a", f"ids={too_many}", "ids=1&encoding=png"):
+            self.assertEqual(
+                self.get_seat_maps(query).status_code,
+                status.HTTP_400_BAD_REQUEST,
+                query,
+            )
+
+    def test_places_outside_the_hall_are_skipped(self) -> None:
+        encoded = encode_bitmap(
+            [(1, 1), (0, 2), (2, 0), (3, 1), (1, 6)], rows=2, seats_in_row=5
+        )
+
+        self.assertEqual(decode_bitmap(encoded, 2, 5), [(1, 1)])
+
+    def test_resized_hall_refreshes_cached_bitmap(self) -> None:
+        query = f"ids={self.sessions[0].id}&encoding=places"
+        self.get_seat_maps(query)
+
+        hall = self.sessions[0].cinema_hall
+        hall.rows = 1
+        hall.seats_in_row = 4
+        hall.save()
+        response = self.get_seat_maps(query)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        seat_map = response.data["results"][0]
+        self.assertEqual((seat_map["rows"], seat_map["seats_in_row"]), (1, 4))
+        self.assertEqual(seat_map["taken"], [(1, 1)])
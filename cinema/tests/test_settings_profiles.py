@@ -0,0 +1,138 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+SETTINGS_SCRIPT = """
+import json
+from django.conf import settings
+print(json.dumps({
+    "DEBUG": settings.DEBUG,
+    "INSTALLED_APPS": settings.INSTALLED_APPS,
+    "MIDDLEWARE": settings.MIDDLEWARE,
+    "CONN_MAX_AGE": settings.DATABASES["default"].get("CONN_MAX_AGE", 0),
+    "TEMPLATES": settings.TEMPLATES,
+    "CACHE_BACKEND": settings.CACHES["default"]["BACKEND"],
+    "RENDERERS": settings.REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"],
+    "SEAT_EVENTS": settings.CINEMA_SEAT_EVENTS,
+}))
+"""
+
+PROD_ENV = {
+    "CINEMA_PROFILE": "prod",
+    "DJANGO_SECRET_KEY": "prod-secret",
+    "DJANGO_ALLOWED_HOSTS": "cinema.example.com",
+}
+
+
+def load_settings(**env) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", SETTINGS_SCRIPT],
+        cwd=settings.BASE_DIR,
+        env={
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "cinema_service.settings",
+            "CINEMA_ROLE": "all",
+            **env,
+        },
+        capture_output=True,
+        text=True,
+    )
+
+
+def load_profile(**env) -> dict:
+    process = load_settings(**env)
+    assert process.returncode == 0, process.stderr
+    return json.loads(process.stdout)
+
+
+class SettingsProfileTests(SimpleTestCase):
+    def test_prod_middleware_stays_lean(self) -> None:
+        profile = load_profile(**PROD_ENV)
+
+        self.assertEqual(
+            profile["MIDDLEWARE"],
+            [
+                "django.middleware.security.SecurityMiddleware",
+                "cinema_service.middleware.ApiGZipMiddleware",
+                "django.contrib.sessions.middleware.SessionMiddleware",
+                "django.middleware.common.CommonMiddleware",
+                "django.middleware.csrf.CsrfViewMiddleware",
+                "django.contrib.auth.middleware.AuthenticationMiddleware",
+                "django.contrib.messages.middleware.MessageMiddleware",
+                "django.middleware.clickjacking.XFrameOptionsMiddleware",
+            ],
+        )
+        self.assertNotIn("debug_toolbar", profile["INSTALLED_APPS"])
+
+    def test_prod_api_role_middleware(self) -> None:
+        profile = load_profile(**PROD_ENV, CINEMA_ROLE="api")
+
+        self.assertEqual(
+            profile["MIDDLEWARE"],
+            [
+                "django.middleware.security.SecurityMiddleware",
+                "cinema_service.middleware.ApiGZipMiddleware",
+                "django.middleware.common.CommonMiddleware",
+                "django.middleware.csrf.CsrfViewMiddleware",
+                "django.middleware.clickjacking.XFrameOptionsMiddleware",
+            ],
+        )
+
+    def test_prod_hot_path_settings(self) -> None:
+        profile = load_profile(**PROD_ENV)
+
+        self.assertFalse(profile["DEBUG"])
+        self.assertGreater(profile["CONN_MAX_AGE"], 0)
+        self.assertEqual(
+            profile["TEMPLATES"][0]["OPTIONS"]["loaders"][0][0],
+            "django.template.loaders.cached.Loader",
+        )
+        self.assertEqual(
+            profile["CACHE_BACKEND"],
+            "django.core.cache.backends.redis.RedisCache",
+        )
+        self.assertEqual(
+            profile["SEAT_EVENTS"]["BACKEND"],
+            "cinema.events.RedisSeatEventBroker",
+        )
+        self.assertNotIn(
+            "rest_framework.renderers.BrowsableAPIRenderer",
+            profile["RENDERERS"],
+        )
+
+    def test_bench_drops_debug_tooling(self) -> None:
+        profile = load_profile(CINEMA_PROFILE="bench")
+
+        self.assertFalse(profile["DEBUG"])
+        self.assertNotIn("debug_toolbar", profile["INSTALLED_APPS"])
+        self.assertEqual(
+            profile["CACHE_BACKEND"],
+            "django.core.cache.backends.locmem.LocMemCache",
+        )
+
+    def test_dev_keeps_debug_toolbar_after_gzip(self) -> None:
+        profile = load_profile(CINEMA_PROFILE="dev")
+
+        self.assertTrue(profile["DEBUG"])
+        self.assertEqual(
+            profile["MIDDLEWARE"][1:3],
+            [
+                "cinema_service.middleware.ApiGZipMiddleware",
+                "debug_toolbar.middleware.DebugToolbarMiddleware",
+            ],
+        )
+
+    def test_invalid_profiles_are_rejected(self) -> None:
+        for env in (
+            {"CINEMA_PROFILE": "staging"},
+            {"CINEMA_PROFILE": "prod"},
+            {**PROD_ENV, "DJANGO_ALLOWED_HOSTS": ""},
+        ):
+            process = load_settings(**{"DJANGO_SECRET_KEY": "", **env})
+
+            self.assertNotEqual(process.returncode, 0)
+            self.assertIn("ImproperlyConfigured", process.stderr)
@@ -0,0 +1,74 @@
+import os
+import subprocess
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, tag
+
+from cinema.startup import (
+    group_by_package,
+    parse_import_times,
+    profile_startup,
+)
+
+IMPORT_TIMES = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     django.utils.version
+import time:       300 |        420 |   django.utils
+import time:       500 |        920 | django
+import time:        80 |         80 | cinema.models
+"""
+
+# Replicas would still point at files under BASE_DIR.
+STARTUP_ENV = {
+    "DJANGO_SETTINGS_MODULE": "cinema.tests.startup_settings",
+    "DATABASE_REPLICA_PATHS": "",
+}
+
+
+class StartupProfileTests(SimpleTestCase):
+    def test_parse_import_times(self) -> None:
+        imports = parse_import_times(IMPORT_TIMES + "unrelated output\n")
+
+        self.assertEqual(imports[0], ("django.utils.version", 120, 120))
+        self.assertEqual(len(imports), 4)
+        self.assertEqual(
+            group_by_package(imports), {"django": 920, "cinema": 80}
+        )
+
+    def test_failed_start_without_output(self) -> None:
+        process = subprocess.CompletedProcess([], 1, stdout="", stderr="")
+
+        with mock.patch("cinema.startup.subprocess.run") as run:
+            run.return_value = process
+            with self.assertRaisesMessage(RuntimeError, "exit status 1"):
+                profile_startup("api", "/api/cinema/")
+
+    @tag("slow")
+    @mock.patch.dict(os.environ, STARTUP_ENV)
+    def test_api_role_skips_admin_and_debug_tooling(self) -> None:
+        profile = profile_startup("api", "/api/cinema/")
+
+        self.assertEqual(profile["status"], 200)
+        modules = {name for name, _, _ in profile["imports"]}
+        self.assertIn("rest_framework.views", modules)
+        self.assertNotIn("debug_toolbar", modules)
+        self.assertNotIn("django.contrib.sessions.middleware", modules)
+        self.assertNotIn("django.contrib.messages.middleware", modules)
+
+    @tag("slow")
+    @mock.patch.dict(os.environ, STARTUP_ENV)
+    def test_command_enforces_target(self) -> None:
+        out = StringIO()
+
+        with self.assertRaisesMessage(CommandError, "target is 0 ms"):
+            call_command(
+                "profile_startup",
+                role=["api"],
+                repeat=1,
+                target_ms=0,
+                stdout=out,
+            )
+        self.assertIn("api:", out.getvalue())
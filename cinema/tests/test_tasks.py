@@ -0,0 +1,138 @@
+from datetime import datetime, timezone
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone as django_timezone
+from rest_framework.test import APIClient
+
+from cinema import tasks
+from cinema.management.commands.run_workers import work
+from cinema.models import CinemaHall, Movie, MovieSession, Task
+from user.models import User
+
+
+class TaskQueueTests(TestCase):
+    def setUp(self) -> None:
+        self.calls = []
+        registry = mock.patch.dict(tasks._registry)
+        registry.start()
+        self.addCleanup(registry.stop)
+        tasks.task("tests.record")(
+            lambda **payload: self.calls.append(payload)
+        )
+        tasks.task("tests.fail")(self.fail_task)
+
+    @staticmethod
+    def fail_task() -> None:
+        raise RuntimeError("boom")
+
+    def test_test_tasks_are_unregistered(self) -> None:
+        self.doCleanups()
+
+        self.assertNotIn("tests.record", tasks._registry)
+        self.assertNotIn("tests.fail", tasks._registry)
+
+    def run_workers(self) -> None:
+        call_command(
+            "run_workers", "--processes=0", "--once", stdout=StringIO()
+        )
+
+    def test_enqueue_waits_for_commit(self) -> None:
+        with self.captureOnCommitCallbacks() as callbacks:
+            tasks.enqueue("tests.record", {"order_id": 1})
+            self.assertFalse(Task.objects.exists())
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(Task.objects.get().payload, {"order_id": 1})
+
+    def test_worker_runs_due_tasks(self) -> None:
+        Task.objects.create(name="tests.record", payload={"order_id": 1})
+
+        self.run_workers()
+
+        self.assertEqual(self.calls, [{"order_id": 1}])
+        self.assertEqual(Task.objects.get().status, Task.Status.DONE)
+
+    def test_failed_task_is_retried_with_backoff(self) -> None:
+        Task.objects.create(name="tests.fail", max_attempts=2)
+
+        self.run_workers()
+        item = Task.objects.get()
+        self.assertEqual(item.status, Task.Status.PENDING)
+        self.assertEqual(item.attempts, 1)
+        self.assertGreater(item.run_after, django_timezone.now())
+        self.assertIn("boom", item.last_error)
+
+        Task.objects.update(run_after=django_timezone.now())
+        self.run_workers()
+        item.refresh_from_db()
+        self.assertEqual(item.status, Task.Status.FAILED)
+        self.assertEqual(item.attempts, 2)
+
+    def test_stale_running_tasks_are_requeued(self) -> None:
+        Task.objects.create(
+            name="tests.record",
+            status=Task.Status.RUNNING,
+            locked_at=datetime(2020, 1, 1, tzinfo=timezone.utc),
+        )
+
+        self.run_workers()
+
+        self.assertEqual(Task.objects.get().status, Task.Status.DONE)
+
+    def test_worker_loop_requeues_tasks_gone_stale(self) -> None:
+        def sleep(seconds: float) -> None:
+            if Task.objects.exists():
+                raise InterruptedError
+            # A worker died while running this task after the pool started.
+            Task.objects.create(
+                name="tests.record",
+                status=Task.Status.RUNNING,
+                locked_at=datetime(2020, 1, 1, tzinfo=timezone.utc),
+            )
+
+        with mock.patch("signal.signal"), mock.patch(
+            "time.sleep", side_effect=sleep
+        ), self.assertRaises(InterruptedError):
+            work(batch_size=10, poll_interval=0, once=False)
+
+        self.assertEqual(Task.objects.get().status, Task.Status.DONE)
+
+    def test_order_enqueues_confirmation_after_commit(self) -> None:
+        client = APIClient()
+        client.force_authenticate(User.objects.create(username="admin"))
+        movie_session = MovieSession.objects.create(
+            movie=Movie.objects.create(
+                title="Titanic", description="description", duration=123
+            ),
+            cinema_hall=CinemaHall.objects.create(
+                name="White", rows=10, seats_in_row=14
+            ),
+            show_time=datetime(2022, 9, 2, 9, tzinfo=timezone.utc),
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(
+                "/api/cinema/orders/",
+                {
+                    "tickets": [
+                        {
+                            "movie_session": movie_session.id,
+                            "row": 1,
+                            "seat": 1,
+                        }
+                    ]
+                },
+                format="json",
+            )
+
+        item = Task.objects.get()
+        self.assertEqual(item.name, "cinema.send_order_confirmation")
+        self.assertEqual(item.payload, {"order_id": response.data["id"]})
+
+        with mock.patch.object(tasks.logger, "info") as info:
+            self.run_workers()
+        self.assertIn("row: 1, seat: 1", info.call_args.args[0])
@@ -0,0 +1,140 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cinema.models import CinemaHall, Movie, MovieSession
+from cinema.throttling import SlidingWindowRateThrottle
+from user.models import User
+
+WINDOW_START = 60.0 * 100_000
+
+
+def throttle_rates(**rates) -> dict:
+    return {
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_RATES": {
+            "orders_user": "100/min",
+            "orders_session": "100/min",
+            **rates,
+        },
+    }
+
+
+@mock.patch.object(SlidingWindowRateThrottle, "timer")
+class OrderThrottleTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create(username="bot")
+        self.client.force_authenticate(user=self.user)
+        hall = CinemaHall.objects.create(name="Red", rows=10, seats_in_row=10)
+        movie = Movie.objects.create(
+            title="Premiere", description="Premiere", duration=120
+        )
+        self.movie_session = MovieSession.objects.create(
+            movie=movie,
+            cinema_hall=hall,
+            show_time=datetime(2022, 9, 2, 9, tzinfo=timezone.utc),
+        )
+        self.seat = 0
+
+    def post_order(self, client: APIClient = None):
+        self.seat += 1
+        return (client or self.client).post(
+            "/api/cinema/orders/",
+            {
+                "tickets": [
+                    {
+                        "movie_session": self.movie_session.id,
+                        "row": 1,
+                        "seat": self.seat,
+                    }
+                ]
+            },
+            format="json",
+        )
+
+    @override_settings(REST_FRAMEWORK=throttle_rates(orders_user="2/min"))
+    def test_user_limit(self, timer) -> None:
+        timer.return_value = WINDOW_START
+
+        self.assertEqual(self.post_order().status_code, 201)
+        self.assertEqual(self.post_order().status_code, 201)
+        response = self.post_order()
+
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        # Three hits fade to the one allowed before the next request
+        # 40 seconds into the following window.
+        self.assertEqual(response["Retry-After"], "100")
+        self.assertEqual(
+            self.client.get("/api/cinema/orders/").status_code, 200
+        )
+
+    @override_settings(REST_FRAMEWORK=throttle_rates(orders_user="2/min"))
+    def test_previous_window_is_weighted(self, timer) -> None:
+        timer.return_value = WINDOW_START + 30
+        self.post_order()
+        self.post_order()
+
+        timer.return_value = WINDOW_START + 60 + 30
+        response = self.post_order()
+        self.assertEqual(response.status_code, 201)
+
+        timer.return_value = WINDOW_START + 60 + 31
+        response = self.post_order()
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+
+    @override_settings(REST_FRAMEWORK=throttle_rates(orders_session="1/min"))
+    def test_session_limit_is_shared_between_users(self, timer) -> None:
+        timer.return_value = WINDOW_START
+        other = APIClient()
+        other.force_authenticate(
+            user=User.objects.create(username="other-bot")
+        )
+
+        self.assertEqual(self.post_order().status_code, 201)
+        response = self.post_order(other)
+
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertIn("Retry-After", response)
+
+    @override_settings(REST_FRAMEWORK=throttle_rates(orders_user="1/min"))
+    def test_idempotent_replays_are_not_throttled(self, timer) -> None:
+        timer.return_value = WINDOW_START
+        payload = {
+            "tickets": [
+                {"movie_session": self.movie_session.id, "row": 1, "seat": 1}
+            ]
+        }
+
+        for _ in range(3):
+            response = self.client.post(
+                "/api/cinema/orders/",
+                payload,
+                format="json",
+                HTTP_IDEMPOTENCY_KEY="retry-1",
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response["Idempotent-Replayed"], "true")
+
+        self.assertEqual(
+            self.post_order().status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        )
+
+
+class SlidingWindowRateThrottleTests(TestCase):
+    def test_base_class_is_abstract(self) -> None:
+        with self.assertRaises(TypeError):
+            SlidingWindowRateThrottle()
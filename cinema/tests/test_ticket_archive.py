@@ -0,0 +1,141 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cinema.archive import all_tickets
+from cinema.models import (
+    ArchivedTicket,
+    CinemaHall,
+    Movie,
+    MovieSession,
+    Order,
+    Ticket,
+)
+from user.models import User
+
+
+class TicketArchiveTests(TestCase):
+    def setUp(self) -> None:
+        movie = Movie.objects.create(
+            title="Titanic", description="description", duration=123
+        )
+        cinema_hall = CinemaHall.objects.create(
+            name="White", rows=10, seats_in_row=14
+        )
+        self.old_session = MovieSession.objects.create(
+            movie=movie,
+            cinema_hall=cinema_hall,
+            show_time=timezone.now() - timedelta(days=200),
+        )
+        self.new_session = MovieSession.objects.create(
+            movie=movie,
+            cinema_hall=cinema_hall,
+            show_time=timezone.now() + timedelta(days=1),
+        )
+        self.order = Order.objects.create(
+            user=User.objects.create(username="admin")
+        )
+        for movie_session in (self.old_session, self.new_session):
+            for seat in (1, 2, 3):
+                Ticket.objects.create(
+                    movie_session=movie_session,
+                    order=self.order,
+                    row=1,
+                    seat=seat,
+                )
+
+    def test_archive_horizon_cannot_undercut_setting(self) -> None:
+        with self.assertRaisesMessage(CommandError, "TICKET_ARCHIVE_HORIZON"):
+            call_command(
+                "archive_tickets", "--horizon-days=0", stdout=StringIO()
+            )
+        self.assertFalse(ArchivedTicket.objects.exists())
+
+    def test_archive_tickets_in_batches(self) -> None:
+        out = StringIO()
+        call_command(
+            "archive_tickets", "--batch-size=2", "--max-batches=1", stdout=out
+        )
+        self.assertEqual(ArchivedTicket.objects.count(), 2)
+
+        call_command("archive_tickets", "--batch-size=2", stdout=out)
+        self.assertEqual(
+            set(Ticket.objects.values_list("movie_session", flat=True)),
+            {self.new_session.id},
+        )
+        self.assertEqual(
+            ArchivedTicket.objects.filter(
+                movie_session=self.old_session, order=self.order
+            ).count(),
+            3,
+        )
+
+    def test_archiving_keeps_sold_counters(self) -> None:
+        self.old_session.refresh_from_db()
+        version = self.old_session.seats_version
+
+        call_command("archive_tickets", stdout=StringIO())
+
+        self.old_session.refresh_from_db()
+        self.assertEqual(self.old_session.tickets_taken, 3)
+        self.assertGreater(self.old_session.seats_version, version)
+        self.assertEqual(
+            self.old_session.seats_released_version,
+            self.old_session.seats_version,
+        )
+
+    def test_all_tickets_unions_hot_and_archived(self) -> None:
+        call_command("archive_tickets", stdout=StringIO())
+
+        self.assertEqual(all_tickets(order=self.order).count(), 6)
+        self.assertEqual(
+            sorted(
+                ticket["seat"]
+                for ticket in all_tickets(movie_session=self.old_session)
+            ),
+            [1, 2, 3],
+        )
+
+    def test_order_history_includes_archived_tickets(self) -> None:
+        call_command("archive_tickets", stdout=StringIO())
+        client = APIClient()
+        client.force_authenticate(self.order.user)
+
+        response = client.get("/api/cinema/orders/")
+
+        tickets = response.data["results"][0]["tickets"]
+        self.assertEqual(len(tickets), 6)
+        self.assertEqual(
+            [ticket["movie_session"]["id"] for ticket in tickets[:3]],
+            [self.old_session.id] * 3,
+        )
+
+    def test_archived_seats_cannot_be_booked_again(self) -> None:
+        call_command("archive_tickets", stdout=StringIO())
+        client = APIClient()
+        client.force_authenticate(self.order.user)
+
+        response = client.post(
+            "/api/cinema/orders/",
+            {
+                "tickets": [
+                    {
+                        "movie_session": self.old_session.id,
+                        "row": 1,
+                        "seat": 2,
+                    }
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(
+            Ticket.objects.filter(movie_session=self.old_session).exists()
+        )
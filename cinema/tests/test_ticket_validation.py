@@ -0,0 +1,120 @@
+from datetime import datetime, timezone
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from cinema.models import CinemaHall, Movie, MovieSession, Order, Ticket
+from cinema.serializers import TicketSerializer
+from cinema.validation import hall_geometry, validate_seat
+from user.models import User
+
+
+class TicketValidationTests(TestCase):
+    def setUp(self) -> None:
+        self.cinema_hall = CinemaHall.objects.create(
+            name="White", rows=10, seats_in_row=14
+        )
+        self.movie = Movie.objects.create(
+            title="Titanic", description="description", duration=123
+        )
+        self.movie_session = MovieSession.objects.create(
+            movie=self.movie,
+            cinema_hall=self.cinema_hall,
+            show_time=datetime(2022, 9, 2, 9, tzinfo=timezone.utc),
+        )
+        self.order = Order.objects.create(
+            user=User.objects.create(username="admin")
+        )
+
+    def test_validate_seat_uses_cached_geometry(self) -> None:
+        validate_seat(self.movie_session.id, 1, 1)
+
+        with self.assertNumQueries(0):
+            validate_seat(self.movie_session.id, 10, 14)
+            with self.assertRaises(ValidationError) as error:
+                validate_seat(self.movie_session.id, 11, 1)
+        self.assertIn("row", error.exception.message_dict)
+
+    def test_geometry_invalidated_on_hall_change(self) -> None:
+        validate_seat(self.movie_session.id, 1, 1)
+
+        self.cinema_hall.rows = 5
+        self.cinema_hall.save()
+
+        with self.assertRaises(ValidationError):
+            validate_seat(self.movie_session.id, 6, 1)
+
+    def test_geometry_cache_is_bounded(self) -> None:
+        max_size = hall_geometry.max_size
+        hall_geometry.max_size = 1
+        try:
+            other_session = MovieSession.objects.create(
+                movie=self.movie,
+                cinema_hall=self.cinema_hall,
+                show_time=datetime(2022, 9, 3, 9, tzinfo=timezone.utc),
+            )
+            validate_seat(self.movie_session.id, 1, 1)
+            validate_seat(other_session.id, 1, 1)
+            with self.assertNumQueries(1):
+                validate_seat(self.movie_session.id, 1, 1)
+        finally:
+            hall_geometry.max_size = max_size
+
+    def test_serializer_validation_skips_hall_query(self) -> None:
+        validate_seat(self.movie_session.id, 1, 1)
+        serializer = TicketSerializer(
+            data={"movie_session": self.movie_session.id, "row": 11, "seat": 1}
+        )
+
+        # Session lookup and the unique_together check only.
+        with self.assertNumQueries(2):
+            self.assertFalse(serializer.is_valid())
+        self.assertIn("row", serializer.errors)
+
+    def test_create_validated_tickets(self) -> None:
+        tickets = Ticket.objects.create_validated(
+            [
+                Ticket(
+                    movie_session=self.movie_session,
+                    order=self.order,
+                    row=1,
+                    seat=seat,
+                )
+                for seat in (1, 2)
+            ]
+        )
+
+        self.movie_session.refresh_from_db()
+        self.assertEqual(Ticket.objects.count(), 2)
+        self.assertEqual(
+            {ticket.session_version for ticket in tickets},
+            {self.movie_session.seats_version},
+        )
+
+    def test_create_validated_tickets_enforces_rules(self) -> None:
+        for row, seat in [(11, 1), (1, 15)]:
+            with self.assertRaises(ValidationError):
+                Ticket.objects.create_validated(
+                    [
+                        Ticket(
+                            movie_session=self.movie_session,
+                            order=self.order,
+                            row=row,
+                            seat=seat,
+                        )
+                    ]
+                )
+
+        with self.assertRaises(ValidationError):
+            Ticket.objects.create_validated(
+                [
+                    Ticket(
+                        movie_session=self.movie_session,
+                        order=self.order,
+                        row=1,
+                        seat=1,
+                    )
+                    for _ in range(2)
+                ]
+            )
+        self.assertFalse(Ticket.objects.exists())
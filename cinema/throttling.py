@@ -0,0 +1,108 @@
+import math
+from abc import ABCMeta, abstractmethod
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle, metaclass=ABCMeta):
+    """
+    Estimates the request rate over the last window from two fixed-window
+    counters, so each hit costs one atomic cache increment instead of
+    rewriting a list of timestamps. Rejected hits are counted as well.
+    """
+
+    cache_format = "cinema:throttle:%(scope)s:%(ident)s"
+
+    def get_rate(self) -> str:
+        try:
+            return api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+        except KeyError:
+            raise ImproperlyConfigured(
+                f"No default throttle rate set for '{self.scope}' scope"
+            )
+
+    @abstractmethod
+    def get_cache_keys(self, request, view) -> list[str]:
+        ...
+
+    def allow_request(self, request, view) -> bool:
+        if self.rate is None:
+            return True
+
+        self.now = self.timer()
+        self.estimates = [
+            self.hit(key) for key in self.get_cache_keys(request, view)
+        ]
+        return all(
+            estimate <= self.num_requests
+            for estimate, _, _ in self.estimates
+        )
+
+    def hit(self, key: str) -> tuple[float, int, int]:
+        window = int(self.now // self.duration)
+        current_key = f"{key}:{window}"
+        cache.add(current_key, 0, timeout=self.duration * 2)
+        try:
+            current = cache.incr(current_key)
+        except ValueError:
+            # The counter expired between add() and incr().
+            cache.add(current_key, 1, timeout=self.duration * 2)
+            current = 1
+        previous = cache.get(f"{key}:{window - 1}", 0)
+        return self.estimate(previous, current), previous, current
+
+    def estimate(self, previous: int, current: int) -> float:
+        elapsed = self.now % self.duration
+        return previous * (1 - elapsed / self.duration) + current
+
+    def wait(self) -> float:
+        elapsed = self.now % self.duration
+        allowed = self.num_requests - 1
+        waits = [0.0]
+        for estimate, previous, current in self.estimates:
+            if estimate <= self.num_requests:
+                continue
+            if current <= allowed and previous:
+                # The previous window fades out enough before this one ends.
+                waits.append(
+                    self.duration * (1 - (allowed - current) / previous)
+                    - elapsed
+                )
+            else:
+                waits.append(
+                    self.duration
+                    - elapsed
+                    + max(0.0, self.duration * (1 - allowed / current))
+                )
+        return math.ceil(max(waits))
+
+
+class OrderUserRateThrottle(SlidingWindowRateThrottle):
+    scope = "orders_user"
+
+    def get_cache_keys(self, request, view) -> list[str]:
+        return [
+            self.cache_format
+            % {"scope": self.scope, "ident": request.user.pk}
+        ]
+
+
+class OrderSessionRateThrottle(SlidingWindowRateThrottle):
+    scope = "orders_session"
+
+    def get_cache_keys(self, request, view) -> list[str]:
+        try:
+            session_ids = {
+                int(ticket["movie_session"])
+                for ticket in request.data["tickets"]
+            }
+        except (KeyError, TypeError, ValueError):
+            # Malformed orders are rejected by the serializer.
+            return []
+        return [
+            self.cache_format % {"scope": self.scope, "ident": session_id}
+            for session_id in sorted(session_ids)
+        ]
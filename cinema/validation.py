@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+
+from cinema.models import MovieSession
+
+GEOMETRY_VERSION_KEY = "cinema:hall_geometry:version"
+
+
+class HallGeometryCache:
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: int) -> tuple[int, int]:
+        version = get_geometry_version()
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self.version = version
+
+            geometry = self._entries.get(session_id)
+            if geometry is not None:
+                self._entries.move_to_end(session_id)
+                return geometry
+
+        session = (
+            MovieSession.objects.filter(pk=session_id)
+            .values_list(
+                "cinema_hall__rows",
+                "cinema_hall__seats_in_row",
+                "cancelled_at",
+            )
+            .first()
+        )
+        if session is None:
+            raise ValidationError(
+                {"movie_session": "Movie session does not exist."}
+            )
+        if session[2] is not None:
+            raise ValidationError(
+                {"movie_session": "Movie session is cancelled."}
+            )
+        geometry = session[:2]
+
+        with self._lock:
+            if version == self.version:
+                self._entries[session_id] = geometry
+                if len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return geometry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.version = None
+
+
+hall_geometry = HallGeometryCache(
+    getattr(settings, "HALL_GEOMETRY_CACHE_SIZE", 4096)
+)
+
+
+def get_geometry_version() -> int:
+    version = cache.get(GEOMETRY_VERSION_KEY)
+    if version is None:
+        cache.add(GEOMETRY_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(GEOMETRY_VERSION_KEY)
+    return version
+
+
+def bump_geometry_version() -> None:
+    try:
+        cache.incr(GEOMETRY_VERSION_KEY)
+    except ValueError:
+        get_geometry_version()
+
+
+def validate_seat(session_id: int, row: int, seat: int) -> None:
+    rows, seats_in_row = hall_geometry.get(session_id)
+
+    for ticket_attr_value, ticket_attr_name, cinema_hall_attr_name, count in [
+        (row, "row", "rows", rows),
+        (seat, "seat", "seats_in_row", seats_in_row),
+    ]:
+        if not (1 <= ticket_attr_value <= count):
+            raise ValidationError(
+                {
+                    ticket_attr_name: f"{ticket_attr_name} "
+                    f"number must be in available range: "
+                    f"(1, {cinema_hall_attr_name}): "
+                    f"(1, {count})"
+                }
+            )
@@ -1,17 +1,45 @@
-from django.db.models import F, Count, QuerySet
+import hashlib
+import json
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Exists, OuterRef, Q, QuerySet, Window
+from django.db.models.functions import RowNumber
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_date, parse_datetime, parse_time
+from django.utils.http import http_date
 from rest_framework import viewsets, mixins, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotAcceptable, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from cinema_service.db_router import (
+    is_pinned_to_primary,
+    pin_to_primary,
+    replica_reads,
+)
+from cinema.cancellation import cancel_order
 from cinema.models import (
     Genre,
     Actor,
     CinemaHall,
     Movie,
+    MovieDocument,
     MovieSession,
     Order,
+    Ticket,
+    IdempotencyKey,
 )
+from cinema.projection import FieldProjection, FieldProjectionMixin
+from cinema.renderers import stream_json_list
+from cinema.seat_maps import decode_bitmap, get_seat_maps
 from cinema.serializers import (
     GenreSerializer,
     ActorSerializer,
@@ -22,12 +50,135 @@ from cinema.serializers import (
     MovieDetailSerializer,
     MovieListSerializer,
     MovieSessionDetailSerializer,
+    MovieSessionSeatsDeltaSerializer,
     OrderSerializer,
+    OrderCancelSerializer,
     OrderListSerializer,
+    UpcomingSessionSerializer,
 )
+from cinema.throttling import OrderSessionRateThrottle, OrderUserRateThrottle
+
+
+MAX_TIME_OF_DAY_RANGE_DAYS = 62
+MAX_UPCOMING_SESSIONS = 20
+MAX_SEAT_MAP_IDS = 50
+
+
+class ReplicaReadMixin:
+    replica_actions = ("list", "retrieve")
+
+    def initial(self, request, *args, **kwargs) -> None:
+        super().initial(request, *args, **kwargs)
+        self.replica_context = None
+
+        if self.action in self.replica_actions and not (
+            request.user.is_authenticated
+            and is_pinned_to_primary(request.user.id)
+        ):
+            self.replica_context = replica_reads()
+            self.replica_context.__enter__()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs
+        )
+        if getattr(self, "replica_context", None) is not None:
+            self.replica_context.__exit__(None, None, None)
+            self.replica_context = None
+        return response
+
+
+class QueryParamsMixin:
+    def parse_ids(self, param: str) -> list[int]:
+        value = self.request.query_params.get(param)
+        if not value:
+            return []
+
+        try:
+            return sorted({int(str_id) for str_id in value.split(",")})
+        except ValueError:
+            raise ValidationError(
+                {param: "Must be a comma-separated list of integers."}
+            )
+
+    def parse_int(self, param: str) -> int | None:
+        value = self.request.query_params.get(param)
+        if not value:
+            return None
+
+        try:
+            number = int(value)
+        except ValueError:
+            number = -1
+        if number < 0:
+            raise ValidationError({param: "Must be a non-negative integer."})
+        return number
+
+    def parse_moment(self, param: str) -> datetime | None:
+        value = self.request.query_params.get(param)
+        if not value:
+            return None
+
+        try:
+            moment = parse_datetime(value)
+            if moment is None:
+                day = parse_date(value)
+                moment = day and datetime.combine(day, time.min)
+        except ValueError:
+            moment = None
+
+        if moment is None:
+            raise ValidationError(
+                {param: "Must be a date (YYYY-MM-DD) or ISO 8601 datetime."}
+            )
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        return moment
+
+    def parse_time_of_day(self, param: str) -> time | None:
+        value = self.request.query_params.get(param)
+        if not value:
+            return None
+
+        try:
+            parsed = parse_time(value)
+        except ValueError:
+            parsed = None
+
+        if parsed is None:
+            raise ValidationError({param: "Must be a time (HH:MM)."})
+        return parsed
+
+
+class StreamingExportMixin:
+    def stream_export(self, queryset: QuerySet) -> StreamingHttpResponse:
+        # Rows are encoded straight to JSON; the browsable API gets the raw
+        # JSON as well, other formats are refused.
+        if self.request.accepted_renderer.format not in ("json", "api"):
+            raise NotAcceptable("Exports are only available as JSON.")
+
+        chunk_size = settings.EXPORT_CHUNK_SIZE
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+
+        def rows():
+            # Prefetches run per chunk of the iterator, and every chunk is
+            # serialized as a list so list serializers can batch lookups.
+            objects = queryset.iterator(chunk_size=chunk_size)
+            while chunk := list(islice(objects, chunk_size)):
+                yield from serializer_class(
+                    chunk, many=True, context=context
+                ).data
+
+        return StreamingHttpResponse(
+            stream_json_list(rows(), chunk_size),
+            content_type="application/json",
+        )
 
 
 class GenreViewSet(
+    ReplicaReadMixin,
+    FieldProjectionMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -37,9 +188,12 @@ class GenreViewSet(
 ):
     queryset = Genre.objects.all().order_by("name")
     serializer_class = GenreSerializer
+    stateless_authentication = True
 
 
 class ActorViewSet(
+    ReplicaReadMixin,
+    FieldProjectionMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -49,9 +203,15 @@ class ActorViewSet(
 ):
     queryset = Actor.objects.all().order_by("last_name")
     serializer_class = ActorSerializer
+    stateless_authentication = True
+    field_projections = {
+        "full_name": FieldProjection(only=("first_name", "last_name")),
+    }
 
 
 class CinemaHallViewSet(
+    ReplicaReadMixin,
+    FieldProjectionMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -61,9 +221,17 @@ class CinemaHallViewSet(
 ):
     queryset = CinemaHall.objects.all().order_by("name")
     serializer_class = CinemaHallSerializer
+    stateless_authentication = True
+    field_projections = {
+        "capacity": FieldProjection(only=("rows", "seats_in_row")),
+    }
 
 
 class MovieViewSet(
+    ReplicaReadMixin,
+    QueryParamsMixin,
+    StreamingExportMixin,
+    FieldProjectionMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -71,30 +239,162 @@ class MovieViewSet(
     mixins.DestroyModelMixin,
     viewsets.GenericViewSet,
 ):
-    queryset = Movie.objects.all().prefetch_related("genres", "actors").order_by("title")
+    queryset = Movie.objects.all().order_by("title")
     serializer_class = MovieSerializer
+    stateless_authentication = True
 
     def get_queryset(self) -> QuerySet:
-        queryset = self.queryset
-        actors = self.request.query_params.get("actors")
-        genres = self.request.query_params.get("genres")
+        queryset = super().get_queryset()
+        actors_ids = self.parse_ids("actors")
+        genres_ids = self.parse_ids("genres")
         title = self.request.query_params.get("title")
 
-        if actors:
-            actors_ids = [int(str_id) for str_id in actors.split(",")]
-            queryset = queryset.filter(actors__id__in=actors_ids)
+        if actors_ids:
+            queryset = self.filter_related(
+                queryset,
+                Movie.actors.through,
+                "actor_id",
+                actors_ids,
+                self.parse_match("actors_match"),
+            )
 
-        if genres:
-            genres_ids = [int(str_id) for str_id in genres.split(",")]
-            queryset = queryset.filter(genres__id__in=genres_ids)
+        if genres_ids:
+            queryset = self.filter_related(
+                queryset,
+                Movie.genres.through,
+                "genre_id",
+                genres_ids,
+                self.parse_match("genres_match"),
+            )
 
         if title:
             queryset = queryset.filter(title__icontains=title)
 
         return queryset
 
+    def parse_match(self, param: str) -> str:
+        match = self.request.query_params.get(param, "any")
+        if match not in ("any", "all"):
+            raise ValidationError({param: "Must be either 'any' or 'all'."})
+        return match
+
+    @staticmethod
+    def filter_related(
+        queryset: QuerySet,
+        through: type,
+        column: str,
+        ids: list[int],
+        match: str,
+    ) -> QuerySet:
+        links = through.objects.filter(movie_id=OuterRef("pk"))
+
+        if match == "all":
+            for related_id in ids:
+                queryset = queryset.filter(
+                    Exists(links.filter(**{column: related_id}))
+                )
+            return queryset
+
+        return queryset.filter(
+            Exists(links.filter(**{f"{column}__in": ids}))
+        )
+
+    def parse_upcoming_limit(self) -> int | None:
+        with_sessions = self.request.query_params.get("with_sessions")
+        if with_sessions is None:
+            return None
+
+        if with_sessions != "upcoming":
+            raise ValidationError({"with_sessions": "Must be 'upcoming'."})
+
+        limit = self.parse_int("limit")
+        if limit is None:
+            return 3
+        if not 1 <= limit <= MAX_UPCOMING_SESSIONS:
+            raise ValidationError(
+                {"limit": f"Must be between 1 and {MAX_UPCOMING_SESSIONS}."}
+            )
+        return limit
+
+    @staticmethod
+    def get_upcoming_sessions(movie_ids: list[int], limit: int) -> dict:
+        if not movie_ids:
+            return {}
+
+        capacity = F("cinema_hall__rows") * F("cinema_hall__seats_in_row")
+        ranked = (
+            MovieSession.objects.filter(
+                movie_id__in=movie_ids,
+                show_time__gte=timezone.now(),
+                cancelled_at__isnull=True,
+            )
+            .only("id", "movie_id", "show_time", "base_price")
+            .annotate(
+                cinema_hall_name=F("cinema_hall__name"),
+                cinema_hall_capacity=capacity,
+                tickets_available=capacity - F("tickets_taken"),
+                session_rank=Window(
+                    RowNumber(),
+                    partition_by=[F("movie_id")],
+                    order_by=[F("show_time").asc(), F("id").asc()],
+                ),
+            )
+            .order_by()
+        )
+        # Django 4.1 cannot filter on a window function, so the ranked
+        # query is wrapped to keep the first sessions of every movie.
+        sql, params = ranked.query.get_compiler(ranked.db).as_sql()
+        upcoming = MovieSession.objects.db_manager(ranked.db).raw(
+            f"SELECT * FROM ({sql}) ranked WHERE session_rank <= %s "
+            "ORDER BY movie_id, session_rank",
+            [*params, limit],
+        )
+
+        sessions = defaultdict(list)
+        for movie_session in upcoming:
+            sessions[movie_session.movie_id].append(
+                UpcomingSessionSerializer(movie_session).data
+            )
+        return sessions
+
+    def list(self, request, *args, **kwargs) -> Response:
+        limit = self.parse_upcoming_limit()
+        response = super().list(request, *args, **kwargs)
+        if limit is None:
+            return response
+
+        movies = response.data
+        if isinstance(movies, dict):
+            movies = movies["results"]
+        sessions = self.get_upcoming_sessions(
+            [movie["id"] for movie in movies], limit
+        )
+        for movie in movies:
+            movie["upcoming_sessions"] = sessions.get(movie["id"], [])
+        return response
+
+    def retrieve(self, request, *args, **kwargs) -> Response:
+        try:
+            pk = int(kwargs[self.lookup_field])
+        except (TypeError, ValueError):
+            pk = None
+        if pk is not None and self.get_requested_fields() is None:
+            document = (
+                MovieDocument.objects.filter(movie_id=pk)
+                .values_list("detail", flat=True)
+                .first()
+            )
+            if document is not None:
+                return Response(document)
+
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(detail=False, methods=["get"])
+    def export(self, request) -> StreamingHttpResponse:
+        return self.stream_export(self.get_queryset())
+
     def get_serializer_class(self) -> object:
-        if self.action == "list":
+        if self.action in ("list", "export"):
             return MovieListSerializer
 
         if self.action == "retrieve":
@@ -103,34 +403,147 @@ class MovieViewSet(
         return MovieSerializer
 
 
-class MovieSessionViewSet(viewsets.ModelViewSet):
-    queryset = (
-        MovieSession.objects.all()
-        .select_related("movie", "cinema_hall")
-        .annotate(
-            tickets_available=(
-                F("cinema_hall__seats_in_row")
-                * F("cinema_hall__rows")
-                - Count("tickets")
-            )
-        )
-        .order_by("show_time")
-    )
+class MovieSessionViewSet(
+    ReplicaReadMixin,
+    QueryParamsMixin,
+    FieldProjectionMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = MovieSession.objects.all().order_by("show_time")
     serializer_class = MovieSessionSerializer
+    stateless_authentication = True
+    replica_actions = ("list", "retrieve", "seat_maps")
+    field_projections = {
+        "movie": FieldProjection(
+            only=(
+                "movie__id",
+                "movie__title",
+                "movie__description",
+                "movie__duration",
+                "movie__document__session_detail",
+            ),
+            select_related=("movie__document",),
+        ),
+        "cinema_hall": FieldProjection(
+            only=(
+                "cinema_hall__id",
+                "cinema_hall__name",
+                "cinema_hall__rows",
+                "cinema_hall__seats_in_row",
+            ),
+            select_related=("cinema_hall",),
+        ),
+        "movie_title": FieldProjection(
+            only=("movie__title",), select_related=("movie",)
+        ),
+        "cinema_hall_name": FieldProjection(
+            only=("cinema_hall__name",), select_related=("cinema_hall",)
+        ),
+        "cinema_hall_capacity": FieldProjection(
+            only=("cinema_hall__rows", "cinema_hall__seats_in_row"),
+            select_related=("cinema_hall",),
+        ),
+        "tickets_available": FieldProjection(
+            only=("cinema_hall__rows", "cinema_hall__seats_in_row"),
+            select_related=("cinema_hall",),
+            annotate={
+                "tickets_available": (
+                    F("cinema_hall__seats_in_row") * F("cinema_hall__rows")
+                    - F("tickets_taken")
+                )
+            },
+        ),
+    }
 
     def get_queryset(self) -> QuerySet:
-        queryset = self.queryset
-        movie_id = self.request.query_params.get("movie")
-        date = self.request.query_params.get("date")
-
-        if movie_id:
-            queryset = queryset.filter(movie_id=movie_id)
+        queryset = super().get_queryset()
+        movies_ids = self.parse_ids("movie")
+        cinema_halls_ids = self.parse_ids("cinema_hall")
+        date = self.parse_moment("date")
+        show_time_after = self.parse_moment("show_time_after")
+        show_time_before = self.parse_moment("show_time_before")
+        time_after = self.parse_time_of_day("time_after")
+        time_before = self.parse_time_of_day("time_before")
+        min_available = self.parse_int("min_available")
+
+        if movies_ids:
+            queryset = queryset.filter(movie_id__in=movies_ids)
+
+        if cinema_halls_ids:
+            queryset = queryset.filter(cinema_hall_id__in=cinema_halls_ids)
 
         if date:
-            queryset = queryset.filter(show_time__date=date)
+            queryset = queryset.filter(
+                show_time__gte=date, show_time__lt=date + timedelta(days=1)
+            )
+
+        if show_time_after:
+            queryset = queryset.filter(show_time__gte=show_time_after)
+
+        if show_time_before:
+            queryset = queryset.filter(show_time__lt=show_time_before)
+
+        if time_after or time_before:
+            queryset = self.filter_time_of_day(
+                queryset,
+                time_after or time.min,
+                time_before or time.max,
+                date or show_time_after,
+                date + timedelta(days=1) if date else show_time_before,
+            )
+
+        if min_available is not None:
+            queryset = queryset.alias(
+                seats_available=(
+                    F("cinema_hall__seats_in_row") * F("cinema_hall__rows")
+                    - F("tickets_taken")
+                )
+            ).filter(seats_available__gte=min_available)
+
+        if self.action == "list":
+            queryset = queryset.filter(cancelled_at__isnull=True)
+
+        if self.action == "retrieve" and self.get_requested_fields() is None:
+            queryset = queryset.select_related(
+                "movie__document", "cinema_hall"
+            )
 
         return queryset
 
+    @staticmethod
+    def filter_time_of_day(
+        queryset: QuerySet,
+        time_after: time,
+        time_before: time,
+        start: datetime | None,
+        end: datetime | None,
+    ) -> QuerySet:
+        if (
+            start is None
+            or end is None
+            or (end - start).days > MAX_TIME_OF_DAY_RANGE_DAYS
+        ):
+            return queryset.filter(
+                show_time__time__gte=time_after,
+                show_time__time__lt=time_before,
+            )
+
+        # One show_time range per day keeps the lookup on the index
+        # instead of applying TIME() to every row.
+        windows = Q()
+        day = timezone.localtime(start).date()
+        while day <= timezone.localtime(end).date():
+            windows |= Q(
+                show_time__gte=timezone.make_aware(
+                    datetime.combine(day, time_after)
+                ),
+                show_time__lt=timezone.make_aware(
+                    datetime.combine(day, time_before)
+                ),
+            )
+            day += timedelta(days=1)
+        return queryset.filter(windows)
+
     def get_serializer_class(self) -> object:
         if self.action == "list":
             return MovieSessionListSerializer
@@ -140,28 +553,317 @@ class MovieSessionViewSet(viewsets.ModelViewSet):
 
         return MovieSessionSerializer
 
+    def get_seats_stamp(self) -> dict:
+        try:
+            pk = int(self.kwargs["pk"])
+        except (TypeError, ValueError):
+            raise Http404
+        stamp = (
+            MovieSession.objects.filter(pk=pk)
+            .values(
+                "id",
+                "seats_version",
+                "seats_released_version",
+                "seats_changed_at",
+                "show_time",
+                "movie_id",
+                "cinema_hall_id",
+                "movie__updated_at",
+                "movie__document__updated_at",
+                "cinema_hall__updated_at",
+            )
+            .first()
+        )
+        if stamp is None:
+            raise Http404
+        # The movie document is regenerated when genres or actors change,
+        # which does not touch the movie row itself.
+        stamp["changed_at"] = max(
+            filter(
+                None,
+                (
+                    stamp["seats_changed_at"],
+                    stamp["movie__updated_at"],
+                    stamp["movie__document__updated_at"],
+                    stamp["cinema_hall__updated_at"],
+                ),
+            )
+        )
+        return stamp
+
+    @staticmethod
+    def get_etag(stamp: dict) -> str:
+        return '"{}-{}-{}-{}-{}-{}"'.format(
+            stamp["id"],
+            stamp["seats_version"],
+            stamp["movie_id"],
+            stamp["cinema_hall_id"],
+            int(stamp["show_time"].timestamp()),
+            int(stamp["changed_at"].timestamp() * 1_000_000),
+        )
+
+    def get_delta(self, stamp: dict) -> MovieSession | None:
+        try:
+            since_version = int(self.request.query_params["since_version"])
+        except (KeyError, ValueError):
+            return None
+
+        if not (
+            stamp["seats_released_version"]
+            <= since_version
+            <= stamp["seats_version"]
+        ):
+            return None
+
+        movie_session = MovieSession(
+            id=stamp["id"], seats_version=stamp["seats_version"]
+        )
+        movie_session.taken_places = Ticket.objects.filter(
+            movie_session_id=stamp["id"], session_version__gt=since_version
+        ).only("row", "seat")
+        return movie_session
+
+    @action(detail=False, methods=["get"], url_path="seat_maps")
+    def seat_maps(self, request) -> Response:
+        ids = self.parse_ids("ids")
+        if not ids:
+            raise ValidationError({"ids": "At least one id is required."})
+        if len(ids) > MAX_SEAT_MAP_IDS:
+            raise ValidationError(
+                {"ids": f"At most {MAX_SEAT_MAP_IDS} ids are allowed."}
+            )
+
+        encoding = request.query_params.get("encoding", "bitmap")
+        if encoding not in ("bitmap", "places"):
+            raise ValidationError(
+                {"encoding": "Must be either 'bitmap' or 'places'."}
+            )
+
+        seat_maps = get_seat_maps(ids)
+        if encoding == "places":
+            for seat_map in seat_maps:
+                seat_map["taken"] = decode_bitmap(
+                    seat_map["taken"],
+                    seat_map["rows"],
+                    seat_map["seats_in_row"],
+                )
+
+        found = {seat_map["id"] for seat_map in seat_maps}
+        return Response(
+            {
+                "encoding": encoding,
+                "results": seat_maps,
+                "missing": [pk for pk in ids if pk not in found],
+            }
+        )
+
+    def retrieve(self, request, *args, **kwargs) -> Response:
+        stamp = self.get_seats_stamp()
+        etag = self.get_etag(stamp)
+        last_modified = int(stamp["changed_at"].timestamp())
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            delta = self.get_delta(stamp)
+            if delta is not None:
+                response = Response(
+                    MovieSessionSeatsDeltaSerializer(delta).data
+                )
+            else:
+                response = super().retrieve(request, *args, **kwargs)
+
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        return response
+
 
 class OrderViewSet(
-    mixins.ListModelMixin, mixins.CreateModelMixin, viewsets.GenericViewSet
+    StreamingExportMixin,
+    FieldProjectionMixin,
+    mixins.ListModelMixin,
+    mixins.CreateModelMixin,
+    viewsets.GenericViewSet,
 ):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
     permission_classes = (IsAuthenticated,)
+    field_projections = {
+        "tickets": FieldProjection(
+            prefetch_related=(
+                "tickets__movie_session__cinema_hall",
+                "tickets__movie_session__movie",
+                "archived_tickets__movie_session__cinema_hall",
+                "archived_tickets__movie_session__movie",
+            )
+        ),
+    }
 
     def get_queryset(self) -> QuerySet:
-        return (
-            Order.objects.filter(user=self.request.user)
-            .prefetch_related(
-                "tickets__movie_session__cinema_hall", "tickets__movie_session__movie"
+        return self.project_queryset(
+            Order.objects.filter(user=self.request.user).order_by(
+                "-created_at"
             )
-            .order_by("-created_at")
         )
 
     def get_serializer_class(self) -> object:
-        if self.action == "list":
+        if self.action in ("list", "export"):
             return OrderListSerializer
 
         return OrderSerializer
 
+    def get_throttles(self) -> list:
+        if self.action == "create":
+            # Retrying with the same Idempotency-Key only replays the
+            # stored response, so it must not run into the order limits.
+            if self.is_replay():
+                return []
+            return [OrderUserRateThrottle(), OrderSessionRateThrottle()]
+
+        return super().get_throttles()
+
+    def get_request_hash(self) -> str:
+        return hashlib.sha256(
+            json.dumps(
+                self.request.data, sort_keys=True, default=str
+            ).encode()
+        ).hexdigest()
+
+    def get_stored_key(self, key: str) -> IdempotencyKey | None:
+        if getattr(self, "_stored_key", (None,))[0] != key:
+            self._stored_key = (
+                key,
+                IdempotencyKey.objects.filter(
+                    user=self.request.user, key=key
+                ).first(),
+            )
+        return self._stored_key[1]
+
+    def is_replay(self) -> bool:
+        key = self.request.headers.get("Idempotency-Key")
+        if not key or len(key) > 255:
+            return False
+
+        stored = self.get_stored_key(key)
+        return (
+            stored is not None
+            and not stored.is_expired
+            and stored.request_hash == self.get_request_hash()
+        )
+
     def perform_create(self, serializer: OrderSerializer) -> None:
         serializer.save(user=self.request.user)
+        pin_to_primary(self.request.user.id)
+
+    @action(detail=False, methods=["get"])
+    def export(self, request) -> StreamingHttpResponse:
+        return self.stream_export(self.get_queryset())
+
+    @action(detail=True, methods=["post"])
+    def cancel(self, request, pk=None) -> Response:
+        serializer = OrderCancelSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ticket_ids = serializer.validated_data.get("tickets")
+
+        with transaction.atomic():
+            # Concurrent cancels of the same order queue on this lock, so
+            # the checks below see the outcome of the previous one.
+            order = get_object_or_404(
+                Order.objects.select_for_update().filter(user=request.user),
+                pk=pk,
+            )
+            self.check_object_permissions(request, order)
+            if order.cancelled_at is not None:
+                raise ValidationError(
+                    {"order": "Order is already cancelled."}
+                )
+
+            tickets = order.tickets.all()
+            if ticket_ids is not None:
+                tickets = tickets.filter(pk__in=ticket_ids)
+            show_times = dict(
+                tickets.values_list("pk", "movie_session__show_time")
+            )
+            if ticket_ids is not None and len(show_times) != len(
+                set(ticket_ids)
+            ):
+                raise ValidationError(
+                    {"tickets": "Tickets must belong to this order."}
+                )
+            now = timezone.now()
+            if any(show_time <= now for show_time in show_times.values()):
+                raise ValidationError(
+                    {
+                        "tickets": "Tickets of started sessions cannot be "
+                        "cancelled."
+                    }
+                )
+
+            released, refund = cancel_order(order, ticket_ids)
+        pin_to_primary(request.user.id)
+        return Response(
+            {
+                "id": order.id,
+                "released": released,
+                "refund": str(refund),
+                "total_price": str(order.total_price),
+                "cancelled_at": order.cancelled_at,
+            }
+        )
+
+    @staticmethod
+    def replay(stored: IdempotencyKey) -> Response:
+        return Response(
+            stored.response,
+            status=stored.status_code,
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    def create(self, request, *args, **kwargs) -> Response:
+        key = request.headers.get("Idempotency-Key")
+        if key is None:
+            return super().create(request, *args, **kwargs)
+
+        if not key or len(key) > 255:
+            return Response(
+                {"Idempotency-Key": "Must be 1-255 characters long."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        request_hash = self.get_request_hash()
+        stored = self.get_stored_key(key)
+        if stored is not None:
+            if stored.is_expired:
+                stored.delete()
+            elif stored.request_hash != request_hash:
+                return Response(
+                    {
+                        "Idempotency-Key": "Key was already used "
+                        "with a different request."
+                    },
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                )
+            else:
+                return self.replay(stored)
+
+        try:
+            with transaction.atomic():
+                response = super().create(request, *args, **kwargs)
+                IdempotencyKey.objects.create(
+                    key=key,
+                    user=request.user,
+                    request_hash=request_hash,
+                    status_code=response.status_code,
+                    response=response.data,
+                )
+        except IntegrityError:
+            # A concurrent retry with the same key won the race.
+            stored = IdempotencyKey.objects.filter(
+                user=request.user, key=key, request_hash=request_hash
+            ).first()
+            if stored is None:
+                raise
+            return self.replay(stored)
+
+        return response
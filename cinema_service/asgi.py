@@ -13,4 +13,8 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cinema_service.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from cinema.streaming import SeatEventsApplication  # noqa: E402
+
+application = SeatEventsApplication(django_application)
@@ -0,0 +1,45 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+def primary_pin_key(user_id: int) -> str:
+    return f"cinema:primary_pin:{user_id}"
+
+
+def pin_to_primary(user_id: int) -> None:
+    cache.set(
+        primary_pin_key(user_id), True, timeout=settings.REPLICA_PIN_SECONDS
+    )
+
+
+def is_pinned_to_primary(user_id: int) -> bool:
+    return bool(cache.get(primary_pin_key(user_id)))
+
+
+@contextmanager
+def replica_reads():
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints) -> str | None:
+        replicas = getattr(settings, "DATABASE_REPLICAS", ())
+        if replicas and _replica_reads.get():
+            return random.choice(replicas)
+        return "default"
+
+    def db_for_write(self, model, **hints) -> str:
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        return True
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+
+
+class ApiGZipMiddleware(GZipMiddleware):
+    def process_response(self, request, response):
+        options = settings.API_COMPRESSION
+        if not options["ENABLED"] or not request.path.startswith(
+            options["PATH_PREFIX"]
+        ):
+            return response
+        # Streamed exports have no known length up front, so they bypass
+        # MIN_SIZE and are always compressed.
+        if (
+            not response.streaming
+            and len(response.content) < options["MIN_SIZE"]
+        ):
+            return response
+        return super().process_response(request, response)
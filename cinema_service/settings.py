@@ -14,22 +14,46 @@ from pathlib import Path
 import os
 import datetime
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
-# Quick-start development settings - unsuitable for production
-# See https://docs.djangoproject.com/en/4.0/howto/deployment/checklist/
+# Settings profiles, chosen with CINEMA_PROFILE:
+# "dev" runs with DEBUG and the debug toolbar, "bench" is production-like
+# for local benchmarks and load tests, and "prod" additionally reads its
+# secret key, hosts and cache from the environment.
+CINEMA_PROFILE = os.environ.get("CINEMA_PROFILE", "dev")
+if CINEMA_PROFILE not in ("dev", "bench", "prod"):
+    raise ImproperlyConfigured(f"Unknown CINEMA_PROFILE {CINEMA_PROFILE!r}.")
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = (
-    "django-insecure-6vubhk2$++agnctay_4pxy_8cq)mosmn(*-#2b^v4cgsh-^!i3"
-)
+if CINEMA_PROFILE == "prod":
+    SECRET_KEY = os.environ.get("DJANGO_SECRET_KEY")
+    if not SECRET_KEY:
+        raise ImproperlyConfigured("DJANGO_SECRET_KEY must be set in prod.")
+else:
+    SECRET_KEY = (
+        "django-insecure-6vubhk2$++agnctay_4pxy_8cq)mosmn(*-#2b^v4cgsh-^!i3"
+    )
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
-
-ALLOWED_HOSTS = []
+# DEBUG also keeps every SQL query in connection.queries.
+DEBUG = CINEMA_PROFILE == "dev"
+
+if CINEMA_PROFILE == "prod":
+    ALLOWED_HOSTS = list(
+        filter(None, os.environ.get("DJANGO_ALLOWED_HOSTS", "").split(","))
+    )
+    if not ALLOWED_HOSTS:
+        raise ImproperlyConfigured(
+            "DJANGO_ALLOWED_HOSTS must be set in prod."
+        )
+elif CINEMA_PROFILE == "bench":
+    ALLOWED_HOSTS = ["localhost", "127.0.0.1"]
+else:
+    ALLOWED_HOSTS = []
 
 INTERNAL_IPS = [
     "127.0.0.1",
@@ -46,14 +70,13 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "rest_framework",
     "rest_framework_simplejwt",
-    "debug_toolbar",
     "cinema",
     "user",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "cinema_service.middleware.ApiGZipMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -62,6 +85,50 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# The debug toolbar records queries and templates of every request, so
+# it is only installed in dev. Its middleware must follow GZip.
+if DEBUG:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("cinema_service.middleware.ApiGZipMiddleware") + 1,
+        "debug_toolbar.middleware.DebugToolbarMiddleware",
+    )
+
+# "all" runs every component in one process. "api" is a lean API worker
+# without the admin, debug toolbar, sessions and messages; requests
+# authenticate with JWT in DRF, so the auth middleware goes as well.
+CINEMA_ROLE = os.environ.get("CINEMA_ROLE", "all")
+if CINEMA_ROLE not in ("all", "api"):
+    raise ImproperlyConfigured(f"Unknown CINEMA_ROLE {CINEMA_ROLE!r}.")
+
+if CINEMA_ROLE == "api":
+    INSTALLED_APPS = [
+        app
+        for app in INSTALLED_APPS
+        if app
+        not in (
+            "django.contrib.admin",
+            "django.contrib.sessions",
+            "django.contrib.messages",
+            "debug_toolbar",
+        )
+    ]
+    MIDDLEWARE = [
+        middleware
+        for middleware in MIDDLEWARE
+        if middleware
+        not in (
+            "debug_toolbar.middleware.DebugToolbarMiddleware",
+            "django.contrib.sessions.middleware.SessionMiddleware",
+            "django.contrib.auth.middleware.AuthenticationMiddleware",
+            "django.contrib.messages.middleware.MessageMiddleware",
+        )
+    ]
+
+# Median cold start to the first request of an api worker, checked by the
+# profile_startup command.
+STARTUP_TARGET_MS = 1000
+
 ROOT_URLCONF = "cinema_service.urls"
 
 TEMPLATES = [
@@ -80,6 +147,19 @@ TEMPLATES = [
     },
 ]
 
+if not DEBUG:
+    # Templates are parsed once per process instead of on every render.
+    TEMPLATES[0]["APP_DIRS"] = False
+    TEMPLATES[0]["OPTIONS"]["loaders"] = [
+        (
+            "django.template.loaders.cached.Loader",
+            [
+                "django.template.loaders.filesystem.Loader",
+                "django.template.loaders.app_directories.Loader",
+            ],
+        )
+    ]
+
 WSGI_APPLICATION = "cinema_service.wsgi.application"
 
 
@@ -93,6 +173,51 @@ DATABASES = {
     }
 }
 
+# Read-only replicas, e.g. DATABASE_REPLICA_PATHS=replica1.sqlite3,...
+# List and retrieve actions of the catalog, movie and session endpoints
+# read from them; writes and order endpoints stay on "default".
+DATABASE_REPLICAS = []
+for index, replica_path in enumerate(
+    filter(None, os.environ.get("DATABASE_REPLICA_PATHS", "").split(",")),
+    start=1,
+):
+    DATABASES[f"replica_{index}"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / replica_path,
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{index}")
+
+if not DEBUG:
+    # Connections are reused across requests instead of reopened.
+    for database in DATABASES.values():
+        database["CONN_MAX_AGE"] = 600
+        database["CONN_HEALTH_CHECKS"] = True
+
+DATABASE_ROUTERS = ["cinema_service.db_router.ReplicaRouter"]
+
+# Throttles, replica pins and seat maps are shared between workers in
+# prod, so the cache cannot be per process there.
+if CINEMA_PROFILE == "prod":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ.get(
+                "REDIS_URL", "redis://127.0.0.1:6379/0"
+            ),
+            "KEY_PREFIX": "cinema",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Seconds a user keeps reading from the primary after placing an order.
+REPLICA_PIN_SECONDS = 10
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
@@ -143,12 +268,71 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # REST framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        "user.authentication.CachedJWTAuthentication",
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
+    "DEFAULT_RENDERER_CLASSES": (
+        "cinema.renderers.ORJSONRenderer",
+        "cinema.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_THROTTLE_RATES": {
+        "orders_user": "30/min",
+        "orders_session": "600/min",
+    },
 }
 
+if not DEBUG:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = (
+        "cinema.renderers.ORJSONRenderer",
+        "cinema.renderers.MessagePackRenderer",
+    )
+
+CINEMA_SEAT_EVENTS = {
+    "BACKEND": "cinema.events.LocalSeatEventBroker",
+    "OPTIONS": {
+        "max_queue_size": 64,
+        "max_subscribers": 10000,
+        "max_subscribers_per_session": 2000,
+    },
+    "HEARTBEAT_SECONDS": 15,
+}
+
+# Seat events published by one worker must reach watchers on the others.
+if CINEMA_PROFILE == "prod":
+    CINEMA_SEAT_EVENTS["BACKEND"] = "cinema.events.RedisSeatEventBroker"
+    CINEMA_SEAT_EVENTS["OPTIONS"]["url"] = CACHES["default"]["LOCATION"]
+
+# API responses of at least MIN_SIZE bytes are gzipped for clients that
+# accept it, unless ENABLED is off (e.g. when a proxy compresses instead).
+# Streamed exports bypass MIN_SIZE and are always compressed.
+API_COMPRESSION = {
+    "ENABLED": os.environ.get("API_COMPRESSION", "on") != "off",
+    "PATH_PREFIX": "/api/",
+    "MIN_SIZE": 1024,
+}
+
+# Rows fetched and serialized at a time by the streaming export actions.
+EXPORT_CHUNK_SIZE = 500
+
+HALL_GEOMETRY_CACHE_SIZE = 4096
+
+# Tickets of sessions older than this are moved to ArchivedTicket.
+TICKET_ARCHIVE_HORIZON = datetime.timedelta(days=90)
+
+TASK_QUEUE = {
+    "MAX_ATTEMPTS": 5,
+    "RETRY_BASE_SECONDS": 10,
+    "STALE_AFTER_SECONDS": 600,
+}
+
+IDEMPOTENCY_KEY_TTL = datetime.timedelta(hours=24)
+
+# Authenticated users are reused per process for this many seconds.
+JWT_USER_CACHE_TTL = 30
+JWT_USER_CACHE_SIZE = 10000
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": datetime.timedelta(days=1),
     "REFRESH_TOKEN_LIFETIME": datetime.timedelta(days=7),
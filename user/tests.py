@@ -1,3 +1,78 @@
 from django.test import TestCase
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from cinema.views import MovieSessionViewSet, OrderViewSet
+from user.authentication import CachedJWTAuthentication, user_cache
+from user.models import User
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self) -> None:
+        user_cache.clear()
+        self.user = User.objects.create(username="viewer")
+        self.token = str(AccessToken.for_user(self.user))
+        self.factory = APIRequestFactory()
+        self.authentication = CachedJWTAuthentication()
+
+    def authenticate(self, method: str = "get", view=None):
+        request = Request(
+            getattr(self.factory, method)(
+                "/api/cinema/orders/",
+                HTTP_AUTHORIZATION=f"Bearer {self.token}",
+            ),
+            parser_context={"view": view},
+        )
+        return self.authentication.authenticate(request)
+
+    def test_user_is_loaded_once_per_ttl(self) -> None:
+        with self.assertNumQueries(1):
+            first, _ = self.authenticate()
+        with self.assertNumQueries(0):
+            second, _ = self.authenticate()
+
+        self.assertEqual(first, self.user)
+        self.assertEqual(second, self.user)
+        self.assertIsNot(first, second)
+
+    def test_deactivated_user_is_rejected(self) -> None:
+        self.authenticate()
+
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_deleted_user_is_rejected(self) -> None:
+        self.authenticate()
+
+        self.user.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_stateless_user_on_read_only_endpoints(self) -> None:
+        with self.assertNumQueries(0):
+            user, _ = self.authenticate(view=MovieSessionViewSet())
+
+        self.assertIsInstance(user, TokenUser)
+        self.assertEqual(user.id, self.user.id)
+
+    def test_database_user_on_writes_and_private_endpoints(self) -> None:
+        user, _ = self.authenticate(method="post", view=MovieSessionViewSet())
+        self.assertIsInstance(user, User)
+
+        user, _ = self.authenticate(view=OrderViewSet())
+        self.assertIsInstance(user, User)
+
+    def test_orders_endpoint_with_bearer_token(self) -> None:
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+        response = client.get("/api/cinema/orders/")
+
+        self.assertEqual(response.status_code, 200)